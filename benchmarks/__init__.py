@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for the Dakshin compiler
+"""
+
+import os
+import sys
+
+# Make the compiler modules in src/ importable, as dakshin.py does
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,152 @@
+"""
+Throughput benchmarks for each compiler stage
+
+Usage: python -m benchmarks [--scale F] [--repeat N] [--only NAME ...]
+                            [--save FILE] [--baseline FILE] [--threshold F]
+
+Every synthetic program in benchmarks.programs is compiled stage by stage
+(Lexer.tokenize, convert_token_types, Parser.parse,
+AssemblyGenerator.generate). Times are the best of --repeat runs; peak
+memory comes from a separate tracemalloc run so it does not skew timings.
+With --baseline, stages slower than the baseline by more than --threshold
+are reported and the exit status is 1.
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+
+from benchmarks.programs import PROGRAMS
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from ParsingTable import convert_token_types
+from Parser import Parser
+from code_generator import AssemblyGenerator
+from compiler import count_ast_nodes
+
+STAGES = ("tokenize", "convert_token_types", "parse", "generate")
+
+def run_stages(source, lexer, timer=time.perf_counter):
+    """Run the pipeline once; return ({stage: seconds}, tokens, nodes)."""
+    times = {}
+    start = timer()
+    tokens = lexer.tokenize(FileReader(source_code=source))
+    times["tokenize"] = timer() - start
+
+    start = timer()
+    parser_tokens = convert_token_types(tokens)
+    times["convert_token_types"] = timer() - start
+
+    start = timer()
+    ast = Parser(parser_tokens).parse()
+    times["parse"] = timer() - start
+
+    start = timer()
+    AssemblyGenerator().generate(ast)
+    times["generate"] = timer() - start
+    return times, len(tokens), count_ast_nodes(ast)
+
+def peak_memory(source, lexer):
+    """Peak memory allocated while each stage runs, on top of what earlier stages left, in bytes."""
+    peaks = {}
+    tracemalloc.start()
+    try:
+        def step(stage, action):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = action()
+            peaks[stage] = tracemalloc.get_traced_memory()[1] - before
+            return result
+        tokens = step("tokenize", lambda: lexer.tokenize(FileReader(source_code=source)))
+        parser_tokens = step("convert_token_types", lambda: convert_token_types(tokens))
+        ast = step("parse", lambda: Parser(parser_tokens).parse())
+        step("generate", lambda: AssemblyGenerator().generate(ast))
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+def benchmark(name, scale, repeat):
+    """Measure one program; return its result record."""
+    generate, size = PROGRAMS[name]
+    source = generate(max(1, int(size * scale)))
+    lexer = Lexer(ErrorHandler())
+
+    best = {stage: float('inf') for stage in STAGES}
+    for _ in range(repeat):
+        times, token_count, node_count = run_stages(source, lexer)
+        for stage, seconds in times.items():
+            best[stage] = min(best[stage], seconds)
+    peaks = peak_memory(source, lexer)
+
+    record = {"source_bytes": len(source), "tokens": token_count, "nodes": node_count, "stages": {}}
+    for stage in STAGES:
+        # Lexing stages are measured per token, the rest per AST node
+        count = token_count if stage in ("tokenize", "convert_token_types") else node_count
+        unit = "tokens/s" if stage in ("tokenize", "convert_token_types") else "nodes/s"
+        record["stages"][stage] = {
+            "seconds": best[stage],
+            "rate": count / best[stage] if best[stage] else 0.0,
+            "unit": unit,
+            "peak_bytes": peaks[stage],
+        }
+    return record
+
+def print_record(name, record):
+    print(f"{name}: {record['source_bytes']} bytes, {record['tokens']} tokens, {record['nodes']} nodes")
+    for stage, result in record["stages"].items():
+        print(f"  {stage:<20} {result['seconds'] * 1000:9.2f} ms"
+              f"  {result['rate']:12,.0f} {result['unit']:<9}"
+              f"  peak {result['peak_bytes'] / 1024 / 1024:7.2f} MiB")
+
+def compare(results, baseline, threshold):
+    """Print stages slower than the baseline by more than threshold; return how many there are."""
+    regressions = 0
+    for name, record in results.items():
+        old_record = baseline.get("programs", {}).get(name)
+        if old_record is None:
+            continue
+        for stage, result in record["stages"].items():
+            old = old_record["stages"].get(stage)
+            if not old or not old["seconds"]:
+                continue
+            ratio = result["seconds"] / old["seconds"]
+            if ratio > 1 + threshold:
+                regressions += 1
+                print(f"REGRESSION {name}/{stage}: {old['seconds'] * 1000:.2f} ms -> "
+                      f"{result['seconds'] * 1000:.2f} ms ({(ratio - 1) * 100:+.1f}%)")
+    if not regressions:
+        print(f"No regressions beyond {threshold * 100:.0f}% of the baseline")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Compiler stage benchmarks")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every program size by this factor")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per program; the fastest is kept")
+    parser.add_argument("--only", nargs="+", choices=sorted(PROGRAMS), help="run only these programs")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before a stage counts as regressed")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.only or PROGRAMS:
+        results[name] = benchmark(name, args.scale, args.repeat)
+        print_record(name, results[name])
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({"python": platform.python_version(), "scale": args.scale, "programs": results}, f, indent=2)
+        print(f"Results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+AST serialization: the JSON dump versus the binary format of ast_binary
+
+Usage: python -m benchmarks.ast_format [scale] [repeat]
+
+Sizes are for the AST with spans, as the compile cache stores it (the
+indented JSON is what parse.py prints). Loading to nodes is what a cache
+hit does; json.loads alone only produces the dict form.
+"""
+
+import sys
+import json
+
+from benchmarks.programs import PROGRAMS
+from benchmarks.outline import best_time
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from ASTToken import to_dict, from_dict
+from ast_binary import dump_ast, load_ast
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    lexer = Lexer(ErrorHandler())
+
+    print(f"{'program':<18} {'indented':>10} {'JSON':>10} {'binary':>10}   {'json.loads':>10}"
+          f" {'+from_dict':>10} {'load_ast':>10} {'as_dict':>10}  same")
+    for name, (generate, size) in PROGRAMS.items():
+        source = generate(max(1, int(size * scale)))
+        tokens = lexer.tokenize(FileReader(source_code=source), parser_kinds=True)
+        ast = Parser(tokens).parse()
+        indented = json.dumps(to_dict(ast), indent=2)
+        text = json.dumps(to_dict(ast, spans=True))
+        data = dump_ast(ast)
+
+        _, loads_time = best_time(lambda: json.loads(text), repeat)
+        _, from_dict_time = best_time(lambda: from_dict(json.loads(text)), repeat)
+        nodes, load_time = best_time(lambda: load_ast(data), repeat)
+        dicts, as_dict_time = best_time(lambda: load_ast(data, as_dict=True), repeat)
+        same = nodes == ast and dicts == to_dict(ast, spans=True)
+        print(f"{name:<18} {len(indented) / 1024:8.0f}KB {len(text) / 1024:8.0f}KB {len(data) / 1024:8.0f}KB  "
+              f" {loads_time * 1000:8.1f}ms {from_dict_time * 1000:8.1f}ms {load_time * 1000:8.1f}ms"
+              f" {as_dict_time * 1000:8.1f}ms  {'yes' if same else 'NO'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Memory used by the parser's output: the dict form, slotted AST node objects and an ASTArena
+
+Usage: python -m benchmarks.ast_memory [lines]
+"""
+
+import sys
+import time
+
+from benchmarks.programs import mixed_program
+from benchmarks.token_memory import measure
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from ASTToken import to_dict
+from arena import ASTArena
+from code_generator import AssemblyGenerator
+from compiler import count_ast_nodes
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = mixed_program(lines)
+    tokens = Lexer(ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+
+    start = time.perf_counter()
+    ast = Parser(tokens).parse()
+    parse_time = time.perf_counter() - start
+    start = time.perf_counter()
+    AssemblyGenerator().generate(ast)
+    generate_time = time.perf_counter() - start
+    start = time.perf_counter()
+    arena = ASTArena.from_ast(ast)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    AssemblyGenerator().generate(arena.program())
+    arena_generate_time = time.perf_counter() - start
+    del ast, arena
+
+    nodes, node_bytes = measure(lambda: Parser(tokens).parse())
+    # The dict form is what the parser used to return
+    dicts, dict_bytes = measure(lambda: to_dict(nodes))
+    del dicts
+    arena, arena_bytes = measure(lambda: ASTArena.from_ast(nodes))
+    count = count_ast_nodes(nodes)
+
+    print(f"Source: {source.count(chr(10))} lines, {len(tokens)} tokens, {count} AST nodes")
+    print(f"Parse: {parse_time * 1000:.1f} ms, generate: {generate_time * 1000:.1f} ms")
+    print(f"Arena: {build_time * 1000:.1f} ms to build ({len(arena)} entries, {len(arena.values)} distinct values),"
+          f" generate: {arena_generate_time * 1000:.1f} ms")
+    print(f"Dict AST:    {dict_bytes / 1024 / 1024:8.2f} MiB ({dict_bytes / count:.1f} bytes/node)")
+    print(f"Node AST:    {node_bytes / 1024 / 1024:8.2f} MiB ({node_bytes / count:.1f} bytes/node)")
+    print(f"Arena:       {arena_bytes / 1024 / 1024:8.2f} MiB ({arena_bytes / count:.1f} bytes/node,"
+          f" {arena.nbytes() / 1024 / 1024:.2f} MiB in columns)")
+    print(f"Reduction:   {dict_bytes / node_bytes:8.1f}x nodes, {dict_bytes / arena_bytes:.1f}x arena")
+
+if __name__ == "__main__":
+    main()
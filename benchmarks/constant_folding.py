@@ -0,0 +1,84 @@
+"""
+Code size at each optimization level
+
+Usage: python -m benchmarks.constant_folding [files...]
+
+Compiles the sample programs (every one under tests/sample_programs by
+default, plus a synthetic program) at -O0, -O1 and -O2 and prints the
+instructions of each and the rewrites the optimizer made. The programs
+call the Windows x64 C runtime, so they are compared statically: the
+sequence of runtime calls that produce output must be the same at every
+level, or the program is flagged. Programs that do not parse or compile
+are listed with the error. The folded values themselves are checked by
+tests/testing_tools/test_optimizer.py.
+"""
+
+import os
+import sys
+import glob
+
+from benchmarks.programs import mixed_program
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from code_generator import AssemblyGenerator
+from optimizer import Optimizer, LEVELS
+from runtime import CALL_TARGET
+from stats import count_instructions
+
+def output_calls(assembly_code):
+    """The runtime print routines called, in order."""
+    return [name for name in CALL_TARGET.findall(assembly_code) if name.startswith('dakshin_print')]
+
+def compile_at(ast, level):
+    """(instructions, print calls, rewrites) for ast compiled at an -O level."""
+    optimizer = Optimizer(level)
+    if level > 0:
+        ast = optimizer.program(ast)
+    assembly_code = AssemblyGenerator(register_allocation=level > 0).generate(ast)
+    return count_instructions(assembly_code), output_calls(assembly_code), optimizer.rewrites
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join('tests', 'sample_programs', '*.dn')))
+    sources = [(path, None) for path in paths]
+    sources.append(("mixed_program(2000)", mixed_program(2000)))
+    lexer = Lexer(ErrorHandler())
+
+    print(f"{'program':<36}" + ''.join(f" {f'-O{level}':>8}" for level in LEVELS) + f" {'rewrites':>9}")
+    totals = [0] * len(LEVELS)
+    differing = []
+    failures = []
+    for name, source in sources:
+        reader = FileReader(file_path=name) if source is None else FileReader(source_code=source)
+        try:
+            ast = Parser(lexer.tokenize(reader, parser_kinds=True)).parse()
+        except Exception as e:
+            print(f"{os.path.basename(name):<36} does not parse: {type(e).__name__}: {e}")
+            continue
+        results = []
+        errors = []
+        for level in LEVELS:
+            try:
+                results.append(compile_at(ast, level))
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                print(f"{os.path.basename(name):<36} fails at -O{level}: {error}")
+                if level > 0 and error not in errors:
+                    failures.append(f"{name} (-O{level})")  # Not the failure the unoptimized compile has
+                errors.append(error)
+        if errors:
+            continue
+        if any(calls != results[0][1] for _, calls, _ in results):
+            differing.append(name)
+        for index, (instructions, _, _) in enumerate(results):
+            totals[index] += instructions
+        if results[-1][0] != results[0][0]:
+            print(f"{os.path.basename(name):<36}" + ''.join(f" {r[0]:>8}" for r in results) + f" {results[-1][2]:>9}")
+    print(f"{'total':<36}" + ''.join(f" {total:>8}" for total in totals))
+    print(f"Output calls differ between levels in: {', '.join(differing) if differing else 'none'}")
+    print(f"Failing only when optimized: {', '.join(failures) if failures else 'none'}")
+    return 1 if differing or failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Peak memory of writing the assembly for a large program: building the
+whole output as a string versus streaming it with generate_to
+
+Usage: python -m benchmarks.emit_memory [lines]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+from benchmarks.programs import mixed_program
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from code_generator import AssemblyGenerator
+from stats import count_instructions
+
+def peak(action):
+    """Return (seconds, peak bytes allocated) for action()."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    action()
+    seconds = time.perf_counter() - start
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak_bytes
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = mixed_program(lines)
+    tokens = Lexer(ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+    ast = Parser(tokens).parse()
+    del tokens
+    path = os.path.join(tempfile.mkdtemp(), 'out.asm')
+
+    def as_string():
+        # What compile_to_assembly did before: one string, written, then split to count lines
+        assembly_code = AssemblyGenerator().generate(ast)
+        with open(path, 'w') as f:
+            f.write(assembly_code)
+        return len(assembly_code.split('\n')), count_instructions(assembly_code)
+
+    def streamed():
+        generator = AssemblyGenerator()
+        with open(path, 'w') as f:
+            generator.generate_to(ast, f)
+        return generator.line_count, generator.instruction_count
+
+    string_time, string_peak = peak(as_string)
+    stream_time, stream_peak = peak(streamed)
+    size = os.path.getsize(path)
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+    print(f"Source: {lines} lines, assembly: {size / 1024 / 1024:.1f} MiB")
+    print(f"String:   {string_time * 1000:8.1f} ms, peak {string_peak / 1024 / 1024:8.2f} MiB")
+    print(f"Streamed: {stream_time * 1000:8.1f} ms, peak {stream_peak / 1024 / 1024:8.2f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Code size of expression evaluation on the stack versus in registers
+
+Usage: python -m benchmarks.expression_code [files...]
+
+Compiles the arithmetic sample programs (and a synthetic program of deep
+expressions) with the push/pop stack machine and with register
+allocation, and prints the instructions, pushes/pops and memory operands
+of each. The programs call the Windows x64 C runtime, so they are
+compared statically rather than run.
+"""
+
+import os
+import sys
+
+from benchmarks.programs import deep_expressions
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from code_generator import AssemblyGenerator
+from stats import count_instructions
+
+SAMPLES = ('math_test.dn', 'bitwise_operators_test.dn', 'bug_test_math_basic.dn', 'bug_test_math_functions.dn')
+
+def memory_traffic(assembly_code):
+    """(pushes and pops, other instructions with a memory operand)."""
+    stack = memory = 0
+    for line in assembly_code.split('\n'):
+        words = line.split(';', 1)[0].split(None, 1)
+        if not words:
+            continue
+        if words[0] in ('push', 'pop'):
+            stack += 1
+        elif len(words) > 1 and '[' in words[1]:
+            memory += 1
+    return stack, memory
+
+def measure(ast, register_allocation):
+    assembly_code = AssemblyGenerator(register_allocation=register_allocation).generate(ast)
+    return (count_instructions(assembly_code),) + memory_traffic(assembly_code)
+
+def main():
+    sample_dir = os.path.join('tests', 'sample_programs')
+    sources = [(path, None) for path in sys.argv[1:]] or [(os.path.join(sample_dir, name), None) for name in SAMPLES]
+    sources.append(("deep_expressions(400)", deep_expressions(400)))
+    lexer = Lexer(ErrorHandler())
+
+    print(f"{'program':<40}" + ''.join(f" {title:^18}" for title in ("instructions", "push/pop", "memory operands")))
+    for name, source in sources:
+        reader = FileReader(file_path=name) if source is None else FileReader(source_code=source)
+        ast = Parser(lexer.tokenize(reader, parser_kinds=True)).parse()
+        stack = measure(ast, False)
+        registers = measure(ast, True)
+        columns = ''.join(f" {old:>7} -> {new:<7}" for old, new in zip(stack, registers))
+        print(f"{os.path.basename(name):<40}{columns}")
+
+if __name__ == "__main__":
+    main()
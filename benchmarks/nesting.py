@@ -0,0 +1,45 @@
+"""
+Parse time of parenthesized expressions as their nesting depth grows
+
+Usage: python -m benchmarks.nesting [max_depth] [repeat]
+
+Each row parses benchmarks.programs.nested_parens(depth); with a single
+forward pass the time per level should stay roughly constant.
+"""
+
+import sys
+import time
+
+from benchmarks.programs import nested_parens
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+
+def parse_time(source, lexer, repeat):
+    """Best time to parse source, excluding tokenization."""
+    tokens = lexer.tokenize(FileReader(source_code=source), parser_kinds=True)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Parser(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    # Every level of nesting is a handful of recursive parser calls
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max_depth * 20 + 1000))
+    lexer = Lexer(ErrorHandler())
+
+    depth = max(1, max_depth // 8)
+    print(f"{'depth':>8} {'parse ms':>10} {'us/level':>10}")
+    while depth <= max_depth:
+        seconds = parse_time(nested_parens(depth), lexer, repeat)
+        print(f"{depth:>8} {seconds * 1000:10.3f} {seconds / depth * 1e6:10.2f}")
+        depth *= 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Declarations-only parsing: eager Parser versus Parser(lazy_bodies=True)
+
+Usage: python -m benchmarks.outline [scale] [repeat]
+
+Lazy bodies are forced afterwards to check they give the same AST.
+"""
+
+import sys
+import time
+
+from benchmarks.programs import PROGRAMS
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser, force_bodies
+
+def best_time(action, repeat):
+    """Return (result, fastest of repeat runs in seconds)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = action()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    lexer = Lexer(ErrorHandler())
+
+    print(f"{'program':<18} {'eager ms':>10} {'lazy ms':>10} {'speedup':>8}  same AST")
+    for name, (generate, size) in PROGRAMS.items():
+        source = generate(max(1, int(size * scale)))
+        tokens = lexer.tokenize(FileReader(source_code=source), parser_kinds=True)
+        eager, eager_time = best_time(lambda: Parser(tokens).parse(), repeat)
+        lazy, lazy_time = best_time(lambda: Parser(tokens, lazy_bodies=True).parse(), repeat)
+        same = force_bodies(lazy) == eager
+        print(f"{name:<18} {eager_time * 1000:10.2f} {lazy_time * 1000:10.2f}"
+              f" {eager_time / lazy_time:7.1f}x  {'yes' if same else 'NO'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Synthetic Dakshin programs of adjustable size for benchmarking
+"""
+
+def mixed_program(lines):
+    """Generate roughly `lines` lines of ordinary code: functions, locals, calls and comments."""
+    chunks = []
+    count = 0
+    index = 0
+    while count < lines:
+        chunks.append(
+            f"// helper {index}\n"
+            f"function helper_{index}(a, b) {{\n"
+            f"    let total = a * {index % 97 + 1} + b - 3;\n"
+            f"    let label = \"helper {index}\";\n"
+            f"    if (total > {index % 13}) {{\n"
+            f"        println(label, total);\n"
+            f"    }}\n"
+            f"    return total;\n"
+            f"}}\n"
+        )
+        count += 9
+        index += 1
+    chunks.append(
+        "function main() {\n"
+        "    println(\"done\");\n"
+        "    return 0;\n"
+        "}\n"
+    )
+    return "".join(chunks)
+
+def deep_expressions(depth):
+    """Generate functions whose bodies are expressions nested `depth` parentheses deep."""
+    chunks = []
+    for index in range(max(1, depth // 50)):
+        expression = "x"
+        for level in range(50):
+            expression = f"({expression} + {level % 7 + 1}) * {level % 5 + 1}"
+        chunks.append(
+            f"function deep_{index}(x) {{\n"
+            f"    return {expression};\n"
+            f"}}\n"
+        )
+    return "".join(chunks)
+
+def nested_parens(depth):
+    """Generate a function returning one expression that opens `depth` parentheses in a row."""
+    expression = "(" * depth + "x" + "".join(f" + {level % 9 + 1})" for level in range(depth))
+    return (
+        "function nested(x) {\n"
+        f"    return {expression};\n"
+        "}\n"
+    )
+
+def many_classes(count):
+    """Generate `count` small classes, each with fields, a constructor and methods."""
+    chunks = []
+    for index in range(count):
+        chunks.append(
+            f"class Shape{index} {{\n"
+            f"    private let width: int;\n"
+            f"    private let height: int;\n"
+            f"\n"
+            f"    public Shape{index}(w: int, h: int) {{\n"
+            f"        this.width = w;\n"
+            f"        this.height = h;\n"
+            f"    }}\n"
+            f"\n"
+            f"    public function area() -> int {{\n"
+            f"        return this.width * this.height + {index};\n"
+            f"    }}\n"
+            f"\n"
+            f"    public function describe() {{\n"
+            f"        print(\"Shape{index}\");\n"
+            f"    }}\n"
+            f"}}\n"
+        )
+    return "".join(chunks)
+
+def long_function(statements):
+    """Generate a single function with `statements` statements in its body."""
+    body = []
+    for index in range(statements):
+        if index % 4 == 0:
+            body.append(f"    let v{index} = {index} * 2 + 1;\n")
+        elif index % 4 == 1:
+            body.append(f"    if (v{index - 1} > {index}) {{\n        println(v{index - 1});\n    }}\n")
+        elif index % 4 == 2:
+            body.append(f"    v{index - 2} = v{index - 2} - {index % 9};\n")
+        else:
+            body.append(f"    println(\"step {index}\");\n")
+    return "function long_body() {\n" + "".join(body) + "    return 0;\n}\n"
+
+def string_table(count):
+    """Generate `count` distinct string literals passed to print calls."""
+    lines = [f"    println(\"message number {index}: the quick brown fox jumps over the lazy dog\");\n"
+             for index in range(count)]
+    return "function strings() {\n" + "".join(lines) + "}\n"
+
+# Benchmark programs and the size parameter each is generated with
+PROGRAMS = {
+    "mixed": (mixed_program, 5000),
+    "deep_expressions": (deep_expressions, 2000),
+    "many_classes": (many_classes, 200),
+    "long_function": (long_function, 4000),
+    "string_table": (string_table, 3000),
+}
@@ -0,0 +1,59 @@
+"""
+Cost of error recovery in the parser
+
+Usage: python -m benchmarks.recovery [scale] [repeat]
+
+Error-free programs are parsed with and without an error handler (which
+turns recovery on); the times should match. A copy of the mixed program
+with a broken statement in every function then shows how many errors one
+recovering parse reports.
+"""
+
+import io
+import sys
+import time
+import contextlib
+
+from benchmarks.programs import PROGRAMS, mixed_program
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+
+def best_times(actions, repeat):
+    """Fastest of repeat runs of each action, in seconds; runs are interleaved to even out noise."""
+    best = [float('inf')] * len(actions)
+    for _ in range(repeat):
+        for index, action in enumerate(actions):
+            start = time.perf_counter()
+            action()
+            best[index] = min(best[index], time.perf_counter() - start)
+    return best
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    lexer = Lexer(ErrorHandler())
+
+    print(f"{'program':<18} {'raising ms':>11} {'recovering ms':>14} {'overhead':>9}")
+    for name, (generate, size) in PROGRAMS.items():
+        source = generate(max(1, int(size * scale)))
+        tokens = lexer.tokenize(FileReader(source_code=source), parser_kinds=True)
+        raising, recovering = best_times([
+            lambda: Parser(tokens).parse(),
+            lambda: Parser(tokens, error_handler=ErrorHandler()).parse(),
+        ], repeat)
+        print(f"{name:<18} {raising * 1000:11.2f} {recovering * 1000:14.2f} {(recovering / raising - 1) * 100:+8.1f}%")
+
+    broken = mixed_program(max(1, int(500 * scale))).replace("let total = a *", "let total = a + ;")
+    errors = ErrorHandler()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = Lexer(errors).tokenize(FileReader(source_code=broken), parser_kinds=True)
+        start = time.perf_counter()
+        Parser(tokens, error_handler=errors, max_errors=10 ** 6).parse()
+        seconds = time.perf_counter() - start
+    print(f"\nBroken mixed program: {len(errors.errors)} syntax errors reported by one parse in {seconds * 1000:.2f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
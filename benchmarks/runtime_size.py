@@ -0,0 +1,74 @@
+"""
+Size of the generated assembly with the whole runtime library, with
+only the routines and externs each program reaches, and with the runtime
+linked from the module built by 'dakshin.py runtime'
+
+Usage: python -m benchmarks.runtime_size [directory]
+
+Compiles every .dn file under the directory (tests/sample_programs by
+default) each way and prints the total lines and bytes of assembly.
+"""
+
+import os
+import sys
+import glob
+import time
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from code_generator import AssemblyGenerator
+from runtime import ROUTINES, EXTERNS, runtime_module
+
+class FullRuntimeGenerator(AssemblyGenerator):
+    """Emits every runtime routine and extern, as the generator did before."""
+    def add_runtime(self, header, calls):
+        super().add_runtime(header, set(ROUTINES) | set(EXTERNS))
+
+class LinkedRuntimeGenerator(AssemblyGenerator):
+    """Declares the routines extern, for linking with the runtime module."""
+    def __init__(self):
+        super().__init__(link_runtime=True)
+
+def parse_all(directory):
+    lexer = Lexer(ErrorHandler())
+    programs = []
+    for path in sorted(glob.glob(os.path.join(directory, '**', '*.dn'), recursive=True)):
+        try:
+            tokens = lexer.tokenize(FileReader(file_path=path), parser_kinds=True)
+            programs.append(Parser(tokens).parse())
+        except Exception:
+            continue  # Samples that do not parse are not counted
+    return programs
+
+def measure(generator_class, programs):
+    """Return (lines, bytes, seconds) for generating every program."""
+    lines = size = 0
+    start = time.perf_counter()
+    for ast in programs:
+        try:
+            assembly_code = generator_class().generate(ast)
+        except Exception:
+            continue
+        lines += assembly_code.count('\n') + 1
+        size += len(assembly_code.encode('utf-8'))
+    return lines, size, time.perf_counter() - start
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join('tests', 'sample_programs')
+    programs = parse_all(directory)
+    full = measure(FullRuntimeGenerator, programs)
+    reachable = measure(AssemblyGenerator, programs)
+    linked = measure(LinkedRuntimeGenerator, programs)
+    module = '\n'.join(runtime_module())
+
+    print(f"{len(programs)} programs from {directory}")
+    for label, (lines, size, seconds) in (("Full runtime", full), ("Reachable", reachable), ("Linked", linked)):
+        print(f"{label:<13} {lines:9,} lines {size / 1024:9.1f} KiB {seconds * 1000:8.1f} ms")
+    print(f"Runtime module: {module.count(chr(10)) + 1:,} lines {len(module) / 1024:.1f} KiB, built once for linked programs")
+    print(f"Reachable output is {reachable[1] / full[1] * 100:.1f}% of the full-runtime size, "
+          f"linked output {linked[1] / full[1] * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
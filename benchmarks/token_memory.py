@@ -0,0 +1,45 @@
+"""
+Memory used by the lexer's output: a list of Token objects versus a TokenStream
+
+Usage: python -m benchmarks.token_memory [lines]
+"""
+
+import sys
+import tracemalloc
+
+from benchmarks.programs import mixed_program
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+
+def measure(build):
+    """Return (result, bytes still allocated by build())."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def materialize(stream):
+    """Build the equivalent list of Token objects, dropping the stream's value cache."""
+    tokens = list(stream)
+    stream.values.clear()
+    return tokens
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = mixed_program(lines)
+    lexer = Lexer(ErrorHandler())
+
+    stream, stream_bytes = measure(lambda: lexer.tokenize(FileReader(source_code=source)))
+    # A fully materialized list is what the lexer used to return
+    token_list, list_bytes = measure(lambda: materialize(stream))
+
+    print(f"Source: {source.count(chr(10))} lines, {len(source)} characters, {len(stream)} tokens")
+    print(f"List of Token objects: {list_bytes / 1024 / 1024:8.2f} MiB ({list_bytes / len(stream):.1f} bytes/token)")
+    print(f"TokenStream:           {stream_bytes / 1024 / 1024:8.2f} MiB ({stream_bytes / len(stream):.1f} bytes/token)")
+    print(f"Reduction:             {list_bytes / stream_bytes:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -10,21 +10,80 @@ import os
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from compiler import compile_to_assembly
+# The compiler itself is imported only when compiling locally, so that
+# '--server' client runs stay cheap to start.
 
 def main():
     """Main compilation interface"""
-    if len(sys.argv) < 2:
+    if len(sys.argv) > 1 and sys.argv[1] == 'build':
+        from build import main as build_main
+        sys.exit(build_main(sys.argv[2:], os.path.join(os.path.dirname(__file__), 'out')))
+    if len(sys.argv) > 1 and sys.argv[1] == 'watch':
+        from watch import main as watch_main
+        sys.exit(watch_main(sys.argv[2:], os.path.join(os.path.dirname(__file__), 'out')))
+    if len(sys.argv) > 1 and sys.argv[1] == 'runtime':
+        from runtime import main as runtime_main
+        sys.exit(runtime_main(sys.argv[2:], os.path.join(os.path.dirname(__file__), 'out')))
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from server import main as serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+    
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--') and not arg.startswith('-O')]
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    levels = [arg[2:] for arg in sys.argv[1:] if arg.startswith('-O')]
+    
+    if len(args) < 1:
         print("Dakshin Programming Language Compiler")
-        print("Usage: python dakshin.py <source_file> [output_file]")
+        print("Usage: python dakshin.py <source_file> [output_file] [--stream] [--mmap] [--no-cache] [--server]")
+        print("                                                 [--stats=json] [--trace-memory] [--profile[=N]] [--arena]")
+        print("                                                 [--link-runtime] [-O0|-O1|-O2]")
+        print("       python dakshin.py build <dir|files...> [-j N] [-o out_dir] [--no-cache] [--link-runtime] [-O0|-O1|-O2]")
+        print("       python dakshin.py runtime [-o file.asm|file.o|file.obj] [-f nasm_format]")
+        print("       python dakshin.py watch <dir> [-o out_dir] [--interval S] [--poll]")
+        print("       python dakshin.py serve [--socket PATH] [--stop|--stats]")
         print("")
         print("Examples:")
         print("  python dakshin.py program.dn              # Generate assembly in out/ directory")
         print("  python dakshin.py program.dn output.asm   # Write assembly to specific file")
+        print("  python dakshin.py big.dn --stream         # Lex in chunks, parse while reading")
+        print("  python dakshin.py big.dn --mmap           # Lex a memory-mapped copy of the file")
+        print("  python dakshin.py big.dn --arena          # Keep the AST in flat arrays instead of node objects")
+        print("  python dakshin.py build src/ -j 8         # Compile a whole tree in parallel")
+        print("  python dakshin.py runtime -o rt.obj       # Build the runtime library once, for --link-runtime")
+        print("  python dakshin.py a.dn --link-runtime     # Declare runtime routines extern instead of including them")
+        print("  python dakshin.py program.dn -O2          # Also strength-reduce (-O0: no optimization, -O1: default)")
+        print("  python dakshin.py program.dn --stats=json # Print per-stage timings and counts as JSON")
+        print("  python dakshin.py program.dn --profile    # Profile the compiler, write .prof/.collapsed files")
+        print("  python dakshin.py watch src/              # Rebuild changed files and their importers")
+        print("  python dakshin.py program.dn --server     # Compile through a running 'serve' daemon")
         return
     
-    source_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    source_file = args[0]
+    output_file = args[1] if len(args) > 1 else None
+    stream = '--stream' in flags
+    mmap = '--mmap' in flags
+    arena = '--arena' in flags
+    link_runtime = '--link-runtime' in flags
+    use_cache = '--no-cache' not in flags
+    use_server = '--server' in flags
+    trace_memory = '--trace-memory' in flags
+    from optimizer import DEFAULT_LEVEL, parse_level
+    opt_level = parse_level(levels[-1]) if levels else DEFAULT_LEVEL
+    if opt_level is None:
+        print(f"Unknown optimization level: -O{levels[-1]}")
+        sys.exit(1)
+    stats_format = None
+    profile_top = None
+    for flag in flags:
+        if flag.startswith('--stats='):
+            stats_format = flag.split('=', 1)[1]
+        elif flag == '--profile' or flag.startswith('--profile='):
+            value = flag.split('=', 1)[1] if '=' in flag else '15'
+            if not value.isdigit():
+                print(f"Invalid profile count: {value!r} (--profile=N needs a number of functions to list)")
+                print("Usage: python dakshin.py <source_file> [output_file] --profile[=N]")
+                sys.exit(2)
+            profile_top = int(value)
     
     # If no output file specified, generate it in the out/ directory
     if output_file is None:
@@ -36,7 +95,24 @@ def main():
         base_name = os.path.splitext(os.path.basename(source_file))[0]
         output_file = os.path.join(out_dir, f"{base_name}.asm")
     
-    compile_to_assembly(source_file, output_file)
+    if profile_top is not None:
+        from profiler import profile_compile
+        profile_compile(source_file, output_file, top=profile_top, stream=stream, mmap=mmap, arena=arena,
+                        link_runtime=link_runtime, opt_level=opt_level)
+        return
+    
+    if use_server:
+        from server import compile_remote
+        try:
+            compile_remote(source_file, output_file, link_runtime=link_runtime, opt_level=opt_level)
+            return
+        except OSError:
+            print("No compile server running, compiling locally")
+    
+    from compiler import compile_to_assembly
+    compile_to_assembly(source_file, output_file, stream=stream, mmap=mmap, use_cache=use_cache,
+                        stats_format=stats_format, trace_memory=trace_memory, arena=arena,
+                        link_runtime=link_runtime, opt_level=opt_level)
 
 if __name__ == "__main__":
     main()
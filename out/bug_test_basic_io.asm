@@ -0,0 +1,78 @@
+; NASM 64-bit assembly for Dakshin Programming Language (Windows)
+bits 64
+default rel
+
+section .data
+    ; String literals will be placed here
+    ; Standard I/O data structures
+    input_buffer times 4096 db 0
+    newline db 13, 10, 0      ; Windows CRLF
+    space_string db ' ', 0     ; Space character
+    space db 32, 0
+    null_terminator db 0
+    ; File handling structures
+    file_mode_r db 'r', 0
+    file_mode_w db 'w', 0
+    file_mode_a db 'a', 0
+    file_mode_rb db 'rb', 0
+    file_mode_wb db 'wb', 0
+    ; Format strings for I/O
+    fmt_int db '%d', 0
+    fmt_float db '%.2f', 0
+    fmt_string db '%s', 0
+    fmt_char db '%c', 0
+    fmt_newline db '%d', 13, 10, 0    ; Windows CRLF
+    input_fmt_int db '%d', 0
+    input_fmt_float db '%f', 0
+    input_fmt_string db '%s', 0
+    ; GUI string constants
+    alert_title db 'Alert', 0
+    confirm_title db 'Confirm', 0
+    error_title db 'Error', 0
+    info_title db 'Information', 0
+    str_0 db "Hello, World!", 0
+
+
+section .text
+    ; Entry point for Windows C runtime
+    global main
+    default rel
+
+    ; External C runtime functions (Windows)
+    extern printf
+
+; print(value) - Print value to stdout
+dakshin_print:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the value to print (Windows convention)
+    mov rdx, rcx   ; Move value to second parameter (Windows convention)
+    mov rcx, fmt_string  ; Format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+main:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    ; Save caller-saved registers
+    mov rax, str_0
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 0
+    jmp main_end
+
+main_end:
+    ; Restore stack and return to C runtime (Windows x64)
+    mov rsp, rbp
+    pop rbp
+    ret
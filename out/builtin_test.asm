@@ -0,0 +1,250 @@
+; NASM 64-bit assembly for Dakshin Programming Language (Windows)
+bits 64
+default rel
+
+section .data
+    ; String literals will be placed here
+    ; Standard I/O data structures
+    input_buffer times 4096 db 0
+    newline db 13, 10, 0      ; Windows CRLF
+    space_string db ' ', 0     ; Space character
+    space db 32, 0
+    null_terminator db 0
+    ; File handling structures
+    file_mode_r db 'r', 0
+    file_mode_w db 'w', 0
+    file_mode_a db 'a', 0
+    file_mode_rb db 'rb', 0
+    file_mode_wb db 'wb', 0
+    ; Format strings for I/O
+    fmt_int db '%d', 0
+    fmt_float db '%.2f', 0
+    fmt_string db '%s', 0
+    fmt_char db '%c', 0
+    fmt_newline db '%d', 13, 10, 0    ; Windows CRLF
+    input_fmt_int db '%d', 0
+    input_fmt_float db '%f', 0
+    input_fmt_string db '%s', 0
+    ; GUI string constants
+    alert_title db 'Alert', 0
+    confirm_title db 'Confirm', 0
+    error_title db 'Error', 0
+    info_title db 'Information', 0
+    str_0 db "=== Testing Built-in Functions ===", 0
+    str_1 db "Basic I/O Test:", 0
+    str_2 db "Hello ", 0
+    str_3 db "World", 0
+    str_4 db "", 0
+    str_5 db "Testing abs function:", 0
+    str_6 db "abs(-15) = ", 0
+    str_7 db "Testing min function:", 0
+    str_8 db "min(10, 5) = ", 0
+    str_9 db "Testing max function:", 0
+    str_10 db "max(10, 5) = ", 0
+
+
+section .text
+    ; Entry point for Windows C runtime
+    global main
+    default rel
+
+    ; External C runtime functions (Windows)
+    extern printf
+
+; print(value) - Print value to stdout
+dakshin_print:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the value to print (Windows convention)
+    mov rdx, rcx   ; Move value to second parameter (Windows convention)
+    mov rcx, fmt_string  ; Format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; print_int(value) - Print integer value to stdout
+dakshin_print_int:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the integer value to print (Windows convention)
+    mov rdx, rcx   ; Move integer to second parameter (Windows convention)
+    mov rcx, fmt_int  ; Integer format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; abs(value) - Absolute value
+dakshin_abs:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx contains value (Windows calling convention)
+    mov rax, rcx
+    test rax, rax
+    jns abs_positive
+    neg rax
+abs_positive:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; min(a, b) - Minimum of two values
+dakshin_min:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx = a, rdx = b (Windows calling convention)
+    cmp rcx, rdx
+    jle min_first
+    mov rax, rdx
+    jmp min_end
+min_first:
+    mov rax, rcx
+min_end:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; max(a, b) - Maximum of two values
+dakshin_max:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx = a, rdx = b (Windows calling convention)
+    cmp rcx, rdx
+    jge max_first
+    mov rax, rdx
+    jmp max_end
+max_first:
+    mov rax, rcx
+max_end:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+main:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    ; Save caller-saved registers
+    mov rax, str_0
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    ; Print string: "Hello "
+    mov rcx, str_2
+    call dakshin_print
+    ; Save caller-saved registers
+    ; Print string: "World"
+    mov rcx, str_3
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_4
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 10
+    mov [rbp-8], rax
+    mov rax, 5
+    mov [rbp-16], rax
+    ; Save caller-saved registers
+    mov rax, str_5
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, -15
+    mov rcx, rax
+    call dakshin_abs
+    mov [rbp-24], rax
+    ; Save caller-saved registers
+    mov rax, str_6
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_7
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-8]
+    mov rcx, rax
+    mov rax, [rbp-16]
+    mov rdx, rax
+    call dakshin_min
+    mov [rbp-32], rax
+    ; Save caller-saved registers
+    mov rax, str_8
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_9
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-8]
+    mov rcx, rax
+    mov rax, [rbp-16]
+    mov rdx, rax
+    call dakshin_max
+    mov [rbp-40], rax
+    ; Save caller-saved registers
+    mov rax, str_10
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-40]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 0
+    jmp main_end
+
+main_end:
+    ; Restore stack and return to C runtime (Windows x64)
+    mov rsp, rbp
+    pop rbp
+    ret
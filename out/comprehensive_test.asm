@@ -0,0 +1,1271 @@
+; NASM 64-bit assembly for Dakshin Programming Language (Windows)
+bits 64
+default rel
+
+section .data
+    ; String literals will be placed here
+    ; Standard I/O data structures
+    input_buffer times 4096 db 0
+    newline db 13, 10, 0      ; Windows CRLF
+    space_string db ' ', 0     ; Space character
+    space db 32, 0
+    null_terminator db 0
+    ; File handling structures
+    file_mode_r db 'r', 0
+    file_mode_w db 'w', 0
+    file_mode_a db 'a', 0
+    file_mode_rb db 'rb', 0
+    file_mode_wb db 'wb', 0
+    ; Format strings for I/O
+    fmt_int db '%d', 0
+    fmt_float db '%.2f', 0
+    fmt_string db '%s', 0
+    fmt_char db '%c', 0
+    fmt_newline db '%d', 13, 10, 0    ; Windows CRLF
+    input_fmt_int db '%d', 0
+    input_fmt_float db '%f', 0
+    input_fmt_string db '%s', 0
+    ; GUI string constants
+    alert_title db 'Alert', 0
+    confirm_title db 'Confirm', 0
+    error_title db 'Error', 0
+    info_title db 'Information', 0
+    str_0 db "=== Dakshin Programming Language - Comprehensive Test ===", 0
+    str_1 db "", 0
+    str_2 db "TEST 1: Basic I/O Functions", 0
+    str_3 db "Hello ", 0
+    str_4 db "World! ", 0
+    str_5 db "This is a complete line.", 0
+    str_6 db "TEST 2: Variables and String Operations", 0
+    str_7 db "Dakshin Language", 0
+    str_8 db "Welcome to ", 0
+    str_9 db "Message:", 0
+    str_10 db "Length of message:", 0
+    str_11 db "Combined:", 0
+    str_12 db "TEST 3: Math Operations", 0
+    str_13 db "Number 1:", 0
+    str_14 db "Number 2:", 0
+    str_15 db "Sum:", 0
+    str_16 db "Difference:", 0
+    str_17 db "Product:", 0
+    str_18 db "Division:", 0
+    str_19 db "Absolute value of -25:", 0
+    str_20 db "Minimum of", 0
+    str_21 db "and", 0
+    str_22 db ":", 0
+    str_23 db "Maximum of", 0
+    str_24 db "TEST 4: System Functions", 0
+    str_25 db "Current Unix timestamp:", 0
+    str_26 db "TEST 5: String Functions", 0
+    str_27 db "Programming", 0
+    str_28 db "Test string:", 0
+    str_29 db "String length:", 0
+    str_30 db "String length (using strlen):", 0
+    str_31 db "TEST 6: Type Conversion", 0
+    str_32 db "123", 0
+    str_33 db "String representation:", 0
+    str_34 db "Converted to integer:", 0
+    str_35 db "TEST 7: Comparison Operations", 0
+    str_36 db "x =", 0
+    str_37 db ", y =", 0
+    str_38 db "x == y:", 0
+    str_39 db "x != y:", 0
+    str_40 db "x < y:", 0
+    str_41 db "x > y:", 0
+    str_42 db "TEST 8: Conditional Logic", 0
+    str_43 db "x is less than y - condition works!", 0
+    str_44 db "Condition failed", 0
+    str_45 db "This should not print", 0
+    str_46 db "Else clause works correctly", 0
+    str_47 db "TEST 9: Loop Constructs", 0
+    str_48 db "Counting from 1 to 5:", 0
+    str_49 db "Count:", 0
+    str_50 db "TEST 10: For Loop", 0
+    str_51 db "For loop counting:", 0
+    str_52 db "Iteration:", 0
+    str_53 db "TEST 11: Function Calls", 0
+    str_54 db "Testing function call chain:", 0
+    str_55 db "Function result:", 0
+    str_56 db "TEST 12: Advanced Features", 0
+    str_57 db "TEST 13: Error Scenarios", 0
+    str_58 db "=== ALL TESTS COMPLETED ===", 0
+    str_59 db "If you see this message, all basic features are working!", 0
+    str_60 db "Inside performCalculation function", 0
+    str_61 db "Parameter a:", 0
+    str_62 db "Parameter b:", 0
+    str_63 db "Testing advanced string operations...", 0
+    str_64 db "Advanced Test", 0
+    str_65 db "Sample string:", 0
+    str_66 db "Length:", 0
+    str_67 db "Testing mathematical operations...", 0
+    str_68 db "Values:", 0
+    str_69 db "Absolute difference:", 0
+    str_70 db "Testing edge cases and error scenarios...", 0
+    str_71 db "Empty string length:", 0
+    str_72 db "Absolute value of zero:", 0
+    str_73 db "Min with zero:", 0
+    str_74 db "Max with zero:", 0
+    str_75 db "Negative number:", 0
+    str_76 db "Absolute value:", 0
+
+
+section .text
+    ; Entry point for Windows C runtime
+    global main
+    default rel
+
+    ; External C runtime functions (Windows)
+    extern printf
+    extern sscanf
+    extern strlen
+
+; print(value) - Print value to stdout
+dakshin_print:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the value to print (Windows convention)
+    mov rdx, rcx   ; Move value to second parameter (Windows convention)
+    mov rcx, fmt_string  ; Format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; print_int(value) - Print integer value to stdout
+dakshin_print_int:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the integer value to print (Windows convention)
+    mov rdx, rcx   ; Move integer to second parameter (Windows convention)
+    mov rcx, fmt_int  ; Integer format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; strlen(str) - Get string length
+dakshin_strlen:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space
+    ; rcx contains string pointer
+    call strlen
+    ; Result already in rax
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; abs(value) - Absolute value
+dakshin_abs:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx contains value (Windows calling convention)
+    mov rax, rcx
+    test rax, rax
+    jns abs_positive
+    neg rax
+abs_positive:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; min(a, b) - Minimum of two values
+dakshin_min:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx = a, rdx = b (Windows calling convention)
+    cmp rcx, rdx
+    jle min_first
+    mov rax, rdx
+    jmp min_end
+min_first:
+    mov rax, rcx
+min_end:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; max(a, b) - Maximum of two values
+dakshin_max:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx = a, rdx = b (Windows calling convention)
+    cmp rcx, rdx
+    jge max_first
+    mov rax, rdx
+    jmp max_end
+max_first:
+    mov rax, rcx
+max_end:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; time() - Get current time (stub implementation)
+dakshin_time:
+    push rbp
+    mov rbp, rsp
+    ; Return a fixed timestamp for now to avoid corruption
+    mov rax, 1640995200  ; Fixed timestamp (Jan 1, 2022)
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; toint(str) - Convert string to integer
+dakshin_toint:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 48    ; Shadow space + local storage
+    ; rcx contains string (Windows calling convention)
+    mov rdx, input_fmt_int   ; Format string
+    lea r8, [rbp-8]    ; Address for result
+    call sscanf
+    mov rax, [rbp-8]  ; Get converted value
+    add rsp, 48    ; Clean up
+    mov rsp, rbp
+    pop rbp
+    ret
+
+main:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    ; Save caller-saved registers
+    mov rax, str_0
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_2
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    ; Print string: "Hello "
+    mov rcx, str_3
+    call dakshin_print
+    ; Save caller-saved registers
+    ; Print string: "World! "
+    mov rcx, str_4
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_5
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_6
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, str_7
+    mov [rbp-8], rax
+    mov rax, str_8
+    mov [rbp-16], rax
+    ; Save caller-saved registers
+    mov rax, str_9
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_10
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_strlen
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_11
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-16]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_12
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 42
+    mov [rbp-24], rax
+    mov rax, 17
+    mov [rbp-32], rax
+    ; Save caller-saved registers
+    mov rax, str_13
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_14
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_15
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    add rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_16
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    sub rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_17
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    imul rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_18
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    push rdx    ; rdx may hold a call argument
+    cqo
+    idiv qword [rbp-32]
+    pop rdx
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_19
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, -25
+    mov rcx, rax
+    call dakshin_abs
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_20
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_21
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_22
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-24]
+    mov rcx, rax
+    mov rax, [rbp-32]
+    mov rdx, rax
+    call dakshin_min
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_23
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_21
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_22
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-24]
+    mov rcx, rax
+    mov rax, [rbp-32]
+    mov rdx, rax
+    call dakshin_max
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_24
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_25
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    call dakshin_time
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_26
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, str_27
+    mov [rbp-40], rax
+    ; Save caller-saved registers
+    mov rax, str_28
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-40]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_29
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-40]
+    mov rcx, rax
+    call dakshin_strlen
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_30
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-40]
+    mov rcx, rax
+    call dakshin_strlen
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_31
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, str_32
+    mov [rbp-48], rax
+    ; Save caller-saved registers
+    mov rax, str_33
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-48]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_34
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-48]
+    mov rcx, rax
+    call dakshin_toint
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_35
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 10
+    mov [rbp-56], rax
+    mov rax, 20
+    mov [rbp-64], rax
+    ; Save caller-saved registers
+    mov rax, str_36
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-56]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_37
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-64]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_38
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-56]
+    cmp rax, [rbp-64]
+    sete al
+    movzx rax, al
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_39
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-56]
+    cmp rax, [rbp-64]
+    setne al
+    movzx rax, al
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_40
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-56]
+    cmp rax, [rbp-64]
+    setl al
+    movzx rax, al
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_41
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-56]
+    cmp rax, [rbp-64]
+    setg al
+    movzx rax, al
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_42
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, [rbp-56]
+    cmp rax, [rbp-64]
+    setl al
+    movzx rax, al
+    test rax, rax
+    jz else_0
+    ; Save caller-saved registers
+    mov rax, str_43
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    jmp end_if_1
+else_0:
+    ; Save caller-saved registers
+    mov rax, str_44
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+end_if_1:
+    mov rax, [rbp-56]
+    cmp rax, [rbp-64]
+    setg al
+    movzx rax, al
+    test rax, rax
+    jz else_2
+    ; Save caller-saved registers
+    mov rax, str_45
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    jmp end_if_3
+else_2:
+    ; Save caller-saved registers
+    mov rax, str_46
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+end_if_3:
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_47
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_48
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 1
+    mov [rbp-72], rax
+while_start_4:
+    mov rax, [rbp-72]
+    cmp rax, 5
+    setle al
+    movzx rax, al
+    test rax, rax
+    jz while_end_5
+    ; Save caller-saved registers
+    mov rax, str_49
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-72]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    mov rax, [rbp-72]
+    add rax, 1
+    mov [rbp-72], rax
+    jmp while_start_4
+while_end_5:
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_50
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_51
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 0
+    mov [rbp-80], rax
+for_start_6:
+    mov rax, [rbp-80]
+    cmp rax, 3
+    setl al
+    movzx rax, al
+    test rax, rax
+    jz for_end_7
+    ; Save caller-saved registers
+    mov rax, str_52
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-80]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+for_continue_8:
+    mov rax, [rbp-80]
+    add rax, 1
+    mov [rbp-80], rax
+    jmp for_start_6
+for_end_7:
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_53
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_54
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers (Windows x64)
+    push rcx
+    push rdx
+    push r8
+    push r9
+    push r10
+    push r11
+    sub rsp, 32    ; Shadow space
+    mov rax, 5
+    mov rcx, rax
+    mov rax, 3
+    mov rdx, rax
+    call performCalculation
+    ; Function result in rax
+    add rsp, 32    ; Clean up shadow space
+    pop r11
+    pop r10
+    pop r9
+    pop r8
+    pop rdx
+    pop rcx
+    ; rax contains return value
+    mov [rbp-88], rax
+    ; Save caller-saved registers
+    mov rax, str_55
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-88]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_56
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers (Windows x64)
+    push rcx
+    push rdx
+    push r8
+    push r9
+    push r10
+    push r11
+    sub rsp, 32    ; Shadow space
+    call testAdvancedFeatures
+    ; Function result in rax
+    add rsp, 32    ; Clean up shadow space
+    pop r11
+    pop r10
+    pop r9
+    pop r8
+    pop rdx
+    pop rcx
+    ; rax contains return value
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_57
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers (Windows x64)
+    push rcx
+    push rdx
+    push r8
+    push r9
+    push r10
+    push r11
+    sub rsp, 32    ; Shadow space
+    call testErrorScenarios
+    ; Function result in rax
+    add rsp, 32    ; Clean up shadow space
+    pop r11
+    pop r10
+    pop r9
+    pop r8
+    pop rdx
+    pop rcx
+    ; rax contains return value
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_58
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_59
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 0
+    jmp main_end
+
+main_end:
+    ; Restore stack and return to C runtime (Windows x64)
+    mov rsp, rbp
+    pop rbp
+    ret
+
+performCalculation:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    mov [rbp-8], rcx
+    mov [rbp-16], rdx
+    ; Save caller-saved registers
+    mov rax, str_60
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_61
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_62
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-16]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    mov rax, [rbp-8]
+    add rax, [rbp-16]
+    mov [rbp-24], rax
+    mov rax, [rbp-8]
+    imul rax, [rbp-16]
+    mov [rbp-32], rax
+    ; Save caller-saved registers
+    mov rax, str_15
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_17
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    mov rax, [rbp-24]
+    add rax, [rbp-32]
+    jmp performCalculation_end
+
+performCalculation_end:
+    mov rsp, rbp
+    pop rbp
+    ret
+
+testAdvancedFeatures:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    ; Save caller-saved registers
+    mov rax, str_63
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, str_64
+    mov [rbp-8], rax
+    ; Save caller-saved registers
+    mov rax, str_65
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_66
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_strlen
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_67
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 100
+    mov [rbp-16], rax
+    mov rax, 50
+    mov [rbp-24], rax
+    ; Save caller-saved registers
+    mov rax, str_68
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-16]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_21
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_69
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-16]
+    sub rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_abs
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+
+testAdvancedFeatures_end:
+    mov rsp, rbp
+    pop rbp
+    ret
+
+testErrorScenarios:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    ; Save caller-saved registers
+    mov rax, str_70
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, str_1
+    mov [rbp-8], rax
+    ; Save caller-saved registers
+    mov rax, str_71
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_strlen
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 0
+    mov [rbp-16], rax
+    ; Save caller-saved registers
+    mov rax, str_72
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-16]
+    mov rcx, rax
+    call dakshin_abs
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_73
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-16]
+    mov rcx, rax
+    mov rax, 10
+    mov rdx, rax
+    call dakshin_min
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_74
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-16]
+    mov rcx, rax
+    mov rax, 10
+    mov rdx, rax
+    call dakshin_max
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    mov rax, -42
+    mov [rbp-24], rax
+    ; Save caller-saved registers
+    mov rax, str_75
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_76
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_abs
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+
+testErrorScenarios_end:
+    mov rsp, rbp
+    pop rbp
+    ret
@@ -0,0 +1,507 @@
+; NASM 64-bit assembly for Dakshin Programming Language (Windows)
+bits 64
+default rel
+
+section .data
+    ; String literals will be placed here
+    ; Standard I/O data structures
+    input_buffer times 4096 db 0
+    newline db 13, 10, 0      ; Windows CRLF
+    space_string db ' ', 0     ; Space character
+    space db 32, 0
+    null_terminator db 0
+    ; File handling structures
+    file_mode_r db 'r', 0
+    file_mode_w db 'w', 0
+    file_mode_a db 'a', 0
+    file_mode_rb db 'rb', 0
+    file_mode_wb db 'wb', 0
+    ; Format strings for I/O
+    fmt_int db '%d', 0
+    fmt_float db '%.2f', 0
+    fmt_string db '%s', 0
+    fmt_char db '%c', 0
+    fmt_newline db '%d', 13, 10, 0    ; Windows CRLF
+    input_fmt_int db '%d', 0
+    input_fmt_float db '%f', 0
+    input_fmt_string db '%s', 0
+    ; GUI string constants
+    alert_title db 'Alert', 0
+    confirm_title db 'Confirm', 0
+    error_title db 'Error', 0
+    info_title db 'Information', 0
+    str_0 db "=== Test Up To String Corruption ===", 0
+    str_1 db "TEST 1: Basic I/O Functions", 0
+    str_2 db "Hello ", 0
+    str_3 db "World! ", 0
+    str_4 db "This is a complete line.", 0
+    str_5 db "", 0
+    str_6 db "TEST 2: Variables and String Operations", 0
+    str_7 db "Dakshin Language", 0
+    str_8 db "Welcome to ", 0
+    str_9 db "Message:", 0
+    str_10 db "Length of message:", 0
+    str_11 db "Combined:", 0
+    str_12 db "TEST 3: Math Operations", 0
+    str_13 db "Number 1:", 0
+    str_14 db "Number 2:", 0
+    str_15 db "Sum:", 0
+    str_16 db "Difference:", 0
+    str_17 db "Product:", 0
+    str_18 db "Division:", 0
+    str_19 db "Absolute value of -25:", 0
+    str_20 db "Minimum of", 0
+    str_21 db "and", 0
+    str_22 db ":", 0
+    str_23 db "Maximum of", 0
+    str_24 db "TEST 4: System Functions", 0
+    str_25 db "Current Unix timestamp:", 0
+    str_26 db "TEST 5: String Functions", 0
+    str_27 db "Programming", 0
+    str_28 db "BEFORE: Test string:", 0
+    str_29 db "Checking string after time() call...", 0
+
+
+section .text
+    ; Entry point for Windows C runtime
+    global main
+    default rel
+
+    ; External C runtime functions (Windows)
+    extern printf
+    extern strlen
+
+; print(value) - Print value to stdout
+dakshin_print:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the value to print (Windows convention)
+    mov rdx, rcx   ; Move value to second parameter (Windows convention)
+    mov rcx, fmt_string  ; Format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; print_int(value) - Print integer value to stdout
+dakshin_print_int:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the integer value to print (Windows convention)
+    mov rdx, rcx   ; Move integer to second parameter (Windows convention)
+    mov rcx, fmt_int  ; Integer format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; strlen(str) - Get string length
+dakshin_strlen:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space
+    ; rcx contains string pointer
+    call strlen
+    ; Result already in rax
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; abs(value) - Absolute value
+dakshin_abs:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx contains value (Windows calling convention)
+    mov rax, rcx
+    test rax, rax
+    jns abs_positive
+    neg rax
+abs_positive:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; min(a, b) - Minimum of two values
+dakshin_min:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx = a, rdx = b (Windows calling convention)
+    cmp rcx, rdx
+    jle min_first
+    mov rax, rdx
+    jmp min_end
+min_first:
+    mov rax, rcx
+min_end:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; max(a, b) - Maximum of two values
+dakshin_max:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Shadow space
+    ; rcx = a, rdx = b (Windows calling convention)
+    cmp rcx, rdx
+    jge max_first
+    mov rax, rdx
+    jmp max_end
+max_first:
+    mov rax, rcx
+max_end:
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; time() - Get current time (stub implementation)
+dakshin_time:
+    push rbp
+    mov rbp, rsp
+    ; Return a fixed timestamp for now to avoid corruption
+    mov rax, 1640995200  ; Fixed timestamp (Jan 1, 2022)
+    mov rsp, rbp
+    pop rbp
+    ret
+
+main:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    ; Save caller-saved registers
+    mov rax, str_0
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    ; Print string: "Hello "
+    mov rcx, str_2
+    call dakshin_print
+    ; Save caller-saved registers
+    ; Print string: "World! "
+    mov rcx, str_3
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_4
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_5
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_6
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, str_7
+    mov [rbp-8], rax
+    mov rax, str_8
+    mov [rbp-16], rax
+    ; Save caller-saved registers
+    mov rax, str_9
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_10
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_strlen
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_11
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-16]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-8]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_5
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_12
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 42
+    mov [rbp-24], rax
+    mov rax, 17
+    mov [rbp-32], rax
+    ; Save caller-saved registers
+    mov rax, str_13
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_14
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_15
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    add rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_16
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    sub rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_17
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    imul rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_18
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    push rdx    ; rdx may hold a call argument
+    cqo
+    idiv qword [rbp-32]
+    pop rdx
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_19
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, -25
+    mov rcx, rax
+    call dakshin_abs
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_20
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_21
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_22
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-24]
+    mov rcx, rax
+    mov rax, [rbp-32]
+    mov rdx, rax
+    call dakshin_min
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_23
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-24]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_21
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-32]
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, str_22
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, [rbp-24]
+    mov rcx, rax
+    mov rax, [rbp-32]
+    mov rdx, rax
+    call dakshin_max
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_5
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_24
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_25
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers
+    call dakshin_time
+    mov rcx, rax
+    call dakshin_print_int
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_5
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_26
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, str_27
+    mov [rbp-40], rax
+    ; Save caller-saved registers
+    mov rax, str_28
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    mov rax, [rbp-40]
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Save caller-saved registers
+    mov rax, str_29
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 0
+    jmp main_end
+
+main_end:
+    ; Restore stack and return to C runtime (Windows x64)
+    mov rsp, rbp
+    pop rbp
+    ret
@@ -0,0 +1,226 @@
+; NASM 64-bit assembly for Dakshin Programming Language (Windows)
+bits 64
+default rel
+
+section .data
+    ; String literals will be placed here
+    ; Standard I/O data structures
+    input_buffer times 4096 db 0
+    newline db 13, 10, 0      ; Windows CRLF
+    space_string db ' ', 0     ; Space character
+    space db 32, 0
+    null_terminator db 0
+    ; File handling structures
+    file_mode_r db 'r', 0
+    file_mode_w db 'w', 0
+    file_mode_a db 'a', 0
+    file_mode_rb db 'rb', 0
+    file_mode_wb db 'wb', 0
+    ; Format strings for I/O
+    fmt_int db '%d', 0
+    fmt_float db '%.2f', 0
+    fmt_string db '%s', 0
+    fmt_char db '%c', 0
+    fmt_newline db '%d', 13, 10, 0    ; Windows CRLF
+    input_fmt_int db '%d', 0
+    input_fmt_float db '%f', 0
+    input_fmt_string db '%s', 0
+    ; GUI string constants
+    alert_title db 'Alert', 0
+    confirm_title db 'Confirm', 0
+    error_title db 'Error', 0
+    info_title db 'Information', 0
+    str_0 db "=== Testing Lambda Functions ===", 0
+    str_1 db "Square of 5:", 0
+    str_2 db "Calculate(3, 4):", 0
+    str_3 db "Message:", 0
+    str_4 db "Hello from lambda!", 0
+
+
+section .text
+    ; Entry point for Windows C runtime
+    global main
+    default rel
+
+    ; External C runtime functions (Windows)
+    extern printf
+
+; print(value) - Print value to stdout
+dakshin_print:
+    push rbp
+    mov rbp, rsp
+    ; Windows x64 calling convention
+    sub rsp, 32    ; Shadow space (required for Windows x64)
+    ; rcx contains the value to print (Windows convention)
+    mov rdx, rcx   ; Move value to second parameter (Windows convention)
+    mov rcx, fmt_string  ; Format string in first parameter
+    xor rax, rax   ; No vector registers used
+    call printf
+    add rsp, 32    ; Clean up shadow space
+    mov rsp, rbp
+    pop rbp
+    ret
+
+main:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 128    ; Allocate stack space for local variables + shadow space
+
+    ; Save caller-saved registers
+    mov rax, str_0
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Load lambda function address
+    mov rax, lambda_0
+    mov [rbp-8], rax
+    ; Save caller-saved registers
+    mov rax, str_1
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers (Windows x64)
+    push rcx
+    push rdx
+    push r8
+    push r9
+    push r10
+    push r11
+    sub rsp, 32    ; Shadow space
+    mov rax, 5
+    mov rcx, rax
+    mov rax, [rbp-8]  ; Load function pointer
+    call rax                ; Indirect call
+    add rsp, 32    ; Clean up shadow space
+    pop r11
+    pop r10
+    pop r9
+    pop r8
+    pop rdx
+    pop rcx
+    ; rax contains return value
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Load lambda function address
+    mov rax, lambda_1
+    mov [rbp-16], rax
+    ; Save caller-saved registers
+    mov rax, str_2
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers (Windows x64)
+    push rcx
+    push rdx
+    push r8
+    push r9
+    push r10
+    push r11
+    sub rsp, 32    ; Shadow space
+    mov rax, 3
+    mov rcx, rax
+    mov rax, 4
+    mov rdx, rax
+    mov rax, [rbp-16]  ; Load function pointer
+    call rax                ; Indirect call
+    add rsp, 32    ; Clean up shadow space
+    pop r11
+    pop r10
+    pop r9
+    pop r8
+    pop rdx
+    pop rcx
+    ; rax contains return value
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    ; Load lambda function address
+    mov rax, lambda_2
+    mov [rbp-24], rax
+    ; Save caller-saved registers
+    mov rax, str_3
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, space_string
+    call dakshin_print
+    ; Save caller-saved registers (Windows x64)
+    push rcx
+    push rdx
+    push r8
+    push r9
+    push r10
+    push r11
+    sub rsp, 32    ; Shadow space
+    mov rax, [rbp-24]  ; Load function pointer
+    call rax                ; Indirect call
+    add rsp, 32    ; Clean up shadow space
+    pop r11
+    pop r10
+    pop r9
+    pop r8
+    pop rdx
+    pop rcx
+    ; rax contains return value
+    mov rcx, rax
+    call dakshin_print
+    mov rcx, newline
+    call dakshin_print
+    mov rax, 0
+    jmp main_end
+
+main_end:
+    ; Restore stack and return to C runtime (Windows x64)
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; Lambda function: lambda_0
+lambda_0:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 40    ; Allocate stack space for locals + shadow space
+    mov [rbp-8], rcx    ; Parameter x
+    mov rax, [rbp-8]
+    imul rax, [rbp-8]
+lambda_0_end:
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; Lambda function: lambda_1
+lambda_1:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 48    ; Allocate stack space for locals + shadow space
+    mov [rbp-8], rcx    ; Parameter a
+    mov [rbp-16], rdx    ; Parameter b
+    mov rax, [rbp-8]
+    add rax, [rbp-16]
+    mov [rbp-32], rax
+    mov rax, [rbp-8]
+    imul rax, [rbp-16]
+    mov [rbp-40], rax
+    mov rax, [rbp-32]
+    add rax, [rbp-40]
+    jmp lambda_1_end
+lambda_1_end:
+    mov rsp, rbp
+    pop rbp
+    ret
+
+; Lambda function: lambda_2
+lambda_2:
+    push rbp
+    mov rbp, rsp
+    sub rsp, 32    ; Allocate stack space for locals + shadow space
+    mov rax, str_4
+lambda_2_end:
+    mov rsp, rbp
+    pop rbp
+    ret
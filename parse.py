@@ -14,22 +14,44 @@ from main import process_code
 from Lexer import Lexer
 from File import FileReader
 from Error import ErrorHandler
+from Parser import Parser
+from ast_visualizer import print_ast_tree
+from arena import ASTArena
 
 def main():
     """Main parser interface"""
     if len(sys.argv) < 2:
         print("Dakshin Programming Language Parser")
-        print("Usage: python parse.py <source_file>")
+        print("Usage: python parse.py <source_file> [--format=json|bin] [--outline] [--arena]")
         print("")
         print("Examples:")
-        print("  python parse.py program.dn    # Parse and show AST")
+        print("  python parse.py program.dn              # Parse and show AST")
+        print("  python parse.py program.dn --format=bin > program.ast  # Write the binary AST format")
+        print("  python parse.py program.dn --outline    # Show declarations, skip function bodies")
+        print("  python parse.py program.dn --arena      # Show the AST read back from an ASTArena")
         return
     
     error_handler = ErrorHandler()
     lexer = Lexer(error_handler)
     file_path = sys.argv[1]
     file_reader = FileReader(file_path=file_path)
-    process_code(lexer, file_reader)
+    if '--outline' in sys.argv[2:]:
+        # Function and constructor bodies are left unparsed
+        tokens = lexer.tokenize(file_reader, parser_kinds=True)
+        print_ast_tree(Parser(tokens, lazy_bodies=True).parse())
+        return
+    if '--arena' in sys.argv[2:]:
+        tokens = lexer.tokenize(file_reader, parser_kinds=True)
+        print_ast_tree(ASTArena.from_ast(Parser(tokens).parse()).program())
+        return
+    format = 'json'
+    for arg in sys.argv[2:]:
+        if arg.startswith('--format='):
+            format = arg.split('=', 1)[1]
+    if format not in ('json', 'bin'):
+        print(f"Unknown AST format '{format}', expected json or bin")
+        return
+    process_code(lexer, file_reader, format)
 
 if __name__ == "__main__":
     main()
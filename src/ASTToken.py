@@ -1,13 +1,225 @@
+"""
+AST node classes for Dakshin
+
+Every node kind is a class with __slots__ for its fields, an integer kind
+tag and the token span (start, end) it was parsed from. Nodes also answer
+the read-only mapping protocol (node['type'], node.get('body'), keys())
+so code written against the old dict-based AST keeps working, and
+to_dict()/from_dict() convert to and from that dict form for JSON.
+"""
+
+import keyword
+
+_MISSING = object()  # Marks an optional field that was not given
+
 class ASTNode:
-    def __init__(self, type_, children=None, value=None):
-        self.type = type_
-        self.children = children or []
-        self.value = value
+    """Base class of all AST nodes."""
+    __slots__ = ('start', 'end')
+    kind = -1
+    type = None
+    fields = ()        # Field names as they appear in the dict form
+    slots = ()         # Attribute name of each field ('else' -> 'else_')
+    optional = frozenset()
+    _slot_of = {}
+
+    @property
+    def span(self):
+        """(first token index, index after the last token), or (None, None) if unknown."""
+        return self.start, self.end
+
+    def items(self):
+        """(field, value) pairs of the fields that are set, after ('type', type)."""
+        yield 'type', self.type
+        for field, slot in zip(self.fields, self.slots):
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                yield field, value
+
+    def keys(self):
+        return [field for field, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def __getitem__(self, field):
+        if field == 'type':
+            return self.type
+        try:
+            return getattr(self, self._slot_of[field])
+        except (KeyError, AttributeError):
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def __contains__(self, field):
+        return field == 'type' or (field in self._slot_of and hasattr(self, self._slot_of[field]))
+
+    def replace(self, **changes):
+        """Copy of the node with some fields (by dict name) replaced."""
+        node = object.__new__(type(self))
+        for field, slot in zip(self.fields, self.slots):
+            value = changes.get(field, getattr(self, slot, _MISSING))
+            if value is not _MISSING:
+                setattr(node, slot, value)
+        node.start = self.start
+        node.end = self.end
+        return node
+
+    def to_dict(self, spans=False):
+        """The node as the dict-based AST, recursively; with spans=True each node gets a "span"."""
+        return to_dict(self, spans)
+
+    @staticmethod
+    def from_dict(data):
+        """Build nodes from the dict-based AST (a node dict, or a list of them)."""
+        return from_dict(data)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, slot, _MISSING) == getattr(other, slot, _MISSING) for slot in self.slots)
+
+    __hash__ = None
 
     def __repr__(self):
-        if self.value is not None:
-            return f"{self.type}({self.value})"
-        return f"{self.type}({', '.join(map(str, self.children))})"
-    
-    def __str__(self):
-        return self.__repr__()
+        fields = ', '.join(f"{field}={value!r}" for field, value in self.items() if field != 'type')
+        return f"{type(self).__name__}({fields})"
+
+class ASTSequence:
+    """Base of list-like AST values that are not lists (lazy bodies, arena lists)."""
+    __slots__ = ()
+
+NODE_CLASSES = []  # Indexed by kind
+NODE_TYPES = {}    # 'binary' -> BinaryNode
+
+def node_class(type_name, fields, optional=()):
+    """Define the node class for one kind, with a generated __init__ taking its fields in order."""
+    slots = tuple(field + '_' if keyword.iskeyword(field) else field for field in fields)
+    parameters = []
+    body = []
+    for field, slot in zip(fields, slots):
+        if field in optional:
+            parameters.append(f"{slot}=_MISSING")
+            body.append(f"    if {slot} is not _MISSING: self.{slot} = {slot}")
+        else:
+            parameters.append(slot)
+            body.append(f"    self.{slot} = {slot}")
+    body.append("    self.start = start")
+    body.append("    self.end = end")
+    source = f"def __init__(self, {''.join(p + ', ' for p in parameters)}start=None, end=None):\n" + "\n".join(body)
+    namespace = {'_MISSING': _MISSING}
+    exec(source, namespace)
+
+    name = ''.join(part.capitalize() for part in type_name.split('_')) + 'Node'
+    cls = type(name, (ASTNode,), {
+        '__slots__': slots,
+        '__init__': namespace['__init__'],
+        'kind': len(NODE_CLASSES),
+        'type': type_name,
+        'fields': tuple(fields),
+        'slots': slots,
+        'optional': frozenset(optional),
+        '_slot_of': dict(zip(fields, slots)),
+        '__module__': __name__,
+    })
+    NODE_CLASSES.append(cls)
+    NODE_TYPES[type_name] = cls
+    return cls
+
+# Declarations
+ClassNode = node_class('class', ('name', 'base', 'modifiers', 'members'))
+InterfaceNode = node_class('interface', ('name', 'base', 'modifiers', 'members'))
+InterfaceFunctionNode = node_class('interface_function', ('name', 'params', 'return_type'))
+FunctionNode = node_class('function', ('name', 'params', 'return_type', 'modifiers', 'body'))
+ConstructorNode = node_class('constructor', ('name', 'params', 'modifiers', 'super', 'body'))
+VarDeclNode = node_class('var_decl', ('name', 'var_type', 'init', 'modifiers'), optional=('modifiers',))
+ImportNode = node_class('import', ('module', 'alias'))
+FromImportNode = node_class('from_import', ('module', 'imports'))
+NamespaceNode = node_class('namespace', ('name', 'body'))
+
+# Statements
+BlockNode = node_class('block', ('body',))
+ExprStmtNode = node_class('expr_stmt', ('expr',))
+AssignmentNode = node_class('assignment', ('name', 'value'))
+VariableDeclarationNode = node_class('variable_declaration', ('name', 'var_type', 'value'))
+IfNode = node_class('if', ('cond', 'then', 'else'))
+WhileNode = node_class('while', ('cond', 'body'))
+DoWhileNode = node_class('do_while', ('body', 'cond'))
+ReturnNode = node_class('return', ('value',))
+ForNode = node_class('for', ('init', 'condition', 'update', 'body'))
+SwitchNode = node_class('switch', ('expr', 'cases', 'default'))
+MatchNode = node_class('match', ('expr', 'cases', 'default'))
+TryNode = node_class('try', ('try_block', 'catch_blocks', 'finally_block'))
+ThrowNode = node_class('throw', ('expr',))
+BreakNode = node_class('break', ())
+ContinueNode = node_class('continue', ())
+
+# Expressions
+MemberAssignmentNode = node_class('member_assignment', ('target', 'value'))
+CastNode = node_class('cast', ('expr', 'target_type'))
+BinaryNode = node_class('binary', ('op', 'left', 'right'))
+UnaryNode = node_class('unary', ('op', 'right'))
+NumberNode = node_class('number', ('value',))
+StringNode = node_class('string', ('value',))
+RegexNode = node_class('regex', ('value',))
+BooleanNode = node_class('boolean', ('value',))
+NullNode = node_class('null', ('value',))
+NewNode = node_class('new', ('class', 'args'))
+IdentifierNode = node_class('identifier', ('value',))
+LambdaNode = node_class('lambda', ('params', 'body'))
+CallNode = node_class('call', ('callee', 'args'))
+MemberNode = node_class('member', ('object', 'member'))
+ArrayLiteralNode = node_class('array_literal', ('elements',))
+
+# Type annotations
+PointerNode = node_class('pointer', ('base_type',))
+
+def to_dict(value, spans=False):
+    """Convert nodes inside any AST value (node, list, record dict) to the dict form."""
+    if isinstance(value, ASTNode):
+        data = {field: to_dict(item, spans) for field, item in value.items()}
+        if spans:
+            data['span'] = [value.start, value.end]
+        return data
+    if isinstance(value, dict):
+        return {key: to_dict(item, spans) for key, item in value.items()}
+    if isinstance(value, (list, tuple, ASTSequence)):
+        # LazyBody proxies are parsed here
+        return [to_dict(item, spans) for item in value]
+    return value
+
+def node_class_of(data):
+    """The node class a dict of the dict form stands for, or None if it is a plain record.
+
+    A dict is read as a node only if its "type" names a node kind and its
+    keys are exactly that kind's fields, so records such as parameters
+    ({"name": ..., "type": "function"}) stay plain dicts.
+    """
+    type_name = data.get('type')
+    cls = NODE_TYPES.get(type_name) if isinstance(type_name, str) else None
+    if cls is not None:
+        keys = data.keys() - {'type', 'span'}
+        if keys <= set(cls.fields) and set(cls.fields) - keys <= cls.optional:
+            return cls
+    return None
+
+def from_dict(value):
+    """Convert the dict form back to nodes."""
+    if isinstance(value, list):
+        return [from_dict(item) for item in value]
+    if isinstance(value, dict):
+        cls = node_class_of(value)
+        if cls is not None:
+            span = value.get('span')
+            node = object.__new__(cls)
+            for field, slot in zip(cls.fields, cls.slots):
+                if field in value:
+                    setattr(node, slot, from_dict(value[field]))
+            node.start, node.end = span if span else (None, None)
+            return node
+        return {key: from_dict(item) for key, item in value.items()}
+    return value
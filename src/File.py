@@ -1,11 +1,24 @@
+from bisect import bisect_right
+from mmap import mmap as MemoryMap, ACCESS_READ
 from Error import Error
 
 class FileReader:
-	"""Handles reading the file and tracking position."""
-	def __init__(self, file_path=None, source_code=None):
+	"""Handles reading the file and tracking position.
+
+	With mmap=True the file is memory-mapped instead of read into a str:
+	source_code is then a bytes-like mmap object, offsets are byte offsets,
+	and the lexer matches it with its bytes pattern.
+	"""
+	def __init__(self, file_path=None, source_code=None, mmap=False):
+		self.is_bytes = False
+		self._file = None
 		if file_path:
 			self.file_path = file_path
-			self.source_code = self._read_file(file_path)
+			if mmap:
+				self.source_code = self._map_file(file_path)
+				self.is_bytes = True
+			else:
+				self.source_code = self._read_file(file_path)
 		elif source_code is not None:
 			self.file_path = None
 			self.source_code = source_code
@@ -15,6 +28,7 @@ class FileReader:
 		self.pos = 0
 		self.line = 1
 		self.column = 1
+		self._line_starts = None
 
 	def _read_file(self, file_path):
 		"""Read source code from a file."""
@@ -26,16 +40,40 @@ class FileReader:
 		except IOError as e:
 			raise Error(f"Unable to read file: {e}")
 
+	def _map_file(self, file_path):
+		"""Memory-map a file read-only."""
+		try:
+			self._file = open(file_path, 'rb')
+		except FileNotFoundError:
+			raise Error(f"File not found: {file_path}")
+		except IOError as e:
+			raise Error(f"Unable to read file: {e}")
+		try:
+			return MemoryMap(self._file.fileno(), 0, access=ACCESS_READ)
+		except ValueError:
+			# Empty files cannot be mapped
+			return b''
+
+	def close(self):
+		"""Release the mapping and file handle of an mmap-backed reader (a no-op otherwise)."""
+		if self._file is not None:
+			if isinstance(self.source_code, MemoryMap):
+				self.source_code.close()
+			self._file.close()
+			self._file = None
+
 	def current_char(self):
 		"""Return the current character or None if at the end."""
 		if self.pos < len(self.source_code):
+			if self.is_bytes:
+				return chr(self.source_code[self.pos])
 			return self.source_code[self.pos]
 		return None
 
 	def advance(self):
 		"""Advance to the next character, updating position."""
 		if self.pos < len(self.source_code):
-			char = self.source_code[self.pos]
+			char = self.current_char()
 			if char == '\n':
 				self.line += 1
 				self.column = 1
@@ -43,6 +81,28 @@ class FileReader:
 				self.column += 1
 			self.pos += 1
 
-	def get_position(self):
-		"""Return the current line and column."""
-		return self.line, self.column
\ No newline at end of file
+	@property
+	def line_starts(self):
+		"""Offsets at which each line begins, computed once on first use."""
+		if self._line_starts is None:
+			source = self.source_code
+			newline = b'\n' if self.is_bytes else '\n'
+			starts = [0]
+			index = source.find(newline)
+			while index != -1:
+				starts.append(index + 1)
+				index = source.find(newline, index + 1)
+			self._line_starts = starts
+		return self._line_starts
+
+	def get_position(self, offset=None):
+		"""Return the line and column of an offset (defaults to the current position)."""
+		if offset is None:
+			offset = self.pos
+		line_starts = self.line_starts
+		line = bisect_right(line_starts, offset)
+		line_start = line_starts[line - 1]
+		if self.is_bytes:
+			# Count characters rather than bytes on the (possibly non-ASCII) line
+			return line, len(self.source_code[line_start:offset].decode('utf-8', 'replace')) + 1
+		return line, offset - line_start + 1
@@ -1,7 +1,15 @@
 import re
 from File import FileReader
 from Error import SyntaxError, UnknownTokenError, UnterminatedCommentError, UnterminatedStringError, ErrorHandler
-from Tokens import TokenType, Token
+from Tokens import TokenType, Token, TokenStream, NUMERIC_TOKEN_TYPES, decode_number
+from ParsingTable import ParserTokenType, KEYWORDS, TOKEN_TYPE_TO_PARSER, parser_kind
+
+# Keyword table keyed by the raw bytes of an identifier, for memory-mapped sources
+KEYWORD_BYTES = {word.encode('ascii'): kind for word, kind in KEYWORDS.items()}
+
+# Opening bracket text -> closing bracket text, for iter_tokens' balance check
+BRACKET_TEXT = {'(': ')', '[': ']', '{': '}'}
+CLOSING_BRACKET_TEXT = frozenset(BRACKET_TEXT.values())
 
 class Lexer:
 	def __init__(self, error_handler):
@@ -77,98 +85,240 @@ class Lexer:
 		self.get_token = re.compile('|'.join(
 			f'(?P<{name.value}>{pattern})' for name, pattern in self.TOKEN_SPECIFICATION
 		)).match
+		self._get_token_bytes = None
+
+	@property
+	def get_token_bytes(self):
+		"""Bytes-pattern variant of get_token, compiled on first use."""
+		if self._get_token_bytes is None:
+			self._get_token_bytes = re.compile(b'|'.join(
+				f'(?P<{name.value}>{pattern})'.encode('ascii') for name, pattern in self.TOKEN_SPECIFICATION
+			)).match
+		return self._get_token_bytes
 	def skip_multiline_comment(self, file_reader, start_line, start_column):
-		"""Skips characters until the end of a multiline comment or reports an error if it's unterminated."""
-		while True:
-			char = file_reader.current_char()
-			if char is None:
-				# End of file reached without finding `*/`
-				self.error_handler.report(
-					UnterminatedCommentError(start_line, start_column, file_reader.file_path)
-				)
-				return False
-			elif char == '*':
-				# Check for the end of the comment
-				file_reader.advance()  # Consume '*'
-				if file_reader.current_char() == '/':
-					file_reader.advance()  # Consume '/'
-					return True
-			else:
-				file_reader.advance()  # Move to the next character
+		"""Skips to the end of a multiline comment or reports an error if it's unterminated."""
+		end = file_reader.source_code.find(b'*/' if file_reader.is_bytes else '*/', file_reader.pos)
+		if end == -1:
+			# End of file reached without finding `*/`
+			self.error_handler.report(
+				UnterminatedCommentError(start_line, start_column, file_reader.file_path)
+			)
+			file_reader.pos = len(file_reader.source_code)
+			return False
+		file_reader.pos = end + 2
+		return True
 	
-	def tokenize(self, file_reader):
-		"""Tokenize input from a FileReader."""
-		tokens = []
-		while (char := file_reader.current_char()) is not None:
+	def tokenize(self, file_reader, parser_kinds=False):
+		"""Tokenize input from a FileReader into a TokenStream.
+
+		Positions are tracked as plain offsets; line and column are derived from
+		the reader's line-start index only when a token or error needs them.
+		With parser_kinds=True the stream holds ParserTokenType kinds directly
+		(keywords classified, trivia dropped), so no convert_token_types pass
+		is needed before parsing. Memory-mapped readers are matched with the
+		bytes pattern and token text is only decoded when a value is read.
+		"""
+		source = file_reader.source_code
+		is_bytes = file_reader.is_bytes
+		keywords = KEYWORD_BYTES if is_bytes else KEYWORDS
+		if parser_kinds:
+			tokens = TokenStream(source, ParserTokenType, file_reader.line_starts, numeric_kinds=(ParserTokenType.NUMBER,))
+		else:
+			tokens = TokenStream(source, TokenType, file_reader.line_starts)
+		append = tokens.append
+		length = len(source)
+		get_token = self.get_token_bytes if is_bytes else self.get_token
+		get_position = file_reader.get_position
+		pos = file_reader.pos
+		while pos < length:
 
-			match = self.get_token(file_reader.source_code, file_reader.pos)
+			match = get_token(source, pos)
 			if not match:
 				# If no token matches, we have an unknown token
-				line, column = file_reader.get_position()
+				line, column = get_position(pos)
+				char = source[pos:pos + 1]
+				if is_bytes:
+					char = char.decode('utf-8', 'replace')
 				self.error_handler.report(
-					UnknownTokenError(file_reader.source_code[file_reader.pos], line, column, file_reader.file_path)
+					UnknownTokenError(char, line, column, file_reader.file_path)
 				)
 				# Skip the problematic character and move ahead by 1 position
-				file_reader.pos += 1
+				pos += 1
 				continue
 
-			token_type_name = match.lastgroup  # Get the matched group name
-			token_type = TokenType[token_type_name]  # Use the Enum to get the token type
-			value = match.group()
+			token_type = TokenType[match.lastgroup]  # Use the Enum to get the token type
+			end = match.end()
 
-			if token_type == TokenType.WHITESPACE:
-				# Skip whitespace and advance the position
-				file_reader.pos = match.end()
+			if token_type == TokenType.WHITESPACE or token_type == TokenType.COMMENT:
+				# Skip whitespace and single-line comments
+				pos = end
 				continue
 			elif token_type == TokenType.MULTILINE_COMMENT_START:
 				# Handle multiline comments
-				file_reader.pos = match.end()  # Move past the start delimiter
-				start_line, start_column = file_reader.get_position()
+				file_reader.pos = end  # Move past the start delimiter
+				start_line, start_column = get_position(end)
 				if not self.skip_multiline_comment(file_reader, start_line, start_column):
 					# Unterminated comment error is reported inside skip_multiline_comment
+					pos = file_reader.pos
 					break
-			elif token_type == TokenType.STRING:
-				# For valid strings, add them as tokens
-				# tokens.append((token_type, value))
-				tokens.append(Token(token_type, value))
-				file_reader.pos = match.end()  # Move past the string token
+				pos = file_reader.pos
+				continue
 			elif token_type == TokenType.UNTERMINATED_STRING:
 				# Handle unterminated strings and report the error
-				line, column = file_reader.get_position()
+				line, column = get_position(pos)
+				text = match.group()
+				if is_bytes:
+					text = text.decode('utf-8', 'replace')
 				self.error_handler.report(
-					UnterminatedStringError(value, line, column, file_reader.file_path)
+					UnterminatedStringError(text, line, column, file_reader.file_path)
 				)
-				# Move past the unterminated string (skip to the next character)
-				file_reader.pos = match.end()  # Advancing past the unterminated string
-			elif token_type == TokenType.COMMENT:
-				# If we encounter a comment, just skip it and move to the next line
-				file_reader.pos = match.end()  # Move past the comment
-				continue  # Skip adding comments as tokens
-			elif token_type == TokenType.INTEGER:
-				# For integers, add them as tokens
-				# tokens.append((token_type, int(value)))
-				tokens.append(Token(token_type, int(value)))
-				file_reader.pos = match.end()
-			elif token_type == TokenType.FLOAT:
-				# For floats, add them as tokens
-				# tokens.append((token_type, float(value)))
-				tokens.append(Token(token_type, float(value)))
-				file_reader.pos = match.end()
-			elif token_type == TokenType.BINARY:
-				# For binary numbers, add them as tokens
-				# tokens.append((token_type, int(value, 2)))
-				tokens.append(Token(token_type, int(value, 2)))
-				file_reader.pos = match.end()
-			elif token_type == TokenType.HEX:
-				# For hexadecimal numbers, add them as tokens
-				# tokens.append((token_type, int(value, 16)))
-				tokens.append(Token(token_type, int(value, 16)))
-				file_reader.pos = match.end()
+				pos = end
+				continue
+
+			if parser_kinds:
+				if token_type == TokenType.IDENT:
+					kind = keywords.get(source[pos:end], ParserTokenType.IDENTIFIER)
+				elif token_type in TOKEN_TYPE_TO_PARSER:
+					kind = TOKEN_TYPE_TO_PARSER[token_type]
+				else:
+					text = match.group()
+					kind = parser_kind(token_type, text.decode('utf-8', 'replace') if is_bytes else text)
+				if kind is None:
+					# Newlines and other tokens the parser skips
+					pos = end
+					continue
+				append(kind, pos, end)
 			else:
-				# For all other valid tokens, add to the list
-				# tokens.append((token_type, value))
-				tokens.append(Token(token_type, value))
-				# Move past the matched token
-				file_reader.pos = match.end()
+				# Values (including numeric conversion) are produced lazily by the stream
+				append(token_type, pos, end)
+			pos = end
 
+		file_reader.pos = pos
+		# Pair up brackets now so the parser can jump across balanced regions
+		for index, message in tokens.pair_brackets():
+			line, column = tokens.location(index)
+			self.error_handler.report(SyntaxError(message, line, column, file_reader.file_path))
 		return tokens
+
+	def iter_tokens(self, stream, parser_kinds=False, chunk_size=1 << 16, file_path=None):
+		"""Lazily tokenize a text stream, reading it in chunks.
+
+		Yields Token objects with line and column set. Only the unread part of
+		the current chunk is kept in memory: matching is limited to complete
+		lines, and strings or /* */ comments that run past the end of the
+		buffered text cause the next chunk to be read before they are matched.
+		Unbalanced brackets are reported as they are found (unclosed ones once
+		the input ends); only the stack of open brackets is kept for this.
+		"""
+		if file_path is None:
+			file_path = getattr(stream, 'name', None)
+		numeric_kinds = (ParserTokenType.NUMBER,) if parser_kinds else NUMERIC_TOKEN_TYPES
+		open_brackets = []  # Tokens of the brackets not closed yet
+		get_token = self.get_token
+		buffer = ''
+		base = 0           # Absolute offset of buffer[0]
+		pos = 0            # Position within buffer
+		line = 1
+		line_start = 0     # Absolute offset at which the current line starts
+		limit = 0          # End of the last complete line in buffer
+		at_eof = False
+
+		while True:
+			if pos >= limit and not at_eof:
+				# Drop what has been consumed and read the next chunk
+				buffer = buffer[pos:]
+				base += pos
+				pos = 0
+				chunk = stream.read(chunk_size)
+				if chunk:
+					buffer += chunk
+					limit = buffer.rfind('\n') + 1
+				else:
+					at_eof = True
+				if at_eof:
+					limit = len(buffer)
+				continue
+			if pos >= len(buffer):
+				break
+
+			char = buffer[pos]
+			if char == '/' and buffer.startswith('/*', pos):
+				end = buffer.find('*/', pos + 2)
+				if end == -1 and not at_eof:
+					limit = pos  # Read on until the comment is closed
+					continue
+				comment_line = line
+				comment_column = base + pos + 2 - line_start + 1
+				if end == -1:
+					self.error_handler.report(
+						UnterminatedCommentError(comment_line, comment_column, file_path)
+					)
+					end = len(buffer)
+				else:
+					end += 2
+			else:
+				match = get_token(buffer, pos)
+				if not match:
+					line_column = base + pos - line_start + 1
+					self.error_handler.report(
+						UnknownTokenError(char, line, line_column, file_path)
+					)
+					pos += 1
+					continue
+				token_type = TokenType[match.lastgroup]
+				end = match.end()
+				if not at_eof and (end > limit or (char in '"\'' and token_type != TokenType.STRING)):
+					# The token may continue in the next chunk
+					limit = pos
+					continue
+
+				column = base + pos - line_start + 1
+				if token_type == TokenType.UNTERMINATED_STRING:
+					self.error_handler.report(
+						UnterminatedStringError(match.group(), line, column, file_path)
+					)
+				elif token_type != TokenType.WHITESPACE and token_type != TokenType.COMMENT:
+					text = match.group()
+					if parser_kinds:
+						if token_type == TokenType.IDENT:
+							kind = KEYWORDS.get(text, ParserTokenType.IDENTIFIER)
+						elif token_type in TOKEN_TYPE_TO_PARSER:
+							kind = TOKEN_TYPE_TO_PARSER[token_type]
+						else:
+							kind = parser_kind(token_type, text)
+					else:
+						kind = token_type
+					if kind is not None:
+						token = Token(kind, decode_number(text) if kind in numeric_kinds else text, line, column)
+						if text in BRACKET_TEXT:
+							open_brackets.append(token)
+						elif text in CLOSING_BRACKET_TEXT:
+							self.close_bracket(open_brackets, token, file_path)
+						yield token
+
+			# Keep line tracking in step with the text just consumed
+			newlines = buffer.count('\n', pos, end)
+			if newlines:
+				line += newlines
+				line_start = base + buffer.rfind('\n', pos, end) + 1
+			pos = end
+
+		for token in open_brackets:
+			self.error_handler.report(
+				SyntaxError(f"Unclosed '{token.value}'", token.line, token.column, file_path)
+			)
+
+	def close_bracket(self, open_brackets, token, file_path):
+		"""Match a closing bracket against the open ones, reporting it if it is unbalanced."""
+		for depth in range(len(open_brackets) - 1, -1, -1):
+			if BRACKET_TEXT[open_brackets[depth].value] == token.value:
+				# Whatever was opened after the matching bracket is left unclosed
+				for unclosed in open_brackets[depth + 1:]:
+					self.error_handler.report(
+						SyntaxError(f"Unclosed '{unclosed.value}'", unclosed.line, unclosed.column, file_path)
+					)
+				del open_brackets[depth:]
+				return
+		self.error_handler.report(
+			SyntaxError(f"Unmatched '{token.value}'", token.line, token.column, file_path)
+		)
@@ -1,63 +1,259 @@
 from enum import Enum
 from ParsingTable import ParserTokenType
+from Tokens import TokenStream, TokenBuffer
+from ASTToken import *
+import Error
+
+# Binding powers (left, right) of infix operators, loosest first. A right
+# power equal to the left one makes an operator left-associative; '**' is
+# right-associative and binds tighter than prefix operators.
+BINARY_OPERATORS = {
+    ParserTokenType.PIPEPIPE: (1, 1),
+    ParserTokenType.AMPAMP: (2, 2),
+    ParserTokenType.PIPE: (3, 3),
+    ParserTokenType.CARET: (4, 4),
+    ParserTokenType.AMP: (5, 5),
+    ParserTokenType.EQEQ: (6, 6),
+    ParserTokenType.BANGEQ: (6, 6),
+    ParserTokenType.GT: (7, 7),
+    ParserTokenType.GTEQ: (7, 7),
+    ParserTokenType.LT: (7, 7),
+    ParserTokenType.LTEQ: (7, 7),
+    ParserTokenType.INSTANCEOF: (7, 7),
+    ParserTokenType.LTLT: (8, 8),
+    ParserTokenType.GTGT: (8, 8),
+    # 9: 'as' casts (CAST_BINDING_POWER)
+    ParserTokenType.PLUS: (10, 10),
+    ParserTokenType.MINUS: (10, 10),
+    ParserTokenType.STAR: (11, 11),
+    ParserTokenType.SLASH: (11, 11),
+    ParserTokenType.MOD: (11, 11),
+    # 12: prefix - ! * & (UNARY_BINDING_POWER)
+    ParserTokenType.STARSTAR: (13, 12),
+}
+CAST_BINDING_POWER = 9
+UNARY_BINDING_POWER = 12
+
+# Tokens that start a declaration; error recovery resumes parsing at them
+DECLARATION_KEYWORDS = frozenset({
+    ParserTokenType.FUNCTION, ParserTokenType.CLASS, ParserTokenType.INTERFACE,
+    ParserTokenType.LET, ParserTokenType.IMPORT, ParserTokenType.FROM, ParserTokenType.NAMESPACE,
+    ParserTokenType.PUBLIC, ParserTokenType.PRIVATE, ParserTokenType.PROTECTED, ParserTokenType.STATIC,
+    ParserTokenType.ABSTRACT, ParserTokenType.FINAL, ParserTokenType.OVERRIDE,
+})
+ASSIGNMENT_TARGETS = frozenset({IdentifierNode.kind, MemberNode.kind, UnaryNode.kind})
+OPENING_BRACKETS = frozenset({ParserTokenType.LPAREN, ParserTokenType.LBRACKET, ParserTokenType.LBRACE})
+MAX_ERRORS = 100
+
+class StopParsing(Exception):
+    """Unwinds a recovering parse that reached the end of input or the error cap."""
+
+class LazyBody(ASTSequence):
+    """
+    Function or constructor body whose statements are parsed on first use.
+
+    Only the token span from '{' to its matching '}' is kept. Iterating,
+    indexing, len() or force() parse the block (eagerly, as Parser would
+    have) and cache the statement list, so syntax errors inside the body
+    surface at that point rather than during the outer parse. They are
+    reported to the error handler of the parser that deferred the body,
+    and recovered from as that parser would; without one the first error
+    is raised.
+    """
+    __slots__ = ('tokens', 'start', 'end', 'statements', 'error_handler', 'file_path')
+
+    def __init__(self, tokens, start, end, error_handler=None, file_path=None):
+        self.tokens = tokens
+        self.start = start          # Index of '{'
+        self.end = end              # Index of the matching '}'
+        self.statements = None
+        self.error_handler = error_handler
+        self.file_path = file_path
+
+    @property
+    def parsed(self):
+        return self.statements is not None
+
+    def force(self):
+        """Parse the body if needed and return its list of statements."""
+        if self.statements is None:
+            parser = Parser(self.tokens, error_handler=self.error_handler, file_path=self.file_path)
+            parser.pos = self.start
+            try:
+                self.statements = parser.parse_block()
+            except StopParsing:
+                self.statements = []  # Too many errors; they have been reported
+        return self.statements
+
+    def __iter__(self):
+        return iter(self.force())
+
+    def __len__(self):
+        return len(self.force())
+
+    def __getitem__(self, index):
+        return self.force()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, LazyBody):
+            other = other.force()
+        return self.force() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        state = f"{len(self.statements)} statements" if self.parsed else "not parsed"
+        return f"LazyBody(tokens {self.start}..{self.end}, {state})"
+
+def force_bodies(node):
+    """Return node with every LazyBody inside it replaced by its parsed statements."""
+    if isinstance(node, LazyBody):
+        return node.force()
+    if isinstance(node, ASTNode):
+        return node.replace(**{field: force_bodies(value) for field, value in node.items() if field != 'type'})
+    if isinstance(node, dict):
+        return {key: force_bodies(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [force_bodies(item) for item in node]
+    return node
 
 class Parser:
-    def __init__(self, tokens):
+    """
+    Recursive-descent parser producing a dict-based AST.
+
+    Without an error_handler the first syntax error is raised. With one,
+    each error is reported to it (with line and column) and parsing resumes
+    at the next ';', '}' or declaration keyword, so a single parse finds
+    every error; after max_errors the rest of the input is skipped.
+    """
+    def __init__(self, tokens, lazy_bodies=False, error_handler=None, file_path=None, max_errors=MAX_ERRORS):
+        # TokenStream and TokenBuffer are read in place; anything else is a list of Tokens
+        if not isinstance(tokens, (TokenStream, TokenBuffer)):
+            tokens = TokenStream.from_tokens(tokens, ParserTokenType)
         self.tokens = tokens
         self.pos = 0
+        # Skipping a body needs its matching '}', which only a whole TokenStream knows
+        self.lazy_bodies = lazy_bodies and isinstance(tokens, TokenStream)
+        self.error_handler = error_handler
+        self.file_path = file_path
+        self.max_errors = max_errors
+        self.error_count = 0
 
     def peek(self, offset=0):
-        if self.pos + offset < len(self.tokens):
+        if self.tokens.has(self.pos + offset):
             return self.tokens[self.pos + offset]
         return self.tokens[-1]  # EOF
 
+    def peek_type(self, offset=0):
+        """Return the kind of a token without materializing a Token object."""
+        if self.tokens.has(self.pos + offset):
+            return self.tokens.kind_at(self.pos + offset)
+        return self.tokens.kind_at(-1)  # EOF
+
     def match(self, *types):
-        if not self.is_at_end() and self.peek().type in types:
+        if not self.is_at_end() and self.peek_type() in types:
             self.pos += 1
             return True
         return False
 
     def consume(self, type_, message):
-        if self.peek().type != type_:
+        if self.peek_type() != type_:
             raise SyntaxError(f"{message}. Got: {self.peek().value}")
         self.pos += 1
         return self.tokens[self.pos - 1]
 
     def is_at_end(self):
-        return self.pos >= len(self.tokens)
+        return not self.tokens.has(self.pos)
+
+    def recover(self, error, start):
+        """Report a syntax error and skip to where parsing can resume.
+
+        start is the position of the declaration or statement that failed.
+        Without an error handler the error is re-raised unchanged.
+        """
+        if self.error_handler is None:
+            raise error
+        index = self.pos if self.tokens.has(self.pos) else self.pos - 1
+        line, column = self.tokens.location(index) if index >= 0 else (None, None)
+        self.error_handler.report(Error.SyntaxError(str(error), line, column, self.file_path))
+        self.error_count += 1
+        if self.error_count >= self.max_errors:
+            self.error_handler.report(Error.Error(f"Too many syntax errors ({self.error_count}), giving up"))
+            raise StopParsing()
+        self.synchronize(start)
+        if self.is_at_end():
+            raise StopParsing()
+
+    def synchronize(self, start):
+        """Skip past the next ';', or up to a '}' or declaration keyword.
+
+        Bracketed regions are jumped over with match_of, so separators inside
+        them are ignored; a skipped '{...}' block also ends the statement.
+        """
+        tokens = self.tokens
+        while tokens.has(self.pos):
+            kind = tokens.kind_at(self.pos)
+            if kind == ParserTokenType.SEMICOLON:
+                self.pos += 1
+                return
+            if self.pos > start and (kind == ParserTokenType.RBRACE or kind in DECLARATION_KEYWORDS):
+                return
+            if kind in OPENING_BRACKETS:
+                end = tokens.match_of(self.pos)
+                if end is not None:
+                    self.pos = end + 1
+                    if kind == ParserTokenType.LBRACE:
+                        return
+                    continue
+            self.pos += 1
 
     def parse(self):
-        declarations = []
-        while not self.is_at_end():
-            declarations.append(self.parse_declaration())
-        return declarations
+        return list(self.iter_declarations())
+
+    def iter_declarations(self):
+        """Yield the top-level declarations one at a time, as they are parsed."""
+        try:
+            while not self.is_at_end():
+                start = self.pos
+                try:
+                    declaration = self.parse_declaration()
+                except SyntaxError as error:
+                    self.recover(error, start)
+                    continue
+                yield declaration
+        except StopParsing:
+            pass
 
     def parse_declaration(self):
+        start = self.pos
         # Parse modifiers first
         modifiers = self.parse_modifiers()
         
         if self.match(ParserTokenType.CLASS):
-            return self.parse_class(modifiers)
+            node = self.parse_class(modifiers)
         elif self.match(ParserTokenType.INTERFACE):
-            return self.parse_interface(modifiers)
+            node = self.parse_interface(modifiers)
         elif self.match(ParserTokenType.FUNCTION):
-            return self.parse_function(modifiers)
+            node = self.parse_function(modifiers)
         elif self.match(ParserTokenType.LET):
-            return self.parse_variable(modifiers)
+            node = self.parse_variable(modifiers)
         elif self.match(ParserTokenType.IMPORT):
-            return self.parse_import()
+            node = self.parse_import()
         elif self.match(ParserTokenType.FROM):
-            return self.parse_from_import()
+            node = self.parse_from_import()
         elif self.match(ParserTokenType.NAMESPACE):
-            return self.parse_namespace()
-        elif modifiers and self.peek().type == ParserTokenType.IDENTIFIER:
+            node = self.parse_namespace()
+        elif modifiers and self.peek_type() == ParserTokenType.IDENTIFIER:
             # This might be a constructor: public ClassName(...)
-            return self.parse_constructor(modifiers)
+            node = self.parse_constructor(modifiers)
         else:
             # If we have modifiers but no declaration keyword, it's an error
             if modifiers:
-                raise SyntaxError(f"Expected declaration after modifiers, got {self.peek().type}")
+                raise SyntaxError(f"Expected declaration after modifiers, got {self.peek_type()}")
             return self.parse_statement()
+        node.start = start
+        node.end = self.pos
+        return node
 
     def parse_constructor(self, modifiers):
         """Parse constructor declarations: public ClassName(...) [: super(...)] { ... }"""
@@ -91,18 +287,17 @@ class Parser:
                     self.consume(ParserTokenType.COMMA, "Expected ',' or ')' in super arguments")
             super_call = {"args": super_args}
         
-        body = self.parse_block()
-        return {"type": "constructor", "name": name.value, "params": params, "modifiers": modifiers, "super": super_call, "body": body}
+        body = self.parse_body()
+        return ConstructorNode(name.value, params, modifiers, super_call, body)
 
     def parse_modifiers(self):
         """Parse access modifiers and other modifiers"""
         modifiers = []
-        while self.peek().type in [ParserTokenType.PUBLIC, ParserTokenType.PRIVATE, ParserTokenType.PROTECTED, 
+        while self.peek_type() in [ParserTokenType.PUBLIC, ParserTokenType.PRIVATE, ParserTokenType.PROTECTED, 
                                    ParserTokenType.STATIC, ParserTokenType.ABSTRACT, ParserTokenType.FINAL, 
                                    ParserTokenType.OVERRIDE]:
-            modifier = self.tokens[self.pos]
+            modifiers.append(self.tokens.value_at(self.pos))
             self.pos += 1
-            modifiers.append(modifier.value)
         return modifiers
 
     def parse_class(self, modifiers=None):
@@ -127,8 +322,12 @@ class Parser:
         self.consume(ParserTokenType.LBRACE, "Expected '{' after class name")
         members = []
         while not self.match(ParserTokenType.RBRACE):
-            members.append(self.parse_declaration())
-        return {"type": "class", "name": name.value, "base": base_classes, "modifiers": modifiers, "members": members}
+            start = self.pos
+            try:
+                members.append(self.parse_declaration())
+            except SyntaxError as error:
+                self.recover(error, start)
+        return ClassNode(name.value, base_classes, modifiers, members)
 
     def parse_interface(self, modifiers=None):
         """Parse interface declarations: [modifiers] interface Name { ... }"""
@@ -146,9 +345,13 @@ class Parser:
         self.consume(ParserTokenType.LBRACE, "Expected '{' after interface name")
         members = []
         while not self.match(ParserTokenType.RBRACE):
-            members.append(self.parse_interface_member())
+            start = self.pos
+            try:
+                members.append(self.parse_interface_member())
+            except SyntaxError as error:
+                self.recover(error, start)
         
-        return {"type": "interface", "name": name.value, "base": base_interfaces, "modifiers": modifiers, "members": members}
+        return InterfaceNode(name.value, base_interfaces, modifiers, members)
 
     def parse_interface_member(self):
         """Parse interface member (function signatures only)"""
@@ -175,7 +378,7 @@ class Parser:
                 return_type = self.parse_type_annotation()
             
             self.consume(ParserTokenType.SEMICOLON, "Expected ';' after interface function signature")
-            return {"type": "interface_function", "name": name.value, "params": params, "return_type": return_type}
+            return InterfaceFunctionNode(name.value, params, return_type)
         else:
             raise SyntaxError("Interface can only contain function signatures")
 
@@ -209,15 +412,15 @@ class Parser:
         # Handle abstract functions (no body)
         if "abstract" in modifiers:
             self.consume(ParserTokenType.SEMICOLON, "Expected ';' after abstract function")
-            return {"type": "function", "name": name.value, "params": params, "return_type": return_type, "modifiers": modifiers, "body": None}
+            return FunctionNode(name.value, params, return_type, modifiers, None)
         else:
-            body = self.parse_block()
-            return {"type": "function", "name": name.value, "params": params, "return_type": return_type, "modifiers": modifiers, "body": body}
+            body = self.parse_body()
+            return FunctionNode(name.value, params, return_type, modifiers, body)
 
     def parse_type_annotation(self):
         """Parse type annotations, which can be keywords like 'int' or identifiers, optionally followed by '*' for pointers"""
         base_type = None
-        token_type = self.peek().type
+        token_type = self.peek_type()
         if token_type == ParserTokenType.IDENTIFIER:
             base_type = self.consume(ParserTokenType.IDENTIFIER, "Expected type").value
             # Handle qualified type names like Examples.Shape
@@ -243,11 +446,11 @@ class Parser:
         elif token_type == ParserTokenType.FUNCTION:
             base_type = self.consume(ParserTokenType.FUNCTION, "Expected type").value
         else:
-            raise SyntaxError(f"Expected type annotation, got {self.peek().type}")
+            raise SyntaxError(f"Expected type annotation, got {self.peek_type()}")
         
         # Check for pointer modifier (e.g., int*)
         if self.match(ParserTokenType.STAR):
-            return {"type": "pointer", "base_type": base_type}
+            return PointerNode(base_type)
         else:
             return base_type
 
@@ -267,7 +470,7 @@ class Parser:
             initializer = self.parse_expression()
         
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after variable")
-        return {"type": "var_decl", "name": name.value, "var_type": var_type, "init": initializer, "modifiers": modifiers}
+        return VarDeclNode(name.value, var_type, initializer, modifiers)
 
     def parse_import(self):
         """Parse import statements: import module.path [as alias]"""
@@ -282,7 +485,7 @@ class Parser:
             alias = self.consume(ParserTokenType.IDENTIFIER, "Expected alias name").value
         
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after import statement")
-        return {"type": "import", "module": ".".join(module_path), "alias": alias}
+        return ImportNode(".".join(module_path), alias)
 
     def parse_from_import(self):
         """Parse from import statements: from module.path import item1, item2 [as alias]"""
@@ -304,7 +507,7 @@ class Parser:
             imports.append(self.consume(ParserTokenType.IDENTIFIER, "Expected import item").value)
         
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after from import statement")
-        return {"type": "from_import", "module": ".".join(module_path), "imports": imports}
+        return FromImportNode(".".join(module_path), imports)
 
     def parse_namespace(self):
         """Parse namespace declarations: namespace Name { ... }"""
@@ -313,55 +516,77 @@ class Parser:
         
         statements = []
         while not self.match(ParserTokenType.RBRACE):
-            statements.append(self.parse_declaration())
+            start = self.pos
+            try:
+                statements.append(self.parse_declaration())
+            except SyntaxError as error:
+                self.recover(error, start)
         
-        return {"type": "namespace", "name": name.value, "body": statements}
+        return NamespaceNode(name.value, statements)
+
+    def parse_body(self):
+        """Parse a function or constructor body, deferring it to a LazyBody in lazy_bodies mode."""
+        if self.lazy_bodies and self.peek_type() == ParserTokenType.LBRACE:
+            end = self.tokens.match_of(self.pos)
+            if end is not None:
+                body = LazyBody(self.tokens, self.pos, end, self.error_handler, self.file_path)
+                self.pos = end + 1
+                return body
+        return self.parse_block()
 
     def parse_block(self):
         self.consume(ParserTokenType.LBRACE, "Expected '{'")
         statements = []
         while not self.match(ParserTokenType.RBRACE):
-            statements.append(self.parse_statement())
+            start = self.pos
+            try:
+                statements.append(self.parse_statement())
+            except SyntaxError as error:
+                self.recover(error, start)
         return statements
 
     def parse_statement(self):
+        start = self.pos
         if self.match(ParserTokenType.LET):
-            return self.parse_variable_declaration()
+            node = self.parse_variable_declaration()
         elif self.match(ParserTokenType.IF):
-            return self.parse_if()
+            node = self.parse_if()
         elif self.match(ParserTokenType.WHILE):
-            return self.parse_while()
+            node = self.parse_while()
         elif self.match(ParserTokenType.DO):
-            return self.parse_do_while()
+            node = self.parse_do_while()
         elif self.match(ParserTokenType.FOR):
-            return self.parse_for()
+            node = self.parse_for()
         elif self.match(ParserTokenType.SWITCH):
-            return self.parse_switch()
+            node = self.parse_switch()
         elif self.match(ParserTokenType.MATCH):
-            return self.parse_match()
+            node = self.parse_match()
         elif self.match(ParserTokenType.TRY):
-            return self.parse_try()
+            node = self.parse_try()
         elif self.match(ParserTokenType.THROW):
-            return self.parse_throw()
+            node = self.parse_throw()
         elif self.match(ParserTokenType.RETURN):
-            return self.parse_return()
+            node = self.parse_return()
         elif self.match(ParserTokenType.BREAK):
-            return self.parse_break()
+            node = self.parse_break()
         elif self.match(ParserTokenType.CONTINUE):
-            return self.parse_continue()
+            node = self.parse_continue()
         elif self.match(ParserTokenType.LBRACE):
             self.pos -= 1
-            return {"type": "block", "body": self.parse_block()}
+            node = BlockNode(self.parse_block())
         else:
             # Check for assignment statement: identifier = expression
-            if (self.peek().type == ParserTokenType.IDENTIFIER and 
-                self.pos + 1 < len(self.tokens) and 
-                self.tokens[self.pos + 1].type == ParserTokenType.EQ):
-                return self.parse_assignment()
+            if (self.peek_type() == ParserTokenType.IDENTIFIER and 
+                self.tokens.has(self.pos + 1) and 
+                self.peek_type(1) == ParserTokenType.EQ):
+                node = self.parse_assignment()
             else:
                 expr = self.parse_expression()
                 self.consume(ParserTokenType.SEMICOLON, "Expected ';'")
-                return {"type": "expr_stmt", "expr": expr}
+                node = ExprStmtNode(expr)
+        node.start = start
+        node.end = self.pos
+        return node
 
     def parse_assignment(self):
         """Parse assignment statements: identifier = expression"""
@@ -369,16 +594,16 @@ class Parser:
         self.consume(ParserTokenType.EQ, "Expected '='")
         value = self.parse_expression()
         self.consume(ParserTokenType.SEMICOLON, "Expected ';'")
-        return {"type": "assignment", "name": name.value, "value": value}
+        return AssignmentNode(name.value, value)
 
     def parse_variable_declaration(self):
         """Parse variable declarations: let name [: type] [= value]"""
         # Allow type keywords as variable names
-        if self.peek().type in [ParserTokenType.IDENTIFIER, ParserTokenType.INT, ParserTokenType.FLOAT, 
+        if self.peek_type() in [ParserTokenType.IDENTIFIER, ParserTokenType.INT, ParserTokenType.FLOAT, 
                                 ParserTokenType.DOUBLE, ParserTokenType.BOOL, ParserTokenType.VOID, 
                                 ParserTokenType.ANY, ParserTokenType.PTR, ParserTokenType.STRING, 
                                 ParserTokenType.FUNCTION]:
-            name = self.tokens[self.pos]
+            name = self.peek()
             self.pos += 1
         else:
             name = self.consume(ParserTokenType.IDENTIFIER, "Expected variable name")
@@ -398,7 +623,7 @@ class Parser:
         
         self.consume(ParserTokenType.SEMICOLON, "Expected ';'")
         
-        return {"type": "variable_declaration", "name": name.value, "var_type": var_type, "value": value}
+        return VariableDeclarationNode(name.value, var_type, value)
 
     def parse_if(self):
         self.consume(ParserTokenType.LPAREN, "Expected '(' after 'if'")
@@ -406,14 +631,14 @@ class Parser:
         self.consume(ParserTokenType.RPAREN, "Expected ')'")
         then_branch = self.parse_statement()
         else_branch = self.parse_statement() if self.match(ParserTokenType.ELSE) else None
-        return {"type": "if", "cond": condition, "then": then_branch, "else": else_branch}
+        return IfNode(condition, then_branch, else_branch)
 
     def parse_while(self):
         self.consume(ParserTokenType.LPAREN, "Expected '(' after 'while'")
         condition = self.parse_expression()
         self.consume(ParserTokenType.RPAREN, "Expected ')'")
         body = self.parse_statement()
-        return {"type": "while", "cond": condition, "body": body}
+        return WhileNode(condition, body)
 
     def parse_do_while(self):
         """Parse do-while statements: do { body } while (condition);"""
@@ -423,14 +648,14 @@ class Parser:
         condition = self.parse_expression()
         self.consume(ParserTokenType.RPAREN, "Expected ')'")
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after do-while statement")
-        return {"type": "do_while", "body": body, "cond": condition}
+        return DoWhileNode(body, condition)
 
     def parse_return(self):
         value = None
-        if not self.peek().type == ParserTokenType.SEMICOLON:
+        if not self.peek_type() == ParserTokenType.SEMICOLON:
             value = self.parse_expression()
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after return statement")
-        return {"type": "return", "value": value}
+        return ReturnNode(value)
 
     def parse_for(self):
         """Parse for statements: for (init; condition; update) body"""
@@ -438,7 +663,8 @@ class Parser:
         
         # For loop initialization
         init = None
-        if not self.peek().type == ParserTokenType.SEMICOLON:
+        if not self.peek_type() == ParserTokenType.SEMICOLON:
+            init_start = self.pos
             if self.match(ParserTokenType.LET):
                 # Parse variable declaration without consuming semicolon here
                 name = self.consume(ParserTokenType.IDENTIFIER, "Expected variable name")
@@ -453,25 +679,25 @@ class Parser:
                 if self.match(ParserTokenType.EQ):
                     initializer = self.parse_expression()
                 
-                init = {"type": "var_decl", "name": name.value, "var_type": var_type, "init": initializer}
+                init = VarDeclNode(name.value, var_type, initializer, start=init_start, end=self.pos)
             else:
                 init = self.parse_expression()
         self.consume(ParserTokenType.SEMICOLON, "Expected ';'")
         
         # For loop condition
         condition = None
-        if not self.peek().type == ParserTokenType.SEMICOLON:
+        if not self.peek_type() == ParserTokenType.SEMICOLON:
             condition = self.parse_expression()
         self.consume(ParserTokenType.SEMICOLON, "Expected ';'")
         
         # For loop update
         update = None
-        if not self.peek().type == ParserTokenType.RPAREN:
+        if not self.peek_type() == ParserTokenType.RPAREN:
             update = self.parse_expression()
         self.consume(ParserTokenType.RPAREN, "Expected ')'")
         
         body = self.parse_statement()
-        return {"type": "for", "init": init, "condition": condition, "update": update, "body": body}
+        return ForNode(init, condition, update, body)
 
     def parse_switch(self):
         """Parse switch statements: switch (expression) { case value: ... default: ... }"""
@@ -488,19 +714,19 @@ class Parser:
                 value = self.parse_expression()
                 self.consume(ParserTokenType.COLON, "Expected ':' after case value")
                 statements = []
-                while (not self.peek().type in [ParserTokenType.CASE, ParserTokenType.DEFAULT, ParserTokenType.RBRACE]):
+                while (not self.peek_type() in [ParserTokenType.CASE, ParserTokenType.DEFAULT, ParserTokenType.RBRACE]):
                     statements.append(self.parse_statement())
                 cases.append({"value": value, "statements": statements})
             elif self.match(ParserTokenType.DEFAULT):
                 self.consume(ParserTokenType.COLON, "Expected ':' after 'default'")
                 statements = []
-                while (not self.peek().type in [ParserTokenType.CASE, ParserTokenType.DEFAULT, ParserTokenType.RBRACE]):
+                while (not self.peek_type() in [ParserTokenType.CASE, ParserTokenType.DEFAULT, ParserTokenType.RBRACE]):
                     statements.append(self.parse_statement())
                 default_case = statements
             else:
                 break
         
-        return {"type": "switch", "expr": expr, "cases": cases, "default": default_case}
+        return SwitchNode(expr, cases, default_case)
 
     def parse_match(self):
         """Parse match statements: match expression { pattern => action; ... else => default; }"""
@@ -523,7 +749,7 @@ class Parser:
                 action = self.parse_statement()  # Allow statements, not just expressions
                 cases.append({"pattern": pattern, "action": action})
         
-        return {"type": "match", "expr": expr, "cases": cases, "default": default_case}
+        return MatchNode(expr, cases, default_case)
 
     def parse_try(self):
         """Parse try-catch-finally statements"""
@@ -556,175 +782,132 @@ class Parser:
         if self.match(ParserTokenType.FINALLY):
             finally_block = self.parse_block()
         
-        return {"type": "try", "try_block": try_block, "catch_blocks": catch_blocks, "finally_block": finally_block}
+        return TryNode(try_block, catch_blocks, finally_block)
 
     def parse_throw(self):
         """Parse throw statements: throw expression;"""
         expr = self.parse_expression()
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after throw statement")
-        return {"type": "throw", "expr": expr}
+        return ThrowNode(expr)
 
     def parse_break(self):
         """Parse break statements"""
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after 'break'")
-        return {"type": "break"}
+        return BreakNode()
 
     def parse_continue(self):
         """Parse continue statements"""
         self.consume(ParserTokenType.SEMICOLON, "Expected ';' after 'continue'")
-        return {"type": "continue"}
+        return ContinueNode()
 
     def parse_expression(self):
         return self.parse_assignment_expr()
 
     def parse_assignment_expr(self):
         """Parse assignment expressions: identifier = expression or object.member = expression or *ptr = expression"""
-        # Check for lambda expressions: (param1, param2) => expression or () => expression
-        if self.peek().type == ParserTokenType.LPAREN:
-            # Look ahead to see if this is a lambda
-            saved_pos = self.pos
-            is_lambda = False
-            params = []
-            
-            try:
-                self.pos += 1  # consume (
-                
-                # Try to parse parameter list
-                if self.peek().type == ParserTokenType.RPAREN:
-                    # Empty parameter list - check for arrow
-                    self.pos += 1  # consume )
-                    if self.peek().type == ParserTokenType.ARROW:
-                        is_lambda = True
-                        params = []
-                else:
-                    # Try to parse parameter names
-                    while True:
-                        if self.peek().type != ParserTokenType.IDENTIFIER:
-                            break  # Not a lambda
-                        params.append(self.consume(ParserTokenType.IDENTIFIER, "Expected parameter name").value)
-                        
-                        if self.peek().type == ParserTokenType.RPAREN:
-                            self.pos += 1  # consume )
-                            if self.peek().type == ParserTokenType.ARROW:
-                                is_lambda = True
-                            break
-                        elif self.peek().type == ParserTokenType.COMMA:
-                            self.pos += 1  # consume ,
-                        else:
-                            break  # Not a lambda
-                
-                if is_lambda:
-                    # Parse lambda
-                    self.consume(ParserTokenType.ARROW, "Expected '=>'")
-                    
-                    # Check if lambda body is a block or expression
-                    if self.peek().type == ParserTokenType.LBRACE:
-                        body = self.parse_block()
-                    else:
-                        body = self.parse_assignment_expr()
-                    
-                    return {"type": "lambda", "params": params, "body": body}
-                else:
-                    # Not a lambda, restore position
-                    self.pos = saved_pos
-            except:
-                # Error during lookahead, restore position
-                self.pos = saved_pos
-        
-        expr = self.parse_logical_or()
+        if self.peek_type() == ParserTokenType.LPAREN and not (
+                self.peek_type(1) == ParserTokenType.IDENTIFIER and self.peek_type(2) == ParserTokenType.COLON):
+            # An untyped '(a, b) => ...' or '() => ...' lambda spans the whole assignment
+            # expression; anything else in parentheses is the first operand of one
+            start = self.pos
+            self.pos += 1
+            expr, is_lambda = self.parse_parenthesized_or_lambda()
+            if is_lambda:
+                expr.start = start
+                expr.end = self.pos
+                return expr
+            expr = self.parse_binary(0, expr)
+        else:
+            expr = self.parse_binary()
         
         if self.match(ParserTokenType.EQ):
             # This is an assignment
-            if expr.get("type") not in ["identifier", "member", "unary"]:
+            if expr.kind not in ASSIGNMENT_TARGETS:
                 raise SyntaxError("Invalid assignment target")
             value = self.parse_assignment_expr()
-            if expr.get("type") == "identifier":
-                return {"type": "assignment", "name": expr["value"], "value": value}
+            if expr.kind == IdentifierNode.kind:
+                return AssignmentNode(expr.value, value, expr.start, self.pos)
             else:  # member access
-                return {"type": "member_assignment", "target": expr, "value": value}
+                return MemberAssignmentNode(expr, value, expr.start, self.pos)
         
         return expr
 
-    def parse_logical_or(self):
-        expr = self.parse_logical_and()
-        while self.match(ParserTokenType.PIPEPIPE):
-            operator = self.tokens[self.pos - 1]
-            right = self.parse_logical_and()
-            expr = {"type": "binary", "op": operator.value, "left": expr, "right": right}
-        return expr
+    def parse_parenthesized_or_lambda(self):
+        """Parse what follows a '(' at the start of an expression in one forward pass.
 
-    def parse_logical_and(self):
-        expr = self.parse_equality()
-        while self.match(ParserTokenType.AMPAMP):
-            operator = self.tokens[self.pos - 1]
-            right = self.parse_equality()
-            expr = {"type": "binary", "op": operator.value, "left": expr, "right": right}
-        return expr
-
-    def parse_equality(self):
-        expr = self.parse_comparison()
-        while self.match(ParserTokenType.EQEQ, ParserTokenType.BANGEQ):
-            operator = self.tokens[self.pos - 1]
-            right = self.parse_comparison()
-            expr = {"type": "binary", "op": operator.value, "left": expr, "right": right}
-        return expr
-
-    def parse_comparison(self):
-        expr = self.parse_cast()
-        while self.match(ParserTokenType.GT, ParserTokenType.GTEQ, ParserTokenType.LT, ParserTokenType.LTEQ, ParserTokenType.INSTANCEOF):
-            operator = self.tokens[self.pos - 1]
-            right = self.parse_cast()
-            expr = {"type": "binary", "op": operator.value, "left": expr, "right": right}
-        return expr
-
-    def parse_cast(self):
-        expr = self.parse_term()
-        while self.match(ParserTokenType.AS):
-            operator = self.tokens[self.pos - 1]
-            # Parse qualified type names like "Examples.Shape"
-            type_name = self.consume(ParserTokenType.IDENTIFIER, "Expected type name after 'as'").value
-            while self.match(ParserTokenType.DOT):
-                part = self.consume(ParserTokenType.IDENTIFIER, "Expected identifier after '.'").value
-                type_name += "." + part
-            expr = {"type": "cast", "expr": expr, "target_type": type_name}
-        return expr
+        The contents are parsed as a list of expressions; if ') =>' follows they
+        are reinterpreted as the parameter names of a lambda, otherwise the
+        single expression is the parenthesized operand. Returns the node and
+        whether it is such a lambda.
+        """
+        if self.peek_type() == ParserTokenType.RPAREN:
+            return self.parse_lambda(), True  # () => ...
+        items = [self.parse_expression()]
+        while self.match(ParserTokenType.COMMA):
+            items.append(self.parse_expression())
+        self.consume(ParserTokenType.RPAREN, "Expected ')'")
+        if self.match(ParserTokenType.ARROW):
+            return self.parse_untyped_lambda(items), True
+        if len(items) > 1:
+            raise SyntaxError("Expected '=>' after parenthesized list")
+        return items[0], False
 
-    def parse_term(self):
-        expr = self.parse_factor()
-        while self.match(ParserTokenType.PLUS, ParserTokenType.MINUS):
-            operator = self.tokens[self.pos - 1]
-            right = self.parse_factor()
-            expr = {"type": "binary", "op": operator.value, "left": expr, "right": right}
-        return expr
+    def parse_binary(self, min_bp=0, expr=None):
+        """Parse binary and cast expressions by precedence climbing over BINARY_OPERATORS.
 
-    def parse_factor(self):
-        expr = self.parse_unary()
-        while self.match(ParserTokenType.STAR, ParserTokenType.SLASH, ParserTokenType.MOD):
-            operator = self.tokens[self.pos - 1]
-            right = self.parse_unary()
-            expr = {"type": "binary", "op": operator.value, "left": expr, "right": right}
+        Operators whose left binding power is above min_bp are folded into the
+        expression; the right operand is parsed with the operator's right
+        binding power, which makes equal-power operators left-associative
+        unless the table says otherwise (as for '**'). An already parsed
+        first operand may be passed in as expr.
+        """
+        if expr is None:
+            expr = self.parse_unary()
+        tokens = self.tokens
+        while tokens.has(self.pos):
+            kind = tokens.kind_at(self.pos)
+            if kind == ParserTokenType.AS:
+                if CAST_BINDING_POWER <= min_bp:
+                    break
+                self.pos += 1
+                # Parse qualified type names like "Examples.Shape"
+                type_name = self.consume(ParserTokenType.IDENTIFIER, "Expected type name after 'as'").value
+                while self.match(ParserTokenType.DOT):
+                    part = self.consume(ParserTokenType.IDENTIFIER, "Expected identifier after '.'").value
+                    type_name += "." + part
+                expr = CastNode(expr, type_name, expr.start, self.pos)
+                continue
+            binding = BINARY_OPERATORS.get(kind)
+            if binding is None or binding[0] <= min_bp:
+                break
+            operator = tokens.value_at(self.pos)
+            self.pos += 1
+            right = self.parse_binary(binding[1])
+            expr = BinaryNode(operator, expr, right, expr.start, self.pos)
         return expr
 
     def parse_unary(self):
         if self.match(ParserTokenType.MINUS, ParserTokenType.BANG, ParserTokenType.STAR, ParserTokenType.AMP):
-            operator = self.tokens[self.pos - 1]
-            right = self.parse_unary()
-            return {"type": "unary", "op": operator.value, "right": right}
+            start = self.pos - 1
+            operator = self.tokens.value_at(start)
+            right = self.parse_binary(UNARY_BINDING_POWER)
+            return UnaryNode(operator, right, start, self.pos)
         return self.parse_primary()
 
     def parse_primary(self):
+        start = self.pos
         if self.match(ParserTokenType.NUMBER):
-            return {"type": "number", "value": self.tokens[self.pos - 1].value}
+            return NumberNode(self.tokens.value_at(start), start, self.pos)
         elif self.match(ParserTokenType.STRING_LITERAL):
-            return {"type": "string", "value": self.tokens[self.pos - 1].value}
+            return StringNode(self.tokens.value_at(start), start, self.pos)
         elif self.match(ParserTokenType.REGEX):
-            return {"type": "regex", "value": self.tokens[self.pos - 1].value}
+            return RegexNode(self.tokens.value_at(start), start, self.pos)
         elif self.match(ParserTokenType.TRUE):
-            return {"type": "boolean", "value": True}
+            return BooleanNode(True, start, self.pos)
         elif self.match(ParserTokenType.FALSE):
-            return {"type": "boolean", "value": False}
+            return BooleanNode(False, start, self.pos)
         elif self.match(ParserTokenType.NULL):
-            return {"type": "null", "value": None}
+            return NullNode(None, start, self.pos)
         elif self.match(ParserTokenType.NEW):
             # Parse new expression: new ClassName(args) or new Namespace.ClassName(args)
             class_name = self.consume(ParserTokenType.IDENTIFIER, "Expected class name after 'new'").value
@@ -734,62 +917,47 @@ class Parser:
                 class_name += "." + part
             self.consume(ParserTokenType.LPAREN, "Expected '(' after class name")
             args = []
-            if not self.peek().type == ParserTokenType.RPAREN:
+            if not self.peek_type() == ParserTokenType.RPAREN:
                 while True:
                     args.append(self.parse_expression())
-                    if self.peek().type == ParserTokenType.RPAREN:
+                    if self.peek_type() == ParserTokenType.RPAREN:
                         break
                     self.consume(ParserTokenType.COMMA, "Expected ',' or ')' in constructor arguments")
             self.consume(ParserTokenType.RPAREN, "Expected ')'")
-            return {"type": "new", "class": class_name, "args": args}
+            return NewNode(class_name, args, start, self.pos)
         elif self.match(ParserTokenType.IDENTIFIER):
-            identifier = self.tokens[self.pos - 1]
-            return self.parse_postfix({"type": "identifier", "value": identifier.value})
-        elif self.peek().type in [ParserTokenType.PTR, ParserTokenType.INT, ParserTokenType.FLOAT, 
+            identifier = self.tokens.value_at(start)
+            return self.parse_postfix(IdentifierNode(identifier, start, self.pos))
+        elif self.peek_type() in [ParserTokenType.PTR, ParserTokenType.INT, ParserTokenType.FLOAT, 
                                   ParserTokenType.BOOL, ParserTokenType.ANY, ParserTokenType.VOID, ParserTokenType.THIS,
                                   ParserTokenType.DOUBLE, ParserTokenType.STRING, ParserTokenType.CHAR]:
             # Handle keywords used as variable names in expression contexts
-            identifier = self.tokens[self.pos]
+            identifier = self.tokens.value_at(start)
             self.pos += 1
-            return self.parse_postfix({"type": "identifier", "value": identifier.value})
+            return self.parse_postfix(IdentifierNode(identifier, start, self.pos))
         elif self.match(ParserTokenType.LPAREN):
-            # Check if this is a lambda expression: (param: type) => expr
-            # We need to look ahead to see if this looks like lambda parameters
-            saved_pos = self.pos
-            is_lambda = False
-            
-            # Try to detect lambda pattern: ( identifier : type ) =>
-            if self.peek().type == ParserTokenType.IDENTIFIER:
-                self.pos += 1  # skip identifier
-                if self.peek().type == ParserTokenType.COLON:
-                    is_lambda = True
-            elif self.peek().type == ParserTokenType.RPAREN:
-                # Empty parameter list: () => expr
-                self.pos += 1  # skip )
-                if self.peek().type == ParserTokenType.ARROW:
-                    is_lambda = True
-            
-            # Restore position
-            self.pos = saved_pos
-            
-            if is_lambda:
-                return self.parse_lambda()
-            else:
-                # Regular parenthesized expression
-                expr = self.parse_expression()
-                self.consume(ParserTokenType.RPAREN, "Expected ')'")
+            # Typed '(name: type, ...) =>' and empty '() =>' lambdas are recognised from
+            # the next one or two tokens; anything else is a parenthesized expression
+            if self.peek_type() == ParserTokenType.RPAREN or (
+                    self.peek_type() == ParserTokenType.IDENTIFIER and self.peek_type(1) == ParserTokenType.COLON):
+                expr = self.parse_lambda()
+                expr.start = start
+                expr.end = self.pos
                 return expr
+            expr = self.parse_expression()
+            self.consume(ParserTokenType.RPAREN, "Expected ')'")
+            return expr
         elif self.match(ParserTokenType.LBRACKET):
             # Parse array literal: [element1, element2, ...]
             elements = []
-            if not self.peek().type == ParserTokenType.RBRACKET:
+            if not self.peek_type() == ParserTokenType.RBRACKET:
                 while True:
                     elements.append(self.parse_expression())
-                    if self.peek().type == ParserTokenType.RBRACKET:
+                    if self.peek_type() == ParserTokenType.RBRACKET:
                         break
                     self.consume(ParserTokenType.COMMA, "Expected ',' or ']' in array literal")
             self.consume(ParserTokenType.RBRACKET, "Expected ']'")
-            return {"type": "array_literal", "elements": elements}
+            return ArrayLiteralNode(elements, start, self.pos)
         raise SyntaxError("Expected expression")
 
     def parse_lambda(self):
@@ -811,12 +979,27 @@ class Parser:
         self.consume(ParserTokenType.ARROW, "Expected '=>' after lambda parameters")
         
         # Parse lambda body - can be expression or block
-        if self.peek().type == ParserTokenType.LBRACE:
+        if self.peek_type() == ParserTokenType.LBRACE:
             body = self.parse_block()
-            return {"type": "lambda", "params": params, "body": body}
+            return LambdaNode(params, body)
         else:
             expr = self.parse_expression()
-            return {"type": "lambda", "params": params, "body": expr}
+            return LambdaNode(params, expr)
+
+    def parse_untyped_lambda(self, params):
+        """Finish a lambda '(a, b) => ...' whose parameter list was parsed as expressions."""
+        names = []
+        for param in params:
+            if param.kind != IdentifierNode.kind:
+                raise SyntaxError("Expected parameter name in lambda parameter list")
+            names.append(param.value)
+        
+        # Check if lambda body is a block or expression
+        if self.peek_type() == ParserTokenType.LBRACE:
+            body = self.parse_block()
+        else:
+            body = self.parse_assignment_expr()
+        return LambdaNode(names, body)
 
     def parse_postfix(self, expr):
         """Handle postfix operations like function calls and member access"""
@@ -824,18 +1007,18 @@ class Parser:
             if self.match(ParserTokenType.LPAREN):
                 # Function call
                 args = []
-                if not self.peek().type == ParserTokenType.RPAREN:
+                if not self.peek_type() == ParserTokenType.RPAREN:
                     while True:
                         args.append(self.parse_expression())
-                        if self.peek().type == ParserTokenType.RPAREN:
+                        if self.peek_type() == ParserTokenType.RPAREN:
                             break
                         self.consume(ParserTokenType.COMMA, "Expected ',' or ')' in argument list")
                 self.consume(ParserTokenType.RPAREN, "Expected ')'")
-                expr = {"type": "call", "callee": expr, "args": args}
+                expr = CallNode(expr, args, expr.start, self.pos)
             elif self.match(ParserTokenType.DOT):
                 # Member access
                 member = self.consume(ParserTokenType.IDENTIFIER, "Expected member name")
-                expr = {"type": "member", "object": expr, "member": member.value}
+                expr = MemberNode(expr, member.value, expr.start, self.pos)
             else:
                 break
         return expr
@@ -1,5 +1,5 @@
 # Using TokenType and NonTerminal enums in the parsing table
-from Tokens import TokenType, Token
+from Tokens import TokenType, Token, TokenStream
 from enum import Enum, auto
 
 class ParserTokenType(Enum):
@@ -121,252 +121,162 @@ class ParserTokenType(Enum):
 
     EOF = "EOF"
 
+# The lexer treats keywords as identifiers; this table gives their parser kinds
+KEYWORDS = {
+    "let": ParserTokenType.LET,
+    "function": ParserTokenType.FUNCTION,
+    "fun": ParserTokenType.FUNCTION,
+    "class": ParserTokenType.CLASS,
+    "interface": ParserTokenType.INTERFACE,
+    "final": ParserTokenType.FINAL,
+    "abstract": ParserTokenType.ABSTRACT,
+    "static": ParserTokenType.STATIC,
+    "override": ParserTokenType.OVERRIDE,
+    "return": ParserTokenType.RETURN,
+    "if": ParserTokenType.IF,
+    "else": ParserTokenType.ELSE,
+    "while": ParserTokenType.WHILE,
+    "do": ParserTokenType.DO,
+    "for": ParserTokenType.FOR,
+    "switch": ParserTokenType.SWITCH,
+    "case": ParserTokenType.CASE,
+    "default": ParserTokenType.DEFAULT,
+    "match": ParserTokenType.MATCH,
+    "try": ParserTokenType.TRY,
+    "catch": ParserTokenType.CATCH,
+    "finally": ParserTokenType.FINALLY,
+    "throw": ParserTokenType.THROW,
+    "new": ParserTokenType.NEW,
+    "delete": ParserTokenType.DELETE,
+    "import": ParserTokenType.IMPORT,
+    "from": ParserTokenType.FROM,
+    "namespace": ParserTokenType.NAMESPACE,
+    "public": ParserTokenType.PUBLIC,
+    "private": ParserTokenType.PRIVATE,
+    "protected": ParserTokenType.PROTECTED,
+    "super": ParserTokenType.SUPER,
+    "gc": ParserTokenType.GC,
+    "true": ParserTokenType.TRUE,
+    "false": ParserTokenType.FALSE,
+    "null": ParserTokenType.NULL,
+    "break": ParserTokenType.BREAK,
+    "continue": ParserTokenType.CONTINUE,
+    "as": ParserTokenType.AS,
+    "is": ParserTokenType.IS,
+    "instanceof": ParserTokenType.INSTANCEOF,
+    "extends": ParserTokenType.EXTENDS,
+    "implements": ParserTokenType.IMPLEMENTS,
+    "this": ParserTokenType.THIS,
+    "int": ParserTokenType.INT,
+    "float": ParserTokenType.FLOAT,
+    "string": ParserTokenType.STRING,
+    "char": ParserTokenType.CHAR,
+    "bool": ParserTokenType.BOOL,
+    "void": ParserTokenType.VOID,
+    "any": ParserTokenType.ANY,
+    "double": ParserTokenType.DOUBLE,
+    "ref": ParserTokenType.REF,
+    "const": ParserTokenType.CONST,
+    "ptr": ParserTokenType.PTR,
+    "typeof": ParserTokenType.TYPEOF,
+    "sizeof": ParserTokenType.SIZEOF,
+    "in": ParserTokenType.IN,
+    "yield": ParserTokenType.YIELD,
+    "await": ParserTokenType.AWAIT,
+    "async": ParserTokenType.ASYNC,
+    "alloc": ParserTokenType.ALLOC,
+    "free": ParserTokenType.FREE,
+}
+
+# Parser kind of every lexer token type; None marks tokens the parser skips
+TOKEN_TYPE_TO_PARSER = {
+    TokenType.INTEGER: ParserTokenType.NUMBER,
+    TokenType.FLOAT: ParserTokenType.NUMBER,
+    TokenType.BINARY: ParserTokenType.NUMBER,
+    TokenType.HEX: ParserTokenType.NUMBER,
+    TokenType.STRING: ParserTokenType.STRING_LITERAL,
+    TokenType.REGEX: ParserTokenType.REGEX,
+    TokenType.ASSIGN: ParserTokenType.EQ,
+    TokenType.ARROW: ParserTokenType.ARROW,
+    TokenType.FUNCTION_ARROW: ParserTokenType.FUNCTION_ARROW,
+    TokenType.EQUAL: ParserTokenType.EQEQ,
+    TokenType.NEQUAL: ParserTokenType.BANGEQ,
+    TokenType.LT: ParserTokenType.LT,
+    TokenType.LTE: ParserTokenType.LTEQ,
+    TokenType.GT: ParserTokenType.GT,
+    TokenType.GTE: ParserTokenType.GTEQ,
+    TokenType.PLUS: ParserTokenType.PLUS,
+    TokenType.MINUS: ParserTokenType.MINUS,
+    TokenType.MUL: ParserTokenType.STAR,
+    TokenType.DIV: ParserTokenType.SLASH,
+    TokenType.MOD: ParserTokenType.MOD,
+    TokenType.BITWISE_AND: ParserTokenType.AMP,
+    TokenType.OR: ParserTokenType.PIPEPIPE,
+    TokenType.AND: ParserTokenType.AMPAMP,
+    TokenType.NOT: ParserTokenType.BANG,
+    TokenType.COLON: ParserTokenType.COLON,
+    TokenType.SEMICOLON: ParserTokenType.SEMICOLON,
+    TokenType.COMMA: ParserTokenType.COMMA,
+    TokenType.LPAREN: ParserTokenType.LPAREN,
+    TokenType.RPAREN: ParserTokenType.RPAREN,
+    TokenType.LBRACE: ParserTokenType.LBRACE,
+    TokenType.RBRACE: ParserTokenType.RBRACE,
+    TokenType.LBRACKET: ParserTokenType.LBRACKET,
+    TokenType.RBRACKET: ParserTokenType.RBRACKET,
+    TokenType.BITWISE_XOR: ParserTokenType.CARET,
+    TokenType.BITWISE_OR: ParserTokenType.PIPE,
+    TokenType.SHIFT_LEFT: ParserTokenType.LTLT,
+    TokenType.SHIFT_RIGHT: ParserTokenType.GTGT,
+    TokenType.EXPONENT: ParserTokenType.STARSTAR,
+    TokenType.DOT: ParserTokenType.DOT,
+    TokenType.NEWLINE: None,
+    TokenType.WHITESPACE: None,
+    TokenType.COMMENT: None,
+    TokenType.MULTILINE_COMMENT_START: None,
+    TokenType.MULTILINE_COMMENT_END: None,
+    TokenType.EOF: ParserTokenType.EOF,
+}
+
+def parser_kind(token_type, value):
+    """
+    Return the ParserTokenType for a lexer token, or None if the parser skips it.
+    """
+    if token_type == TokenType.IDENT:
+        return KEYWORDS.get(value, ParserTokenType.IDENTIFIER)
+    if token_type in TOKEN_TYPE_TO_PARSER:
+        return TOKEN_TYPE_TO_PARSER[token_type]
+    if token_type == TokenType.UNKNOWN:
+        # For unknown tokens, we need to decide what to do
+        # If it's a regex special character, it might need special handling
+        print(f"Warning: Unknown token type {token_type} with value '{value}'")
+    else:
+        # For any unmapped tokens, try to preserve them or map to a default
+        # You may need to add more ParserTokenType enums for complete coverage
+        print(f"Warning: Unmapped token type {token_type} with value '{value}'")
+    return None
+
 def convert_token_types(tokens):
     """
     Convert a TokenType to a ParserTokenType.
+
+    Compatibility shim for callers that lex with TokenType kinds; the lexer
+    can emit parser kinds directly with tokenize(..., parser_kinds=True).
+    A TokenStream is converted into a new TokenStream over the same source
+    offsets; a list of Token objects is converted into a list of Token objects.
     """
-    if not all([isinstance(token_, Token) for token_ in tokens]):
-        raise TypeError("All elements in token_type must be instances of TokenType")
-    
-    def identify_ident_type(token_type):
-        """
-        Identify if the token type is an identifier.
-        """
-        # the lexer also treats keywords as identifiers, so we need to check if the token type is a keyword
-        match(token_type):
-            case "let":
-                return ParserTokenType.LET
-            case "function":
-                return ParserTokenType.FUNCTION
-            case "fun":
-                return ParserTokenType.FUNCTION
-            case "class":
-                return ParserTokenType.CLASS
-            case "interface":
-                return ParserTokenType.INTERFACE
-            case "final":
-                return ParserTokenType.FINAL
-            case "abstract":
-                return ParserTokenType.ABSTRACT
-            case "static":
-                return ParserTokenType.STATIC
-            case "override":
-                return ParserTokenType.OVERRIDE
-            case "return":
-                return ParserTokenType.RETURN
-            case "if":
-                return ParserTokenType.IF
-            case "else":
-                return ParserTokenType.ELSE
-            case "while":
-                return ParserTokenType.WHILE
-            case "do":
-                return ParserTokenType.DO
-            case "for":
-                return ParserTokenType.FOR
-            case "switch":
-                return ParserTokenType.SWITCH
-            case "case":
-                return ParserTokenType.CASE
-            case "default":
-                return ParserTokenType.DEFAULT
-            case "match":
-                return ParserTokenType.MATCH
-            case "try":
-                return ParserTokenType.TRY
-            case "catch":
-                return ParserTokenType.CATCH
-            case "finally":
-                return ParserTokenType.FINALLY
-            case "throw":
-                return ParserTokenType.THROW
-            case "new":
-                return ParserTokenType.NEW
-            case "delete":
-                return ParserTokenType.DELETE
-            case "import":
-                return ParserTokenType.IMPORT
-            case "from":
-                return ParserTokenType.FROM
-            case "namespace":
-                return ParserTokenType.NAMESPACE
-            case "public":
-                return ParserTokenType.PUBLIC
-            case "private":
-                return ParserTokenType.PRIVATE
-            case "protected":
-                return ParserTokenType.PROTECTED
-            case "super":
-                return ParserTokenType.SUPER
-            case "gc":
-                return ParserTokenType.GC
-            case "true":
-                return ParserTokenType.TRUE
-            case "false":
-                return ParserTokenType.FALSE
-            case "null":
-                return ParserTokenType.NULL
-            case "break":
-                return ParserTokenType.BREAK
-            case "continue":
-                return ParserTokenType.CONTINUE
-            case "as":
-                return ParserTokenType.AS
-            case "is":
-                return ParserTokenType.IS
-            case "instanceof":
-                return ParserTokenType.INSTANCEOF
-            case "extends":
-                return ParserTokenType.EXTENDS
-            case "implements":
-                return ParserTokenType.IMPLEMENTS
-            case "this":
-                return ParserTokenType.THIS
-            case "int":
-                return ParserTokenType.INT
-            case "float":
-                return ParserTokenType.FLOAT
-            case "string":
-                return ParserTokenType.STRING
-            case "char":
-                return ParserTokenType.CHAR
-            case "bool":
-                return ParserTokenType.BOOL
-            case "void":
-                return ParserTokenType.VOID
-            case "any":
-                return ParserTokenType.ANY
-            case "double":
-                return ParserTokenType.DOUBLE
-            case "ref":
-                return ParserTokenType.REF
-            case "const":
-                return ParserTokenType.CONST
-            case "ptr":
-                return ParserTokenType.PTR
-            case "typeof":
-                return ParserTokenType.TYPEOF
-            case "sizeof":
-                return ParserTokenType.SIZEOF
-            case "in":
-                return ParserTokenType.IN
-            case "yield":
-                return ParserTokenType.YIELD
-            case "await":
-                return ParserTokenType.AWAIT
-            case "async":
-                return ParserTokenType.ASYNC
-            case "alloc":
-                return ParserTokenType.ALLOC
-            case "free":
-                return ParserTokenType.FREE
-            case _:
-                # if the token type is not a keyword, then it is an identifier
-                return ParserTokenType.IDENTIFIER
+    if isinstance(tokens, TokenStream):
+        toks = TokenStream(tokens.source, ParserTokenType, tokens.line_starts, numeric_kinds=(ParserTokenType.NUMBER,))
+        for index in range(len(tokens)):
+            kind = parser_kind(tokens.kind_at(index), tokens.text_at(index))
+            if kind is not None:
+                toks.append(kind, tokens.starts[index], tokens.ends[index])
+        return toks
 
     toks = []
     for i in tokens:
-        # if the tokentype is an identifier, figure out which identifier it is
-        if i.type == TokenType.IDENT:
-            toks.append(Token(identify_ident_type(i.value), i.value))
-        elif i.type == TokenType.INTEGER or i.type == TokenType.FLOAT or i.type == TokenType.BINARY or i.type == TokenType.HEX:
-            toks.append(Token(ParserTokenType.NUMBER, i.value))
-        elif i.type == TokenType.STRING:
-            toks.append(Token(ParserTokenType.STRING_LITERAL, i.value))
-        elif i.type == TokenType.REGEX:
-            toks.append(Token(ParserTokenType.REGEX, i.value))
-        elif i.type == TokenType.ASSIGN:
-            toks.append(Token(ParserTokenType.EQ, i.value))
-        elif i.type == TokenType.ARROW:
-            toks.append(Token(ParserTokenType.ARROW, i.value))
-        elif i.type == TokenType.FUNCTION_ARROW:
-            toks.append(Token(ParserTokenType.FUNCTION_ARROW, i.value))
-        elif i.type == TokenType.EQUAL:
-            toks.append(Token(ParserTokenType.EQEQ, i.value))
-        elif i.type == TokenType.NEQUAL:
-            toks.append(Token(ParserTokenType.BANGEQ, i.value))
-        elif i.type == TokenType.LT:
-            toks.append(Token(ParserTokenType.LT, i.value))
-        elif i.type == TokenType.LTE:
-            toks.append(Token(ParserTokenType.LTEQ, i.value))
-        elif i.type == TokenType.GT:
-            toks.append(Token(ParserTokenType.GT, i.value))
-        elif i.type == TokenType.GTE:
-            toks.append(Token(ParserTokenType.GTEQ, i.value))
-        elif i.type == TokenType.PLUS:
-            toks.append(Token(ParserTokenType.PLUS, i.value))
-        elif i.type == TokenType.MINUS:
-            toks.append(Token(ParserTokenType.MINUS, i.value))
-        elif i.type == TokenType.MUL:
-            toks.append(Token(ParserTokenType.STAR, i.value))
-        elif i.type == TokenType.DIV:
-            toks.append(Token(ParserTokenType.SLASH, i.value))
-        elif i.type == TokenType.MOD:
-            toks.append(Token(ParserTokenType.MOD, i.value))
-        elif i.type == TokenType.BITWISE_AND:
-            toks.append(Token(ParserTokenType.AMP, i.value))
-        elif i.type == TokenType.OR:
-            toks.append(Token(ParserTokenType.PIPEPIPE, i.value))
-        elif i.type == TokenType.AND:
-            toks.append(Token(ParserTokenType.AMPAMP, i.value))
-        elif i.type == TokenType.NOT:
-            toks.append(Token(ParserTokenType.BANG, i.value))
-        elif i.type == TokenType.COLON:
-            toks.append(Token(ParserTokenType.COLON, i.value))
-        elif i.type == TokenType.SEMICOLON:
-            toks.append(Token(ParserTokenType.SEMICOLON, i.value))
-        elif i.type == TokenType.COMMA:
-            toks.append(Token(ParserTokenType.COMMA, i.value))
-        elif i.type == TokenType.LPAREN:
-            toks.append(Token(ParserTokenType.LPAREN, i.value))
-        elif i.type == TokenType.RPAREN:
-            toks.append(Token(ParserTokenType.RPAREN, i.value))
-        elif i.type == TokenType.LBRACE:
-            toks.append(Token(ParserTokenType.LBRACE, i.value))
-        elif i.type == TokenType.RBRACE:
-            toks.append(Token(ParserTokenType.RBRACE, i.value))
-        elif i.type == TokenType.LBRACKET:
-            toks.append(Token(ParserTokenType.LBRACKET, i.value))
-        elif i.type == TokenType.RBRACKET:
-            toks.append(Token(ParserTokenType.RBRACKET, i.value))
-        elif i.type == TokenType.BITWISE_XOR:
-            toks.append(Token(ParserTokenType.CARET, i.value))
-        elif i.type == TokenType.BITWISE_OR:
-            toks.append(Token(ParserTokenType.PIPE, i.value))
-        elif i.type == TokenType.SHIFT_LEFT:
-            toks.append(Token(ParserTokenType.LTLT, i.value))
-        elif i.type == TokenType.SHIFT_RIGHT:
-            toks.append(Token(ParserTokenType.GTGT, i.value))
-        elif i.type == TokenType.EXPONENT:
-            toks.append(Token(ParserTokenType.STARSTAR, i.value))
-        elif i.type == TokenType.DOT:
-            toks.append(Token(ParserTokenType.DOT, i.value))
-        elif i.type == TokenType.NEWLINE:
-            # Skip newlines in parsing
-            continue
-        elif i.type == TokenType.WHITESPACE:
-            # Skip whitespace in parsing
-            continue
-        elif i.type == TokenType.COMMENT:
-            # Skip comments in parsing
-            continue
-        elif i.type == TokenType.MULTILINE_COMMENT_START:
-            # Skip multiline comment start in parsing
-            continue
-        elif i.type == TokenType.MULTILINE_COMMENT_END:
-            # Skip multiline comment end in parsing
-            continue
-        elif i.type == TokenType.EOF:
-            toks.append(Token(ParserTokenType.EOF, i.value))
-        elif i.type == TokenType.UNKNOWN:
-            # For unknown tokens, we need to decide what to do
-            # If it's a regex special character, it might need special handling
-            print(f"Warning: Unknown token type {i.type} with value '{i.value}'")
-            continue
-        else:
-            # For any unmapped tokens, try to preserve them or map to a default
-            # You may need to add more ParserTokenType enums for complete coverage
-            print(f"Warning: Unmapped token type {i.type} with value '{i.value}'")
-            continue
-    
-    return toks
\ No newline at end of file
+        if not isinstance(i, Token):
+            raise TypeError("All elements in token_type must be instances of TokenType")
+        kind = parser_kind(i.type, i.value)
+        if kind is not None:
+            toks.append(Token(kind, i.value, i.line, i.column))
+    return toks
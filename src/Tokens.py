@@ -1,3 +1,6 @@
+import re
+from array import array
+from bisect import bisect_right
 from enum import Enum
 
 class TokenType(Enum):
@@ -53,9 +56,272 @@ class TokenType(Enum):
     REGEX = "REGEX"
 
 class Token:
-    def __init__(self, type_: TokenType, value=None):
+    __slots__ = ('type', 'value', 'line', 'column')
+
+    def __init__(self, type_: TokenType, value=None, line=None, column=None):
         self.type = type_
         self.value = value
+        self.line = line
+        self.column = column
+
+    def __repr__(self):
+        return f"Token({self.type.name}, {repr(self.value)})"
+
+NUMERIC_TOKEN_TYPES = (TokenType.INTEGER, TokenType.FLOAT, TokenType.BINARY, TokenType.HEX)
+
+def decode_number(text):
+    """Convert the source text of a numeric literal to its value."""
+    if text.startswith('0b'):
+        return int(text, 2)
+    if text.startswith('0x'):
+        return int(text, 16)
+    if '.' in text:
+        return float(text)
+    return int(text)
+
+# Opening bracket kind -> closing bracket kind, by member name so that both
+# TokenType and ParserTokenType streams can use it
+BRACKET_PAIRS = {'LPAREN': 'RPAREN', 'LBRACKET': 'RBRACKET', 'LBRACE': 'RBRACE'}
+
+def bracket_kinds(kind_type):
+    """Map each opening bracket kind of kind_type to its closing kind."""
+    return {kind_type[opening]: kind_type[closing] for opening, closing in BRACKET_PAIRS.items()}
+
+class TokenStream:
+    """
+    Compact, array-backed token sequence.
+
+    Tokens are stored as parallel arrays of kind codes and start/end offsets
+    into the source text. Values are sliced (and numbers converted) on first
+    access and cached in a value table, so no per-token objects are kept.
+    Indexing still yields Token objects for code that wants them.
+    """
+    def __init__(self, source, kind_type=TokenType, line_starts=None, numeric_kinds=NUMERIC_TOKEN_TYPES):
+        self.source = source
+        # Bytes-like sources (e.g. a memory-mapped file) are decoded per token on access
+        self.binary = source is not None and not isinstance(source, str)
+        self.kind_type = kind_type
+        self.kind_table = list(kind_type)
+        self.kind_codes = {kind: code for code, kind in enumerate(self.kind_table)}
+        self.numeric_codes = frozenset(self.kind_codes[kind] for kind in numeric_kinds)
+        self.line_starts = line_starts
+        self.kinds = array('H')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.values = {}
+        self.pairs = None  # Index of each bracket's partner (-1 if none), see pair_brackets()
+
+    @classmethod
+    def from_tokens(cls, tokens, kind_type):
+        """Build a stream from a list of Token objects (values are kept as given)."""
+        stream = cls(None, kind_type, numeric_kinds=())
+        for index, token in enumerate(tokens):
+            stream.append(token.type, 0, 0)
+            stream.values[index] = token.value
+        return stream
+
+    def append(self, kind, start, end):
+        self.kinds.append(self.kind_codes[kind])
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def has(self, index):
+        return index < len(self.kinds)
+
+    def kind_at(self, index):
+        return self.kind_table[self.kinds[index]]
+
+    def text_at(self, index):
+        """Return the raw source text of a token without caching it."""
+        text = self.source[self.starts[index]:self.ends[index]]
+        if self.binary:
+            return text.decode('utf-8')
+        return text
+
+    def value_at(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        value = self.values.get(index)
+        if value is None and index not in self.values:
+            value = self.text_at(index)
+            if self.kinds[index] in self.numeric_codes:
+                value = decode_number(value)
+            self.values[index] = value
+        return value
+
+    def pair_brackets(self):
+        """Build the matching-bracket index for the stream.
+
+        Returns the unbalanced brackets as (token index, message) pairs, in
+        token order: closers with no opener are reported where they stand,
+        openers left unclosed where they were opened.
+        """
+        kinds = self.kinds
+        openers = {self.kind_codes[opening]: self.kind_codes[closing]
+                   for opening, closing in bracket_kinds(self.kind_type).items()}
+        closers = frozenset(openers.values())
+        pairs = array('i', [-1]) * len(kinds)
+        stack = []
+        problems = []
+        # Kind codes fit in a byte, so a regex over the kinds finds the
+        # brackets without visiting every token from Python
+        brackets = re.compile(b'[' + b''.join(re.escape(bytes([code])) for code in (*openers, *closers)) + b']')
+        for match in brackets.finditer(array('B', kinds).tobytes()):
+            index = match.start()
+            code = kinds[index]
+            if code in openers:
+                stack.append(index)
+                continue
+            if stack and openers[kinds[stack[-1]]] == code:
+                opening = stack.pop()
+            else:
+                # Close the nearest opener of the same kind, if any; whatever
+                # was opened after it is left unclosed
+                for depth in range(len(stack) - 1, -1, -1):
+                    if openers[kinds[stack[depth]]] == code:
+                        break
+                else:
+                    problems.append((index, f"Unmatched '{self.value_at(index)}'"))
+                    continue
+                problems.extend((unclosed, f"Unclosed '{self.value_at(unclosed)}'") for unclosed in stack[depth + 1:])
+                opening = stack[depth]
+                del stack[depth:]
+            pairs[opening] = index
+            pairs[index] = opening
+        problems.extend((unclosed, f"Unclosed '{self.value_at(unclosed)}'") for unclosed in stack)
+        self.pairs = pairs
+        problems.sort()
+        return problems
+
+    def match_of(self, index):
+        """Index of the bracket paired with the one at index, or None if it has no partner."""
+        if self.pairs is None:
+            self.pair_brackets()
+        partner = self.pairs[index]
+        return None if partner < 0 else partner
+
+    def location(self, index):
+        """Return the (line, column) of a token, or (None, None) if unknown."""
+        if self.line_starts is None:
+            return None, None
+        offset = self.starts[index]
+        line = bisect_right(self.line_starts, offset)
+        line_start = self.line_starts[line - 1]
+        if self.binary:
+            return line, len(self.source[line_start:offset].decode('utf-8', 'replace')) + 1
+        return line, offset - line_start + 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        line, column = self.location(index)
+        return Token(self.kind_at(index), self.value_at(index), line, column)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
+
+    def __repr__(self):
+        return f"TokenStream({len(self.kinds)} tokens)"
+
+
+class TokenBuffer:
+    """
+    Lazily filled window over an iterator of Token objects.
+
+    Offers the same indexed access as TokenStream (has, kind_at, value_at,
+    indexing) so the parser can consume a token generator directly. Tokens
+    more than `window` positions behind the furthest one requested are
+    dropped, so memory stays bounded however long the input is; the parser
+    only ever looks a short distance back when it backtracks.
+    """
+    def __init__(self, tokens, window=1024):
+        self.tokens = iter(tokens)
+        self.window = window
+        self.buffer = []
+        self.base = 0          # Index of buffer[0] in the whole token sequence
+        self.last = None       # Most recent token read, used as EOF
+        self.exhausted = False
+
+    @property
+    def consumed(self):
+        """Number of tokens pulled from the iterator so far."""
+        return self.base + len(self.buffer)
+
+    def fill(self, index):
+        """Read tokens until `index` is buffered; return False if the input ends first."""
+        buffer = self.buffer
+        while index >= self.base + len(buffer):
+            if self.exhausted:
+                return False
+            token = next(self.tokens, None)
+            if token is None:
+                self.exhausted = True
+                return False
+            buffer.append(token)
+            self.last = token
+        if len(buffer) > 2 * self.window:
+            drop = len(buffer) - self.window
+            del buffer[:drop]
+            self.base += drop
+        return True
+
+    def has(self, index):
+        return index < self.base + len(self.buffer) or self.fill(index)
+
+    def __getitem__(self, index):
+        if index < 0:
+            # Only the last token (used as EOF) can be addressed from the end
+            if index != -1 or not self.exhausted:
+                raise IndexError("TokenBuffer only supports [-1] once the input is exhausted")
+            if self.last is None:
+                raise IndexError("TokenBuffer is empty")
+            return self.last
+        if index < self.base:
+            raise IndexError(f"Token {index} is outside the lookahead window (starts at {self.base})")
+        if not self.has(index):
+            raise IndexError("TokenBuffer index out of range")
+        return self.buffer[index - self.base]
+
+    def kind_at(self, index):
+        return self[index].type
+
+    def value_at(self, index):
+        return self[index].value
+
+    def location(self, index):
+        token = self[index]
+        return token.line, token.column
+
+    def match_of(self, index):
+        """Index of the bracket paired with the one at index, or None if it has no partner.
+
+        Tokens are not indexed ahead of time here, so this scans (and reads)
+        forward to the closer; a closer's opener must still be in the window.
+        """
+        kind = self.kind_at(index)
+        openers = bracket_kinds(type(kind))
+        if kind in openers:
+            step, opening, closing = 1, kind, openers[kind]
+        else:
+            closers = {closing: opening for opening, closing in openers.items()}
+            if kind not in closers:
+                return None
+            step, opening, closing = -1, closers[kind], kind
+        depth = 0
+        while self.has(index) and index >= self.base:
+            current = self.kind_at(index)
+            if current == opening:
+                depth += step
+            elif current == closing:
+                depth -= step
+            if depth == 0:
+                return index
+            index += step
+        return None
 
     def __repr__(self):
-        return f"Token({self.type.name}, {repr(self.value)})"
\ No newline at end of file
+        return f"TokenBuffer({self.consumed} tokens read, window={self.window})"
@@ -0,0 +1,334 @@
+"""
+Flat arena representation of the Dakshin AST
+
+An ASTArena keeps a whole program in a handful of parallel arrays (one
+entry per node, list, record or field value) instead of one Python object
+per node:
+
+    kind          node kind (see ASTToken), or LIST / RECORD / VALUE / ABSENT
+    first_child   index of the first child entry, -1 if none
+    next_sibling  index of the next entry with the same parent, -1 if none
+    token         first token of the node, -1 if unknown
+    value         id of an interned value in arena.values, -1 if none
+
+The children of a node are its fields in order. A node whose fields are
+all scalars (identifiers, literals, imports) has no children; its field
+values are packed into one interned tuple instead. LIST entries keep their
+length in the value column, and RECORD entries (parameters, switch cases)
+the interned tuple of their keys.
+
+ArenaNode and ArenaList are cursors over one entry. They behave like the
+ASTNode objects and lists the parser returns, so the code generator and
+the AST printer walk an arena unchanged, but they are created on demand
+and dropped as soon as the walk moves on.
+"""
+
+from array import array
+
+from ASTToken import ASTNode, ASTSequence, NODE_CLASSES, node_class_of
+
+# Kinds of entries that are not nodes
+LIST = -1
+RECORD = -2
+VALUE = -3
+ABSENT = -4  # Optional field that was not given
+
+MISSING = object()  # Value of an ABSENT field
+
+SCALARS = (str, int, float, bool, type(None))
+
+# Kind -> {attribute name: field position}
+FIELD_POSITIONS = [{slot: i for i, slot in enumerate(cls.slots)} for cls in NODE_CLASSES]
+
+class ASTArena:
+    """A program's AST stored as struct-of-arrays columns."""
+    def __init__(self):
+        self.kind = array('b')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.token = array('i')
+        self.value = array('i')
+        self.values = []
+        self.value_ids = {}
+        self.root = self.add_entry(LIST, -1, 0)
+        self.last_declaration = -1
+
+    @classmethod
+    def from_ast(cls, ast):
+        """Build an arena from a list of declarations, as nodes or in the dict form."""
+        arena = cls()
+        for declaration in ast:
+            arena.append(declaration)
+        return arena
+
+    def __len__(self):
+        return len(self.kind)
+
+    def intern(self, value):
+        """Id of a value in the values table, adding it if it is new."""
+        # Keyed by type too, so that 1, 1.0 and True stay distinct
+        if isinstance(value, tuple):
+            key = tuple((type(item), item) for item in value)
+        else:
+            key = (type(value), value)
+        value_id = self.value_ids.get(key)
+        if value_id is None:
+            value_id = self.value_ids[key] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def add_entry(self, kind, token, value):
+        index = len(self.kind)
+        self.kind.append(kind)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self.token.append(token)
+        self.value.append(value)
+        return index
+
+    def add_children(self, parent, children):
+        previous = -1
+        for child in children:
+            index = self.add(child)
+            if previous < 0:
+                self.first_child[parent] = index
+            else:
+                self.next_sibling[previous] = index
+            previous = index
+
+    def add(self, item):
+        """Add a node, list, record or scalar (with everything below it); return its index."""
+        if isinstance(item, ASTNode):
+            cls, token = type(item), item.start
+            fields = [getattr(item, slot, MISSING) for slot in cls.slots]
+        elif isinstance(item, dict):
+            cls = node_class_of(item)
+            if cls is None:
+                index = self.add_entry(RECORD, -1, self.intern(tuple(item)))
+                self.add_children(index, item.values())
+                return index
+            span = item.get('span')
+            token = span[0] if span else None
+            fields = [item.get(field, MISSING) for field in cls.fields]
+        elif isinstance(item, (list, tuple, ASTSequence)):
+            items = list(item)
+            index = self.add_entry(LIST, -1, len(items))
+            self.add_children(index, items)
+            return index
+        else:
+            return self.add_entry(VALUE, -1, self.intern(item))
+
+        token = -1 if token is None else token
+        if all(isinstance(field, SCALARS) for field in fields):
+            return self.add_entry(cls.kind, token, self.intern(tuple(fields)))
+        index = self.add_entry(cls.kind, token, -1)
+        previous = -1
+        for field in fields:
+            child = self.add_entry(ABSENT, -1, -1) if field is MISSING else self.add(field)
+            if previous < 0:
+                self.first_child[index] = child
+            else:
+                self.next_sibling[previous] = child
+            previous = child
+        return index
+
+    def append(self, declaration):
+        """Add a top-level declaration to the program."""
+        index = self.add(declaration)
+        if self.last_declaration < 0:
+            self.first_child[self.root] = index
+        else:
+            self.next_sibling[self.last_declaration] = index
+        self.last_declaration = index
+        self.value[self.root] += 1
+
+    def children(self, index):
+        """Indices of the child entries of an entry."""
+        child = self.first_child[index]
+        while child >= 0:
+            yield child
+            child = self.next_sibling[child]
+
+    def field(self, index, position):
+        """Value of the field at position of the node at index (MISSING if it was not given)."""
+        value_id = self.value[index]
+        if value_id >= 0:
+            return self.values[value_id][position]
+        child = self.first_child[index]
+        for _ in range(position):
+            child = self.next_sibling[child]
+        return self.view(child)
+
+    def view(self, index):
+        """The entry at index as a cursor, a record dict or a plain value."""
+        kind = self.kind[index]
+        if kind >= 0:
+            return ArenaNode(self, index, kind)
+        if kind == LIST:
+            return ArenaList(self, index)
+        if kind == VALUE:
+            return self.values[self.value[index]]
+        if kind == RECORD:
+            keys = self.values[self.value[index]]
+            return dict(zip(keys, (self.view(child) for child in self.children(index))))
+        return MISSING
+
+    def program(self):
+        """The top-level declarations, as an ArenaList."""
+        return ArenaList(self, self.root)
+
+    def materialize(self, index=None):
+        """Rebuild ordinary AST objects for an entry (the whole program by default)."""
+        if index is None:
+            index = self.root
+        kind = self.kind[index]
+        if kind == LIST:
+            return [self.materialize(child) for child in self.children(index)]
+        if kind == RECORD:
+            keys = self.values[self.value[index]]
+            return dict(zip(keys, (self.materialize(child) for child in self.children(index))))
+        if kind == VALUE:
+            return self.values[self.value[index]]
+        cls = NODE_CLASSES[kind]
+        node = object.__new__(cls)
+        value_id = self.value[index]
+        if value_id >= 0:
+            fields = self.values[value_id]
+        else:
+            fields = [MISSING if self.kind[child] == ABSENT else self.materialize(child)
+                      for child in self.children(index)]
+        for slot, value in zip(cls.slots, fields):
+            if value is not MISSING:
+                setattr(node, slot, value)
+        token = self.token[index]
+        node.start = None if token < 0 else token
+        node.end = None
+        return node
+
+    def nbytes(self):
+        """Bytes used by the columns (not counting the values table)."""
+        return sum(column.itemsize * len(column) for column in
+                   (self.kind, self.first_child, self.next_sibling, self.token, self.value))
+
+class ArenaNode(ASTNode):
+    """Cursor on a node entry of an arena; reads like the ASTNode it stands for."""
+    __slots__ = ('arena', 'index', 'kind')
+
+    def __init__(self, arena, index, kind=None):
+        self.arena = arena
+        self.index = index
+        self.kind = arena.kind[index] if kind is None else kind
+
+    @property
+    def node_class(self):
+        return NODE_CLASSES[self.kind]
+
+    @property
+    def type(self):
+        return NODE_CLASSES[self.kind].type
+
+    @property
+    def fields(self):
+        return self.node_class.fields
+
+    @property
+    def slots(self):
+        return self.node_class.slots
+
+    @property
+    def optional(self):
+        return self.node_class.optional
+
+    @property
+    def _slot_of(self):
+        return self.node_class._slot_of
+
+    @property
+    def start(self):
+        token = self.arena.token[self.index]
+        return None if token < 0 else token
+
+    @property
+    def end(self):
+        return None
+
+    def __getattr__(self, slot):
+        # Called only for names that are not attributes of the cursor itself,
+        # i.e. the node's fields. This is the code generator's hot path.
+        position = FIELD_POSITIONS[self.kind].get(slot)
+        if position is None:
+            raise AttributeError(slot)
+        arena = self.arena
+        value_id = arena.value[self.index]
+        if value_id >= 0:
+            return arena.values[value_id][position]
+        child = arena.first_child[self.index]
+        for _ in range(position):
+            child = arena.next_sibling[child]
+        kind = arena.kind[child]
+        if kind >= 0:
+            return ArenaNode(arena, child, kind)
+        if kind == VALUE:
+            return arena.values[arena.value[child]]
+        if kind == ABSENT:
+            raise AttributeError(slot)
+        return arena.view(child)
+
+    def replace(self, **changes):
+        return self.materialize().replace(**changes)
+
+    def materialize(self):
+        """The node as an ordinary ASTNode (with everything below it)."""
+        return self.arena.materialize(self.index)
+
+    def __eq__(self, other):
+        if isinstance(other, ArenaNode):
+            if other.arena is self.arena and other.index == self.index:
+                return True
+            if other.kind != self.kind:
+                return False
+        elif not isinstance(other, ASTNode) or other.kind != self.kind:
+            return NotImplemented
+        return all(getattr(self, slot, MISSING) == getattr(other, slot, MISSING) for slot in self.slots)
+
+    def __repr__(self):
+        return repr(self.materialize())
+
+class ArenaList(ASTSequence):
+    """Cursor on a list entry of an arena; iterates and indexes like a list."""
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    def __len__(self):
+        return self.arena.value[self.index]
+
+    def __iter__(self):
+        arena = self.arena
+        for child in arena.children(self.index):
+            yield arena.view(child)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("arena list index out of range")
+        child = self.arena.first_child[self.index]
+        for _ in range(index):
+            child = self.arena.next_sibling[child]
+        return self.arena.view(child)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ASTSequence)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ArenaList({len(self)} items, entry {self.index})"
@@ -0,0 +1,322 @@
+"""
+Binary AST format for Dakshin
+
+A compact encoding of the parser's output for the compile cache and for
+tools, much smaller than the JSON dump and quicker to load:
+
+    magic    b'DKAST' and a format version byte
+    flags    1 byte, bit 0 set when node spans are included
+    strings  varint count, varint length (in characters) of each string,
+             varint byte size and the UTF-8 text of all strings joined
+    shapes   varint count, then for each record shape (the keys of a
+             parameter, case or catch dict) a varint key count and the
+             string ids of its keys
+    offsets  varint declaration count and the byte offset of each
+             top-level declaration in the body, so one can be decoded alone
+    body     the declarations, each value as an opcode byte and operands
+
+Opcodes below LIST are node kinds (see ASTToken), followed by the node's
+fields in order and, with spans, its start and end token (plus one, zero
+meaning unknown). Integers and ids are unsigned LEB128 varints, negative
+integers having an opcode of their own. Floats are kept as their repr in
+the string table, so every value round-trips exactly.
+"""
+
+from ASTToken import ASTNode, ASTSequence, NODE_CLASSES, node_class_of, _MISSING
+
+MAGIC = b'DKAST'
+VERSION = 1
+SPANS = 1  # Flag bit
+
+# Opcodes for values that are not nodes; node kinds stay below LIST
+LIST = 0x80
+STRING = 0x81
+INTEGER = 0x82
+RECORD = 0x83
+NONE = 0x84
+FALSE = 0x85
+TRUE = 0x86
+ABSENT = 0x87  # Optional field that was not given
+FLOAT = 0x88
+NEGATIVE = 0x89  # Negative integer, stored as -1 - value
+
+assert len(NODE_CLASSES) < LIST
+
+class ASTFormatError(ValueError):
+    """Raised when data is not a valid binary AST."""
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+class _Encoder:
+    def __init__(self, spans):
+        self.spans = spans
+        self.strings = {}
+        self.shapes = {}
+
+    def string_id(self, text):
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+        return string_id
+
+    def encode(self, out, value):
+        if isinstance(value, ASTNode):
+            cls = NODE_CLASSES[value.kind]
+            out.append(cls.kind)
+            if self.spans:
+                write_varint(out, 0 if value.start is None else value.start + 1)
+                write_varint(out, 0 if value.end is None else value.end + 1)
+            for slot in cls.slots:
+                field = getattr(value, slot, _MISSING)
+                if field is _MISSING:
+                    out.append(ABSENT)
+                else:
+                    self.encode(out, field)
+        elif isinstance(value, str):
+            out.append(STRING)
+            write_varint(out, self.string_id(value))
+        elif value is None:
+            out.append(NONE)
+        elif value is True:
+            out.append(TRUE)
+        elif value is False:
+            out.append(FALSE)
+        elif isinstance(value, int):
+            if value < 0:
+                out.append(NEGATIVE)
+                write_varint(out, -1 - value)
+            else:
+                out.append(INTEGER)
+                write_varint(out, value)
+        elif isinstance(value, float):
+            out.append(FLOAT)
+            write_varint(out, self.string_id(repr(value)))
+        elif isinstance(value, dict):
+            cls = node_class_of(value)
+            if cls is not None:
+                self.encode_node_dict(out, cls, value)
+                return
+            keys = tuple(value)
+            shape = self.shapes.get(keys)
+            if shape is None:
+                shape = self.shapes[keys] = len(self.shapes)
+            out.append(RECORD)
+            write_varint(out, shape)
+            for item in value.values():
+                self.encode(out, item)
+        elif isinstance(value, (list, tuple, ASTSequence)):
+            items = list(value)
+            out.append(LIST)
+            write_varint(out, len(items))
+            for item in items:
+                self.encode(out, item)
+        else:
+            raise TypeError(f"Cannot encode {type(value).__name__} in a binary AST")
+
+    def encode_node_dict(self, out, cls, data):
+        out.append(cls.kind)
+        if self.spans:
+            start, end = data.get('span') or (None, None)
+            write_varint(out, 0 if start is None else start + 1)
+            write_varint(out, 0 if end is None else end + 1)
+        for field in cls.fields:
+            if field in data:
+                self.encode(out, data[field])
+            else:
+                out.append(ABSENT)
+
+def dump_ast(ast, spans=True):
+    """Encode a list of declarations (nodes, the dict form or an arena program) as bytes."""
+    encoder = _Encoder(spans)
+    body = bytearray()
+    offsets = []
+    for declaration in ast:
+        offsets.append(len(body))
+        encoder.encode(body, declaration)
+
+    shapes = [[encoder.string_id(key) for key in keys] for keys in encoder.shapes]
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    out.append(SPANS if spans else 0)
+    strings = list(encoder.strings)
+    write_varint(out, len(strings))
+    for text in strings:
+        write_varint(out, len(text))
+    text = ''.join(strings).encode('utf-8')
+    write_varint(out, len(text))
+    out += text
+    write_varint(out, len(shapes))
+    for key_ids in shapes:
+        write_varint(out, len(key_ids))
+        for key_id in key_ids:
+            write_varint(out, key_id)
+    write_varint(out, len(offsets))
+    for offset in offsets:
+        write_varint(out, offset)
+    out += body
+    return bytes(out)
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def _read_header(data):
+    """Return (spans, strings, shapes, offsets, body start)."""
+    if not data.startswith(MAGIC):
+        raise ASTFormatError("Not a binary Dakshin AST")
+    if data[len(MAGIC)] != VERSION:
+        raise ASTFormatError(f"Unsupported binary AST version {data[len(MAGIC)]}")
+    pos = len(MAGIC) + 2
+    spans = bool(data[len(MAGIC) + 1] & SPANS)
+    count, pos = _read_varint(data, pos)
+    lengths = []
+    for _ in range(count):
+        length, pos = _read_varint(data, pos)
+        lengths.append(length)
+    size, pos = _read_varint(data, pos)
+    if pos + size > len(data):
+        raise IndexError("string table past the end of the data")
+    text = data[pos:pos + size].decode('utf-8')
+    pos += size
+    strings = []
+    start = 0
+    for length in lengths:
+        strings.append(text[start:start + length])
+        start += length
+    count, pos = _read_varint(data, pos)
+    shapes = []
+    for _ in range(count):
+        key_count, pos = _read_varint(data, pos)
+        keys = []
+        for _ in range(key_count):
+            string_id, pos = _read_varint(data, pos)
+            keys.append(strings[string_id])
+        shapes.append(tuple(keys))
+    count, pos = _read_varint(data, pos)
+    offsets = []
+    for _ in range(count):
+        offset, pos = _read_varint(data, pos)
+        offsets.append(offset)
+    return spans, strings, shapes, offsets, pos
+
+_reader_factories = {}
+
+def _reader_factory(spans, as_dict):
+    """Compile the decoder for one (spans, as_dict) combination; see load_ast.
+
+    Each node kind gets its own reader function, generated from its field
+    list, so decoding a node costs one call plus one per field. Readers
+    pull bytes from next_byte and dispatch on each opcode through readers.
+    """
+    factory = _reader_factories.get((spans, as_dict))
+    if factory is not None:
+        return factory
+    lines = ["def factory(next_byte, varint, strings, shapes, classes, bad_opcode):",
+             "    readers = [bad_opcode] * 256"]
+    def operand(name):
+        return [f"        {name} = next_byte()",
+                f"        if {name} >= 0x80: {name} = varint({name})"]
+    for cls in NODE_CLASSES:
+        lines.append(f"    def read_{cls.kind}():")
+        if spans:
+            lines += operand("start") + operand("end")
+            lines.append("        start = start - 1 if start else None")
+            lines.append("        end = end - 1 if end else None")
+        values = [f"readers[next_byte()]()" for _ in cls.fields]
+        if as_dict:
+            items = [f"'type': {cls.type!r}"] + [f"{field!r}: {value}" for field, value in zip(cls.fields, values)]
+            if spans:
+                items.append("'span': [start, end]")
+            lines.append(f"        node = {{{', '.join(items)}}}")
+            for field in cls.optional:
+                lines.append(f"        if node[{field!r}] is _MISSING: del node[{field!r}]")
+            lines.append("        return node")
+        else:
+            arguments = values + (["start", "end"] if spans else [])
+            lines.append(f"        return classes[{cls.kind}]({', '.join(arguments)})")
+        lines.append(f"    readers[{cls.kind}] = read_{cls.kind}")
+    lines += [
+        "    def read_string():",
+        *operand("index"),
+        "        return strings[index]",
+        "    def read_list():",
+        *operand("length"),
+        "        return [readers[next_byte()]() for _ in range(length)]",
+        "    def read_integer():",
+        *operand("value"),
+        "        return value",
+        "    def read_negative():",
+        *operand("value"),
+        "        return -1 - value",
+        "    def read_record():",
+        *operand("index"),
+        "        keys = shapes[index]",
+        "        return dict(zip(keys, [readers[next_byte()]() for _ in keys]))",
+        "    def read_float():",
+        *operand("index"),
+        "        return float(strings[index])",
+        "    readers[STRING] = read_string",
+        "    readers[LIST] = read_list",
+        "    readers[INTEGER] = read_integer",
+        "    readers[NEGATIVE] = read_negative",
+        "    readers[RECORD] = read_record",
+        "    readers[FLOAT] = read_float",
+        "    readers[NONE] = lambda: None",
+        "    readers[TRUE] = lambda: True",
+        "    readers[FALSE] = lambda: False",
+        "    readers[ABSENT] = lambda: _MISSING",
+        "    return lambda: readers[next_byte()]()",
+    ]
+    namespace = dict(globals())
+    exec("\n".join(lines), namespace)
+    factory = _reader_factories[(spans, as_dict)] = namespace['factory']
+    return factory
+
+def load_ast(data, as_dict=False, declaration=None):
+    """Decode bytes from dump_ast into a list of nodes (or of dicts with as_dict=True).
+
+    With declaration=i only the i-th top-level declaration is decoded and
+    returned on its own.
+    """
+    data = bytes(data)
+    try:
+        spans, strings, shapes, offsets, body = _read_header(data)
+    except (IndexError, UnicodeDecodeError) as e:
+        raise ASTFormatError("Truncated or corrupt binary AST header") from e
+    if declaration is not None:
+        body += offsets[declaration]
+    # Bytes are read through an iterator, which is much cheaper than
+    # indexing with a position; almost every opcode and operand is one byte.
+    next_byte = iter(memoryview(data)[body:]).__next__
+
+    def varint(byte):
+        result = byte & 0x7f
+        shift = 7
+        while True:
+            byte = next_byte()
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def bad_opcode():
+        raise ASTFormatError("Bad opcode in binary AST")
+
+    read = _reader_factory(spans, as_dict)(next_byte, varint, strings, shapes, NODE_CLASSES, bad_opcode)
+    try:
+        if declaration is not None:
+            return read()
+        return [read() for _ in offsets]
+    except (StopIteration, IndexError) as e:
+        raise ASTFormatError("Truncated or corrupt binary AST") from e
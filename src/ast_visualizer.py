@@ -4,6 +4,8 @@ Generates a visual tree representation of the parsed AST
 """
 
 import json
+from Parser import LazyBody
+from ASTToken import ASTNode, ASTSequence
 
 def print_ast_tree(node, prefix="", is_last=True, is_root=True):
     """Print AST in a tree format"""
@@ -17,7 +19,7 @@ def print_ast_tree(node, prefix="", is_last=True, is_root=True):
         connector = ""
     
     # Print current node
-    if isinstance(node, dict):
+    if isinstance(node, (dict, ASTNode)):
         node_type = node.get('type', 'unknown')
         node_name = node.get('name', node.get('value', ''))
         
@@ -36,22 +38,26 @@ def print_ast_tree(node, prefix="", is_last=True, is_root=True):
             is_last_child = (i == len(keys) - 1)
             value = node[key]
             
-            if isinstance(value, list) and value:
+            if isinstance(value, LazyBody) and not value.parsed:
+                # Outline mode: show the body's extent without parsing it
+                print(f"{child_prefix}{'└── ' if is_last_child else '├── '}{key}: "
+                      f"[not parsed, tokens {value.start}..{value.end}]")
+            elif isinstance(value, (list, ASTSequence)) and value:
                 print(f"{child_prefix}{'└── ' if is_last_child else '├── '}{key}: [{len(value)} items]")
                 list_prefix = child_prefix + ("    " if is_last_child else "│   ")
                 for j, item in enumerate(value):
                     is_last_item = (j == len(value) - 1)
                     print_ast_tree(item, list_prefix, is_last_item, False)
-            elif isinstance(value, dict):
+            elif isinstance(value, (dict, ASTNode)):
                 print(f"{child_prefix}{'└── ' if is_last_child else '├── '}{key}:")
                 dict_prefix = child_prefix + ("    " if is_last_child else "│   ")
                 print_ast_tree(value, dict_prefix, True, False)
-            elif isinstance(value, list) and not value:
+            elif isinstance(value, (list, ASTSequence)) and not value:
                 print(f"{child_prefix}{'└── ' if is_last_child else '├── '}{key}: []")
             else:
                 print(f"{child_prefix}{'└── ' if is_last_child else '├── '}{key}: {value}")
     
-    elif isinstance(node, list):
+    elif isinstance(node, (list, ASTSequence)):
         for i, item in enumerate(node):
             is_last_item = (i == len(node) - 1)
             print_ast_tree(item, prefix, is_last_item, False)
@@ -0,0 +1,172 @@
+"""
+Parallel multi-file build driver for Dakshin
+Compiles many source files in a pool of worker processes
+"""
+
+import os
+import io
+import sys
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+from Lexer import Lexer
+from Error import ErrorHandler
+from compiler import compile_source, open_cache, open_output
+from runtime import write_runtime
+from optimizer import DEFAULT_LEVEL, parse_level
+
+RUNTIME_FILE = 'dakshin_runtime.asm'  # Written to the output directory with --link-runtime
+
+# Per-process lexer, cache and options, set by init_worker and reused for every file
+_lexer = None
+_cache = None
+_link_runtime = False
+_opt_level = DEFAULT_LEVEL
+
+def init_worker(use_cache=True, link_runtime=False, opt_level=DEFAULT_LEVEL):
+    """Warm up a worker: compile the lexer's regex and open the cache before any file arrives."""
+    global _lexer, _cache, _link_runtime, _opt_level
+    _lexer = Lexer(ErrorHandler())
+    _cache = open_cache() if use_cache else None
+    _link_runtime = link_runtime
+    _opt_level = opt_level
+
+def compile_file(source_file, output_file):
+    """Compile one file in a worker; return (source_file, ok, seconds, log)."""
+    if _lexer is None:
+        init_worker()
+    _lexer.error_handler.clear()
+    log = io.StringIO()
+    start = time.perf_counter()
+    ok = True
+    with contextlib.redirect_stdout(log):
+        try:
+            os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+            with open_output(output_file) as f:
+                compile_source(source_file, _lexer, _cache, log=None, output=f, link_runtime=_link_runtime,
+                               opt_level=_opt_level)
+        except Exception as e:
+            ok = False
+            print(f"Compilation failed: {type(e).__name__}: {e}")
+        if _lexer.error_handler.has_errors():
+            ok = False
+    return source_file, ok, time.perf_counter() - start, log.getvalue()
+
+def collect_sources(paths, out_dir):
+    """Expand files and directories into (source_file, output_file) pairs.
+
+    Files found under a directory keep their relative path inside out_dir;
+    files named directly are written to out_dir by base name. A file
+    named twice with the same output is compiled once.
+    """
+    jobs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith('.dn'):
+                        source_file = os.path.join(root, name)
+                        relative = os.path.relpath(source_file, path)
+                        jobs.append((source_file, os.path.join(out_dir, os.path.splitext(relative)[0] + '.asm')))
+        else:
+            base_name = os.path.splitext(os.path.basename(path))[0]
+            jobs.append((path, os.path.join(out_dir, f"{base_name}.asm")))
+    return list(dict.fromkeys(jobs))
+
+def output_collisions(work):
+    """{output_file: [source_file, ...]} for outputs that more than one source would write."""
+    sources = {}
+    for source_file, output_file in work:
+        sources.setdefault(os.path.normpath(output_file), []).append(source_file)
+    return {output_file: files for output_file, files in sources.items() if len(files) > 1}
+
+def build(paths, jobs=None, out_dir='out', use_cache=True, link_runtime=False, opt_level=DEFAULT_LEVEL):
+    """Compile every source under paths with up to `jobs` processes; return the failure count.
+
+    With link_runtime=True the runtime is written once, as RUNTIME_FILE in
+    out_dir, and the programs declare the routines they call extern.
+    """
+    work = collect_sources(paths, out_dir)
+    if not work:
+        print("No .dn files found")
+        return 0
+    collisions = output_collisions(work)
+    if collisions:
+        for output_file, files in collisions.items():
+            print(f"Output file collision: {output_file} would be written by {', '.join(files)}")
+        print("Build a directory instead to keep relative paths, or build the files separately with -o")
+        return sum(len(files) for files in collisions.values())
+    jobs = jobs or os.cpu_count() or 1
+
+    print(f"Building {len(work)} file(s) with {jobs} job(s)...")
+    start = time.perf_counter()
+    failures = 0
+    if link_runtime:
+        write_runtime(os.path.join(out_dir, RUNTIME_FILE))
+    if jobs == 1:
+        init_worker(use_cache, link_runtime, opt_level)
+        results = (compile_file(source_file, output_file) for source_file, output_file in work)
+        failures = report(results)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(use_cache, link_runtime, opt_level)) as pool:
+            sources, outputs = zip(*work)
+            failures = report(pool.map(compile_file, sources, outputs))
+    total = time.perf_counter() - start
+
+    print(f"\nBuilt {len(work) - failures}/{len(work)} file(s) in {total * 1000:.1f} ms wall time")
+    return failures
+
+def report(results):
+    """Print one line per finished file (plus its log on failure); return the failure count."""
+    failures = 0
+    compile_time = 0.0
+    for source_file, ok, seconds, log in results:
+        compile_time += seconds
+        status = "ok  " if ok else "FAIL"
+        print(f"  {status} {source_file} ({seconds * 1000:.1f} ms)")
+        if not ok:
+            failures += 1
+            for line in log.rstrip().splitlines():
+                print(f"       {line}")
+    print(f"Total compile time across files: {compile_time * 1000:.1f} ms")
+    return failures
+
+def main(argv, default_out_dir='out'):
+    """Entry point for 'dakshin.py build <dir|files...> [-j N] [-o out_dir] [--no-cache] [--link-runtime] [-O0|-O1|-O2]'."""
+    paths = []
+    use_cache = True
+    link_runtime = False
+    opt_level = DEFAULT_LEVEL
+    jobs = None
+    out_dir = default_out_dir
+    args = iter(argv)
+    for arg in args:
+        if arg in ('-j', '--jobs') or arg.startswith('-j'):
+            value = next(args, '') if arg in ('-j', '--jobs') else arg[2:]
+            if not value.isdigit() or int(value) < 1:
+                print(f"Invalid job count: {value!r} (-j N needs a positive integer)")
+                return 2
+            jobs = int(value)
+        elif arg == '-o':
+            out_dir = next(args, out_dir)
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg == '--link-runtime':
+            link_runtime = True
+        elif arg.startswith('-O'):
+            opt_level = parse_level(arg[2:])
+            if opt_level is None:
+                print(f"Unknown optimization level: {arg}")
+                return 2
+        else:
+            paths.append(arg)
+
+    if not paths:
+        print("Usage: python dakshin.py build <dir|files...> [-j N] [-o out_dir] [--no-cache] [--link-runtime] [-O0|-O1|-O2]")
+        return 2
+    return 1 if build(paths, jobs, out_dir, use_cache, link_runtime, opt_level) else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
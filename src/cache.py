@@ -0,0 +1,204 @@
+"""
+Content-addressed compile cache for Dakshin
+Stores the AST and assembly of each compiled source keyed by what produced it
+"""
+
+import os
+import json
+import struct
+import hashlib
+from collections import OrderedDict
+
+from ASTToken import ASTSequence
+from ast_binary import dump_ast, load_ast, MAGIC
+
+COMPILER_VERSION = "0.1.0"
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'DAKSHIN_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'dakshin')
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Entry file: three little-endian sizes, then the JSON-encoded stats, the
+# UTF-8 assembly and the binary AST (see ast_binary)
+ENTRY_SUFFIX = '.dkc'
+ENTRY_HEADER = struct.Struct('<III')
+ENTRY_SUFFIXES = (ENTRY_SUFFIX, '.json')  # .json entries were written by older versions
+
+_fingerprint = None
+
+def compiler_fingerprint():
+    """Hash of the compiler version and its own sources, so edits to the compiler invalidate entries."""
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256(COMPILER_VERSION.encode())
+        src_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(src_dir)):
+            if name.endswith('.py'):
+                with open(os.path.join(src_dir, name), 'rb') as f:
+                    digest.update(name.encode())
+                    digest.update(f.read())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+def cache_key(source_bytes, options=None):
+    """Key for a source text compiled with the given options."""
+    digest = hashlib.sha256(compiler_fingerprint().encode())
+    digest.update(json.dumps(options or {}, sort_keys=True).encode())
+    digest.update(source_bytes)
+    return digest.hexdigest()
+
+def write_text(f, text, chunk_size=1 << 20):
+    """Write a string or the contents of a text file to a binary file as UTF-8; return the byte count."""
+    if isinstance(text, str):
+        return f.write(text.encode('utf-8'))
+    text.seek(0)
+    size = 0
+    while True:
+        chunk = text.read(chunk_size)
+        if not chunk:
+            return size
+        size += f.write(chunk.encode('utf-8'))
+
+class CachedAST(ASTSequence):
+    """The declarations of a cache entry, decoded from the binary format on first use.
+
+    A cache hit only needs the assembly and the stats, so the AST is not
+    decoded unless it is iterated, indexed or measured.
+    """
+    __slots__ = ('data', 'declarations')
+
+    def __init__(self, data):
+        self.data = data
+        self.declarations = None
+
+    def force(self):
+        """Decode the AST if needed and return its list of declarations."""
+        if self.declarations is None:
+            self.declarations = load_ast(self.data)
+            self.data = None
+        return self.declarations
+
+    def __iter__(self):
+        return iter(self.force())
+
+    def __len__(self):
+        return len(self.force())
+
+    def __getitem__(self, index):
+        return self.force()[index]
+
+class CompileCache:
+    """
+    On-disk cache of compilation results, one file per key.
+
+    Each entry holds the AST in the binary format, the generated assembly
+    and a few statistics; the AST is handed out as a CachedAST. Reading an entry refreshes its modification time, and once
+    the directory grows past max_bytes the least recently used entries are
+    removed.
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """Return the cached entry for key, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # Mark as recently used
+            stats_size, assembly_size, ast_size = ENTRY_HEADER.unpack_from(data)
+            pos = ENTRY_HEADER.size
+            stats = json.loads(data[pos:pos + stats_size])
+            pos += stats_size
+            assembly_code = data[pos:pos + assembly_size].decode('utf-8')
+            pos += assembly_size
+            ast_data = data[pos:pos + ast_size]
+            if not ast_data.startswith(MAGIC):
+                return None
+            ast = CachedAST(ast_data)
+        except (OSError, ValueError, struct.error):
+            return None  # ValueError covers bad JSON and UTF-8
+        return {"ast": ast, "assembly": assembly_code, "stats": stats}
+
+    def put(self, key, ast, assembly, **stats):
+        """Store a compilation result and evict old entries if over budget.
+
+        The assembly is a string, or a readable text file it was written to.
+        """
+        stats_data = json.dumps(stats).encode()
+        ast_data = dump_ast(ast)
+        path = self.path_for(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(ENTRY_HEADER.pack(0, 0, 0))  # Sizes are filled in below
+            f.write(stats_data)
+            assembly_size = write_text(f, assembly)
+            f.write(ast_data)
+            f.seek(0)
+            f.write(ENTRY_HEADER.pack(len(stats_data), assembly_size, len(ast_data)))
+        os.replace(temp_path, path)  # Atomic, so concurrent builds never see partial entries
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(ENTRY_SUFFIXES):
+                continue
+            try:
+                info = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue  # Removed by another process
+            entries.append((info.st_mtime, info.st_size, name))
+            total += info.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, name in entries:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Remove every entry."""
+        for name in os.listdir(self.directory):
+            if name.endswith(ENTRY_SUFFIXES):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+class MemoryCache:
+    """In-process LRU cache with the same get/put interface as CompileCache."""
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, ast, assembly, **stats):
+        if not isinstance(assembly, str):
+            assembly.seek(0)
+            assembly = assembly.read()
+        self.entries[key] = {"ast": ast, "assembly": assembly, "stats": stats}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
@@ -3,12 +3,18 @@ Assembly Code Generator for Dakshin Programming Language
 Converts parsed AST into x86-64 assembly code
 """
 
+import io
 import sys
 import os
 
 # Add the parent directory to the Python path to import standard_library
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from ASTToken import *
+from emitter import AssemblyWriter
+from runtime import ROUTINES, runtime_for
+from regalloc import ExpressionAllocator, REGISTER_OPERATORS
+
 try:
     from standard_library import StandardLibrary
 except ImportError:
@@ -27,10 +33,11 @@ except ImportError:
             return function_name in self.builtin_functions
 
 class AssemblyGenerator:
-    def __init__(self):
-        self.output = []
+    def __init__(self, stdlib=None, link_runtime=False, register_allocation=True):
         self.data_section = []
         self.text_section = []
+        self.line_count = 0
+        self.instruction_count = 0
         self.string_literals = {}
         self.string_counter = 0
         self.label_counter = 0
@@ -42,36 +49,93 @@ class AssemblyGenerator:
         self.stack_offset = 0
         self.local_vars = {}
         self.local_var_types = {}  # Track variable types: 'int' or 'string'
-        self.stdlib = StandardLibrary()
+        self.stdlib = stdlib or StandardLibrary()  # Read-only tables, so may be shared between generators
+        self.link_runtime = link_runtime  # Runtime routines come from the runtime module (see runtime.py)
+        self.register_allocation = register_allocation  # Expressions in registers (see regalloc.py), else on the stack
+        self.expressions = ExpressionAllocator(self)
         
         # Standard I/O buffers
         self.input_buffer_size = 4096
         self.file_descriptors = {}
         self.next_fd = 3  # Start after stdin(0), stdout(1), stderr(2)
         
-    def generate(self, ast):
-        """Generate assembly code from AST"""
-        self.output = []
-        self.data_section = []
-        self.text_section = []
-        
-        # Add standard headers
-        self.add_headers()
-        
-        # Process each declaration in the AST
-        for declaration in ast:
-            self.generate_declaration(declaration)
-        
-        # Generate deferred lambda functions
-        self.generate_deferred_lambdas()
-        
-        # Combine sections
-        result = []
-        result.extend(self.data_section)
-        result.append("")
-        result.extend(self.text_section)
+        # Code generators indexed by node kind (see ASTToken)
+        self.declaration_handlers = {
+            ClassNode.kind: self.generate_class,
+            FunctionNode.kind: self.generate_function,
+            NamespaceNode.kind: self.generate_namespace,
+        }
+        self.statement_handlers = {
+            ExprStmtNode.kind: self.generate_expression_statement,
+            ReturnNode.kind: self.generate_return_statement,
+            VariableDeclarationNode.kind: self.generate_variable_declaration,
+            VarDeclNode.kind: self.generate_variable_declaration,
+            AssignmentNode.kind: self.generate_assignment,
+            IfNode.kind: self.generate_if_statement,
+            WhileNode.kind: self.generate_while_statement,
+            ForNode.kind: self.generate_for_statement,
+            SwitchNode.kind: self.generate_switch_statement,
+            TryNode.kind: self.generate_try_statement,
+            BreakNode.kind: self.generate_break_statement,
+            ContinueNode.kind: self.generate_continue_statement,
+            BlockNode.kind: self.generate_block_statement,
+        }
+        self.expression_handlers = {
+            CallNode.kind: self.generate_function_call,
+            AssignmentNode.kind: self.generate_assignment,
+            IdentifierNode.kind: self.generate_identifier,
+            StringNode.kind: self.generate_string_literal,
+            NumberNode.kind: self.generate_number_literal,
+            BinaryNode.kind: self.generate_binary_operation,
+            UnaryNode.kind: self.generate_unary_operation,
+            MemberNode.kind: self.generate_member_access,
+            NewNode.kind: self.generate_new_expression,
+            CastNode.kind: self.generate_cast_expression,
+            LambdaNode.kind: self.generate_lambda_expression,
+        }
         
-        return "\n".join(result)
+    def generate(self, ast):
+        """Generate assembly code from AST (a list of nodes, or the dict form of one)"""
+        output = io.StringIO()
+        self.generate_to(ast, output)
+        return output.getvalue()
+    
+    def generate_to(self, ast, output):
+        """Generate assembly code from AST, writing it to a text stream
+        
+        Sections are spooled while generating (see emitter), so the whole
+        program is never held in memory. Afterwards line_count and
+        instruction_count describe what was written.
+        """
+        if ast and isinstance(ast[0], dict):
+            ast = from_dict(ast)
+        writer = AssemblyWriter(output)
+        self.data_section = writer.data
+        self.text_section = writer.text
+        try:
+            # Add standard headers
+            self.add_headers()
+            
+            # Process each declaration in the AST
+            for declaration in ast:
+                self.generate_declaration(declaration)
+            
+            # Generate deferred lambda functions
+            self.generate_deferred_lambdas()
+            
+            # Externs and runtime routines, now that all calls are known
+            writer.text.flush()
+            self.add_runtime(writer.header, writer.text.calls)
+        except BaseException:
+            writer.data.close()
+            writer.header.close()
+            writer.text.close()
+            raise
+        
+        # Data section, a blank line, the text header, then the text section
+        writer.close()
+        self.line_count = writer.lines
+        self.instruction_count = writer.instructions
     
     def add_headers(self):
         """Add standard assembly headers and sections"""
@@ -110,8 +174,11 @@ class AssemblyGenerator:
             "    error_title db 'Error', 0",
             "    info_title db 'Information', 0"
         ])
-        
-        self.text_section.extend([
+    
+    def add_runtime(self, header, calls):
+        """Add the start of the text section: externs and the runtime routines reachable from calls"""
+        routines, externs = runtime_for(calls, linked=self.link_runtime)
+        header.extend([
             "",
             "section .text",
             "    ; Entry point for Windows C runtime",
@@ -119,576 +186,41 @@ class AssemblyGenerator:
             "    default rel",
             "",
             "    ; External C runtime functions (Windows)",
-            "    extern printf",
-            "    extern scanf", 
-            "    extern sscanf",
-            "    extern fopen",
-            "    extern fclose", 
-            "    extern fread",
-            "    extern fwrite",
-            "    extern fgets",
-            "    extern fputs",
-            "    extern malloc",
-            "    extern free",
-            "    extern strlen",
-            "    extern strcmp",
-            "    extern strcpy",
-            "    extern strcat",
-            "    extern exit",
-            "    extern system",
-            "    extern _sleep",
-            "    extern getenv",
-            "    extern _putenv",
-            "    extern abs",
-            "    extern pow",
-            "    extern sqrt",
-            "    extern sin",
-            "    extern cos",
-            "    extern tan",
-            "    extern log",
-            "    extern exp",
-            "    extern rand",
-            "    extern srand",
-            "    ; GUI Functions (Windows API)",
-            "    extern MessageBoxA",
-            "    extern Beep",
-            "    extern OpenClipboard",
-            "    extern CloseClipboard", 
-            "    extern GetClipboardData",
-            "    extern GlobalLock",
-            "    extern GlobalUnlock",
-            ""
         ])
+        header.extend(f"    extern {name}" for name in externs)
+        header.append("")
+        
+        if self.link_runtime:
+            # Linked against the module built by 'dakshin.py runtime'
+            header.append("    ; Dakshin runtime routines")
+            header.extend(f"    extern {name}" for name in routines)
+            header.append("")
+            return
         
-        # Add standard library function implementations
-        self.add_stdlib_functions()
-    
-    def add_stdlib_functions(self):
-        """Add implementations of standard library functions"""
-        self.text_section.extend([
-            "; === STANDARD I/O FUNCTIONS ===",
-            "",
-            "; print(value) - Print value to stdout",
-            "dakshin_print:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    ; Windows x64 calling convention",
-            "    sub rsp, 32    ; Shadow space (required for Windows x64)",
-            "    ; rcx contains the value to print (Windows convention)",
-            "    mov rdx, rcx   ; Move value to second parameter (Windows convention)",
-            "    mov rcx, fmt_string  ; Format string in first parameter",
-            "    xor rax, rax   ; No vector registers used", 
-            "    call printf",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; print_int(value) - Print integer value to stdout",
-            "dakshin_print_int:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    ; Windows x64 calling convention",
-            "    sub rsp, 32    ; Shadow space (required for Windows x64)",
-            "    ; rcx contains the integer value to print (Windows convention)",
-            "    mov rdx, rcx   ; Move integer to second parameter (Windows convention)",
-            "    mov rcx, fmt_int  ; Integer format string in first parameter",
-            "    xor rax, rax   ; No vector registers used", 
-            "    call printf",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; println(value) - Print value with newline",
-            "dakshin_println:",
-            "    push rbp", 
-            "    mov rbp, rsp",
-            "    ; Windows x64 calling convention",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx contains the value to print",
-            "    mov rdx, rcx   ; Move value to second parameter",
-            "    mov rcx, fmt_string  ; Format string in first parameter",
-            "    xor rax, rax   ; No vector registers used",
-            "    call printf",
-            "    ; Print newline",
-            "    mov rcx, newline   ; Newline string in first parameter",
-            "    xor rax, rax",
-            "    call printf",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; input(prompt) - Read input from stdin",
-            "dakshin_input:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    ; Windows x64 calling convention",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx contains prompt string",
-            "    test rcx, rcx",
-            "    jz skip_prompt",
-            "    ; Print prompt",
-            "    mov rdx, rcx",
-            "    mov rcx, fmt_string",
-            "    xor rax, rax",
-            "    call printf",
-            "skip_prompt:",
-            "    ; Read input",
-            "    mov rcx, input_fmt_string",
-            "    mov rdx, input_buffer",
-            "    xor rax, rax",
-            "    call scanf",
-            "    ; Return buffer address",
-            "    mov rax, input_buffer",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; === FILE I/O FUNCTIONS ===",
-            "",
-            "; open(filename, mode) - Open file",
-            "dakshin_open:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = filename, rdx = mode",
-            "    call fopen",
-            "    ; Return file pointer in rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp", 
-            "    pop rbp",
-            "    ret",
-            "",
-            "; close(file) - Close file",
-            "dakshin_close:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = file pointer",
-            "    call fclose",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; read(file) - Read from file",
-            "dakshin_read:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 48",  # Shadow space + local vars
-            "    ; Save file pointer",
-            "    mov [rbp-8], rcx",
-            "    ; Allocate buffer for reading",
-            "    mov rcx, 4096",
-            "    call malloc",
-            "    mov [rbp-16], rax    ; Store buffer pointer",
-            "    ; Read from file",
-            "    mov rcx, rax        ; buffer",
-            "    mov rdx, 1          ; size of each element",
-            "    mov r8, 4095        ; number of elements",
-            "    mov r9, [rbp-8]     ; file pointer",
-            "    call fread",
-            "    ; Null terminate",
-            "    mov rbx, [rbp-16]",
-            "    mov byte [rbx+rax], 0",
-            "    ; Return buffer",
-            "    mov rax, [rbp-16]",
-            "    add rsp, 48",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; write(file, data) - Write to file",
-            "dakshin_write:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 48    ; Shadow space + local vars",
-            "    ; rcx = file, rdx = data",
-            "    mov [rbp-8], rcx    ; Save file pointer",
-            "    mov [rbp-16], rdx   ; Save data pointer",
-            "    mov rcx, rdx        ; data to get length",
-            "    call strlen",
-            "    mov r8, rax         ; length",
-            "    mov rcx, [rbp-16]   ; data",
-            "    mov rdx, 1          ; size",
-            "    ; r8 already has length",
-            "    mov r9, [rbp-8]     ; file",
-            "    call fwrite",
-            "    add rsp, 48    ; Clean up",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; === STRING FUNCTIONS ===",
-            "",
-            "; strlen(str) - Get string length",
-            "dakshin_strlen:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    ; Windows x64 calling convention",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx contains string pointer",
-            "    call strlen",
-            "    ; Result already in rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; length(str) - Alias for strlen",
-            "dakshin_length:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    ; Windows x64 calling convention",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx contains string pointer",
-            "    call strlen",
-            "    ; Result already in rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "    ret",
-            "",
-            "; strcmp(str1, str2) - Compare strings",
-            "dakshin_strcmp:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = str1, rdx = str2 (Windows calling convention)",
-            "    call strcmp",
-            "    ; Result already in rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; strcpy(dest, src) - Copy string",
-            "dakshin_strcpy:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = dest, rdx = src (Windows calling convention)",
-            "    call strcpy",
-            "    ; Result already in rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; strcat(str1, str2) - Concatenate strings",
-            "dakshin_strcat:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = str1, rdx = str2 (Windows calling convention)",
-            "    call strcat",
-            "    ; Result already in rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; === MATH FUNCTIONS ===",
-            "",
-            "; abs(value) - Absolute value",
-            "dakshin_abs:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx contains value (Windows calling convention)",
-            "    mov rax, rcx",
-            "    test rax, rax",
-            "    jns abs_positive",
-            "    neg rax",
-            "abs_positive:",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp", 
-            "    ret",
-            "",
-            "; min(a, b) - Minimum of two values",
-            "dakshin_min:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = a, rdx = b (Windows calling convention)",
-            "    cmp rcx, rdx",
-            "    jle min_first",
-            "    mov rax, rdx",
-            "    jmp min_end",
-            "min_first:",
-            "    mov rax, rcx",
-            "min_end:",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; max(a, b) - Maximum of two values", 
-            "dakshin_max:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = a, rdx = b (Windows calling convention)",
-            "    cmp rcx, rdx",
-            "    jge max_first",
-            "    mov rax, rdx",
-            "    jmp max_end",
-            "max_first:",
-            "    mov rax, rcx",
-            "max_end:",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; === MEMORY FUNCTIONS ===",
-            "",
-            "; malloc(size) - Allocate memory",
-            "dakshin_malloc:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx contains size (Windows calling convention)",
-            "    call malloc",
-            "    ; Result already in rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; free(ptr) - Free memory",
-            "dakshin_free:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx contains pointer (Windows calling convention)",
-            "    call free",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; === SYSTEM FUNCTIONS ===",
-            "",
-            "; exit(code) - Exit program",
-            "dakshin_exit:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space", 
-            "    ; rcx contains exit code (Windows calling convention)",
-            "    call exit",
-            "    ; Should not return",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; system(command) - Execute system command",
-            "dakshin_system:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    ; Windows calling convention for system()",
-            "    sub rsp, 32    ; Shadow space for Windows x64 calling convention",
-            "    ; rcx contains command string",
-            "    ; rcx already has command - no need to move",
-            "    call system",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    ; Result already in rax",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; time() - Get current time (stub implementation)",
-            "dakshin_time:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    ; Return a fixed timestamp for now to avoid corruption",
-            "    mov rax, 1640995200  ; Fixed timestamp (Jan 1, 2022)",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; === TYPE CONVERSION FUNCTIONS ===",
-            "",
-            "; toint(str) - Convert string to integer",
-            "dakshin_toint:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 48    ; Shadow space + local storage",
-            "    ; rcx contains string (Windows calling convention)",
-            "    mov rdx, input_fmt_int   ; Format string",
-            "    lea r8, [rbp-8]    ; Address for result",
-            "    call sscanf",
-            "    mov rax, [rbp-8]  ; Get converted value",
-            "    add rsp, 48    ; Clean up",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; tofloat(str) - Convert string to float", 
-            "dakshin_tofloat:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 48    ; Shadow space + local storage",
-            "    ; rcx contains string (Windows calling convention)",
-            "    lea rdx, [rbp-8]    ; Address for result",
-            "    mov r8, input_fmt_float   ; Format string",
-            "    call sscanf",
-            "    movq rax, xmm0  ; Get float result",
-            "    add rsp, 48    ; Clean up",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; === GUI FUNCTIONS (Windows API) ===",
-            "",
-            "; msgbox(message, title) - Show message box",
-            "dakshin_msgbox:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = message, rdx = title (Windows calling convention)",
-            "    mov r9, 0      ; MB_OK type",
-            "    mov r8, rdx    ; Title (if provided, otherwise use default)",
-            "    test r8, r8",
-            "    jnz msgbox_with_title",
-            "    mov r8, alert_title  ; Use default title",
-            "msgbox_with_title:",
-            "    mov rdx, rcx   ; Message",
-            "    mov rcx, 0     ; No parent window",
-            "    call MessageBoxA",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    ; Result already in rax",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; alert(message) - Simple alert dialog",
-            "dakshin_alert:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = message (Windows calling convention)",
-            "    ; Show message box with default title",
-            "    mov r9, 0      ; MB_OK type",
-            "    mov r8, alert_title  ; Default title",
-            "    mov rdx, rcx   ; Message",
-            "    mov rcx, 0     ; No parent window",
-            "    call MessageBoxA",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; confirm(message) - Yes/No confirmation dialog",
-            "dakshin_confirm:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = message (Windows calling convention)",
-            "    ; Show Yes/No message box",
-            "    mov r9, 4      ; MB_YESNO type",
-            "    mov r8, confirm_title  ; Default title",
-            "    mov rdx, rcx   ; Message",
-            "    mov rcx, 0     ; No parent window",
-            "    call MessageBoxA",
-            "    ; Convert result: IDYES=6 -> 1, IDNO=7 -> 0",
-            "    cmp rax, 6",
-            "    sete al        ; Set al to 1 if equal to IDYES",
-            "    movzx rax, al  ; Zero extend to rax",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; beep(frequency, duration) - System beep",
-            "dakshin_beep:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; rcx = frequency, rdx = duration (Windows calling convention)",
-            "    ; If no parameters provided, use defaults",
-            "    test rcx, rcx",
-            "    jnz beep_with_freq",
-            "    mov rcx, 1000  ; Default frequency",
-            "beep_with_freq:",
-            "    test rdx, rdx",
-            "    jnz beep_call",
-            "    mov rdx, 500   ; Default duration",
-            "beep_call:",
-            "    call Beep",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-            "; getclipboard() - Get clipboard text",
-            "dakshin_getclipboard:",
-            "    push rbp",
-            "    mov rbp, rsp",
-            "    sub rsp, 32    ; Shadow space",
-            "    ; Open clipboard",
-            "    mov rcx, 0     ; No window handle",
-            "    call OpenClipboard",
-            "    test rax, rax",
-            "    jz clipboard_error",
-            "    ; Get clipboard data",
-            "    mov rcx, 1     ; CF_TEXT format",
-            "    call GetClipboardData",
-            "    mov rbx, rax   ; Save handle",
-            "    test rax, rax",
-            "    jz close_clipboard",
-            "    ; Lock global memory",
-            "    mov rcx, rbx",
-            "    call GlobalLock",
-            "    ; Copy to our buffer (simplified - should allocate proper buffer)",
-            "    mov rbx, rax   ; Text pointer",
-            "    ; Unlock and close",
-            "    mov rcx, rbx",
-            "    call GlobalUnlock",
-            "close_clipboard:",
-            "    call CloseClipboard",
-            "    mov rax, rbx   ; Return text pointer",
-            "    jmp clipboard_end",
-            "clipboard_error:",
-            "    mov rax, 0     ; Return null on error",
-            "clipboard_end:",
-            "    add rsp, 32    ; Clean up shadow space",
-            "    mov rsp, rbp",
-            "    pop rbp",
-            "    ret",
-            "",
-        ])
+        # Only the standard library routines the program calls
+        for name in routines:
+            header.extend(ROUTINES[name])
+            header.append("")
     
     def generate_declaration(self, node):
         """Generate code for top-level declarations"""
-        if node['type'] == 'class':
-            self.generate_class(node)
-        elif node['type'] == 'function':
-            self.generate_function(node)
-        elif node['type'] == 'import':
-            # Imports are handled at compile time
-            pass
-        elif node['type'] == 'namespace':
-            self.generate_namespace(node)
+        # Imports are handled at compile time
+        handler = self.declaration_handlers.get(node.kind)
+        if handler:
+            handler(node)
     
     def generate_class(self, node):
         """Generate assembly for class declarations"""
-        class_name = node['name']
+        class_name = node.name
         
         # Add class label
         self.text_section.append(f"; Class: {class_name}")
         
         # Generate code for class members
-        for member in node['members']:
-            if member['type'] == 'constructor':
+        for member in node.members:
+            if member.type == 'constructor':
                 self.generate_constructor(member, class_name)
-            elif member['type'] == 'function':
+            elif member.type == 'function':
                 self.generate_method(member, class_name)
     
     def generate_constructor(self, node, class_name):
@@ -708,7 +240,7 @@ class AssemblyGenerator:
         ])
         
         # Handle parameters
-        params = node.get('params', [])
+        params = node.params
         for i, param in enumerate(params):
             # Parameters are passed in registers: rcx, rdx, r8, r9 (Windows x64 calling convention)
             register = ['rcx', 'rdx', 'r8', 'r9'][i] if i < 4 else f"[rbp+{16+8*i}]"
@@ -717,13 +249,13 @@ class AssemblyGenerator:
             self.stack_offset += 8
         
         # Handle super call
-        if node.get('super'):
+        if node.super:
             self.text_section.append("    ; Super constructor call")
             # In a real implementation, this would call parent constructor
         
         # Generate constructor body
-        if node.get('body'):
-            for stmt in node['body']:
+        if node.body:
+            for stmt in node.body:
                 self.generate_statement(stmt)
         
         # Function epilogue
@@ -736,9 +268,9 @@ class AssemblyGenerator:
             ""
         ])
     
-    def generate_function(self, node):
+    def generate_function(self, node, func_name=None):
         """Generate assembly for function declarations"""
-        func_name = node['name']
+        func_name = func_name or node.name
         self.current_function = func_name
         self.local_vars = {}
         self.local_var_types = {}
@@ -764,7 +296,7 @@ class AssemblyGenerator:
             ])
         
         # Handle parameters (Windows x64 calling convention: RCX, RDX, R8, R9)
-        params = node.get('params', [])
+        params = node.params
         for i, param in enumerate(params):
             register = ['rcx', 'rdx', 'r8', 'r9'][i] if i < 4 else f"[rbp+{32+8*i}]"  # Windows uses 4 registers
             self.local_vars[param['name']] = f"[rbp-{8*(i+1)}]"
@@ -774,8 +306,8 @@ class AssemblyGenerator:
             self.stack_offset += 8
         
         # Generate function body
-        if node.get('body'):
-            for stmt in node['body']:
+        if node.body:
+            for stmt in node.body:
                 self.generate_statement(stmt)
         
         # Function epilogue
@@ -801,94 +333,58 @@ class AssemblyGenerator:
     
     def generate_method(self, node, class_name):
         """Generate assembly for class methods"""
-        method_name = f"{class_name}_{node['name']}"
-        self.generate_function({**node, 'name': method_name})
+        method_name = f"{class_name}_{node.name}"
+        self.generate_function(node, method_name)
     
     def generate_namespace(self, node):
         """Generate code for namespace declarations"""
         # Process namespace body
-        for declaration in node['body']:
+        for declaration in node.body:
             self.generate_declaration(declaration)
     
     def generate_statement(self, node):
         """Generate assembly for statements"""
-        if node['type'] == 'expr_stmt':
-            self.generate_expression(node['expr'])
-        elif node['type'] == 'return':
-            if node.get('value'):
-                # Evaluate return expression into rax
-                self.generate_expression(node['value'])
-            self.text_section.extend([
-                f"    jmp {self.current_function}_end"
-            ])
-        elif node['type'] == 'variable_declaration':
-            self.generate_variable_declaration(node)
-        elif node['type'] == 'let':
-            self.generate_variable_declaration(node)
-        elif node['type'] == 'var_decl':
-            self.generate_variable_declaration(node)
-        elif node['type'] == 'assignment':
-            self.generate_assignment(node)
-        elif node['type'] == 'if':
-            self.generate_if_statement(node)
-        elif node['type'] == 'while':
-            self.generate_while_statement(node)
-        elif node['type'] == 'for':
-            self.generate_for_statement(node)
-        elif node['type'] == 'switch':
-            self.generate_switch_statement(node)
-        elif node['type'] == 'try':
-            self.generate_try_statement(node)
-        elif node['type'] == 'break':
-            self.generate_break_statement(node)
-        elif node['type'] == 'continue':
-            self.generate_continue_statement(node)
-        elif node['type'] == 'block':
-            # Handle block statements
-            body = node.get('body', node.get('statements', []))
-            for stmt in body:
-                self.generate_statement(stmt)
+        handler = self.statement_handlers.get(node.kind)
+        if handler:
+            handler(node)
         else:
             # Unknown statement type - add comment
-            self.text_section.append(f"    ; Unknown statement type: {node['type']}")
+            self.text_section.append(f"    ; Unknown statement type: {node.type}")
+    
+    def generate_expression_statement(self, node):
+        """Generate assembly for an expression used as a statement"""
+        self.generate_expression(node.expr)
+    
+    def generate_return_statement(self, node):
+        """Generate assembly for return statements"""
+        if node.value:
+            # Evaluate return expression into rax
+            self.generate_expression(node.value)
+        self.text_section.extend([
+            f"    jmp {self.current_function}_end"
+        ])
+    
+    def generate_block_statement(self, node):
+        """Generate assembly for block statements"""
+        for stmt in node.body:
+            self.generate_statement(stmt)
     
     def generate_expression(self, node):
         """Generate assembly for expressions"""
-        if node['type'] == 'call':
-            self.generate_function_call(node)
-        elif node['type'] == 'assignment':
-            self.generate_assignment(node)
-        elif node['type'] == 'identifier':
-            self.generate_identifier(node)
-        elif node['type'] == 'string':
-            self.generate_string_literal(node)
-        elif node['type'] == 'number':
-            self.generate_number_literal(node)
-        elif node['type'] == 'binary':
-            self.generate_binary_operation(node)
-        elif node['type'] == 'unary':
-            self.generate_unary_operation(node)
-        elif node['type'] == 'member':
-            self.generate_member_access(node)
-        elif node['type'] == 'new':
-            self.generate_new_expression(node)
-        elif node['type'] == 'cast':
-            self.generate_cast_expression(node)
-        elif node['type'] == 'instanceof':
-            self.generate_instanceof_expression(node)
-        elif node['type'] == 'lambda':
-            self.generate_lambda_expression(node)
+        handler = self.expression_handlers.get(node.kind)
+        if handler:
+            handler(node)
     
     def generate_function_call(self, node):
         """Generate assembly for function calls"""
-        callee = node['callee']
-        args = node.get('args', [])
+        callee = node.callee
+        args = node.args
         
         # Get function name
-        if callee['type'] == 'identifier':
-            func_name = callee['value']
-        elif callee['type'] == 'member':
-            func_name = f"{callee['object']['value']}.{callee['member']}"
+        if callee.type == 'identifier':
+            func_name = callee.value
+        elif callee.type == 'member':
+            func_name = f"{callee.object['value']}.{callee.member}"
         else:
             func_name = 'unknown'
         
@@ -1014,16 +510,16 @@ class AssemblyGenerator:
         """Generate assembly for print function calls"""
         if args:
             arg = args[0]  # Print first argument
-            if arg['type'] == 'string':
+            if arg.type == 'string':
                 # Create string literal
-                string_label = self.create_string_literal(arg['value'])
+                string_label = self.create_string_literal(arg.value)
                 
                 self.text_section.extend([
-                    f"    ; Print string: {arg['value']}",
+                    f"    ; Print string: {arg.value}",
                     f"    mov rcx, {string_label}",
                     "    call dakshin_print"
                 ])
-            elif arg['type'] == 'number':
+            elif arg.type == 'number':
                 # Print number
                 self.generate_expression(arg)
                 self.text_section.extend([
@@ -1054,24 +550,29 @@ class AssemblyGenerator:
                 should_print_as_int = False
                 
                 # Case 1: Function call that returns an integer
-                if (arg['type'] == 'call' and 
-                    arg['callee']['type'] == 'identifier' and 
-                    arg['callee']['value'] in ['length', 'strlen', 'time', 'abs', 'min', 'max', 'toint']):
+                if (arg.type == 'call' and 
+                    arg.callee.type == 'identifier' and 
+                    arg.callee.value in ['length', 'strlen', 'time', 'abs', 'min', 'max', 'toint']):
                     should_print_as_int = True
                 
                 # Case 2: Variable that contains an integer
-                elif (arg['type'] == 'identifier' and 
-                      arg['value'] in self.local_var_types and 
-                      self.local_var_types[arg['value']] == 'int'):
+                elif (arg.type == 'identifier' and 
+                      arg.value in self.local_var_types and 
+                      self.local_var_types[arg.value] == 'int'):
                     should_print_as_int = True
                 
                 # Case 3: Binary expressions (arithmetic and comparison operations result in integers)
-                elif (arg['type'] == 'binary' and 
-                      arg['op'] in ['+', '-', '*', '/', '%', '==', '!=', '<', '>', '<=', '>=']):
+                elif (arg.type == 'binary' and 
+                      arg.op in ['+', '-', '*', '/', '%', '**', '&', '|', '^', '<<', '>>',
+                                 '==', '!=', '<', '>', '<=', '>=']):
                     should_print_as_int = True
                 
                 # Case 4: Number literals
-                elif arg['type'] == 'number':
+                elif arg.type == 'number':
+                    should_print_as_int = True
+                
+                # Case 5: Negation and logical not
+                elif arg.type == 'unary' and arg.op in ('-', '!'):
                     should_print_as_int = True
                 
                 if should_print_as_int:
@@ -1226,7 +727,7 @@ class AssemblyGenerator:
     
     def generate_identifier(self, node):
         """Generate assembly for identifier access"""
-        var_name = node['value']
+        var_name = node.value
         if var_name in self.local_vars:
             # Load the VALUE from the variable location, not the address
             var_location = self.local_vars[var_name]
@@ -1242,26 +743,31 @@ class AssemblyGenerator:
     
     def generate_string_literal(self, node):
         """Generate assembly for string literals"""
-        string_label = self.create_string_literal(node['value'])
+        string_label = self.create_string_literal(node.value)
         self.text_section.append(f"    mov rax, {string_label}")
     
     def generate_number_literal(self, node):
         """Generate assembly for number literals"""
-        value = node['value']
+        value = node.value
         self.text_section.append(f"    mov rax, {value}")
     
     def generate_binary_operation(self, node):
         """Generate assembly for binary operations"""
-        op = node['op']
-        left = node['left']
-        right = node['right']
+        op = node.op
+        left = node.left
+        right = node.right
         
         # Handle instanceof specially - don't evaluate right side as expression
         if op == 'instanceof':
             self.generate_instanceof_check(left, right)
             return
         
-        # Evaluate left operand
+        # Arithmetic, bitwise and comparison operators are compiled into registers
+        if self.register_allocation and op in REGISTER_OPERATORS:
+            self.expressions.generate(node)
+            return
+        
+        # Otherwise use the stack: evaluate left operand
         self.generate_expression(left)
         self.text_section.append("    push rax    ; Save left operand")
         
@@ -1279,8 +785,10 @@ class AssemblyGenerator:
             self.text_section.append("    imul rax, rbx")
         elif op == '/':
             self.text_section.extend([
+                "    push rdx        ; rdx may hold a call argument",
                 "    cqo             ; Sign extend rax to rdx:rax",
-                "    idiv rbx        ; Divide rdx:rax by rbx"
+                "    idiv rbx        ; Divide rdx:rax by rbx",
+                "    pop rdx"
             ])
         elif op == '==':
             label = self.get_next_label()
@@ -1319,6 +827,41 @@ class AssemblyGenerator:
                 "    setge al        ; Set al to 1 if greater or equal",
                 "    movzx rax, al   ; Zero extend to rax"
             ])
+        elif op == '&':
+            self.text_section.append("    and rax, rbx")
+        elif op == '|':
+            self.text_section.append("    or rax, rbx")
+        elif op == '^':
+            self.text_section.append("    xor rax, rbx")
+        elif op == '<<':
+            self.text_section.extend([
+                "    push rcx        ; rcx may hold a call argument",
+                "    mov rcx, rbx    ; Shift count in cl",
+                "    shl rax, cl",
+                "    pop rcx"
+            ])
+        elif op == '>>':
+            self.text_section.extend([
+                "    push rcx        ; rcx may hold a call argument",
+                "    mov rcx, rbx    ; Shift count in cl",
+                "    sar rax, cl     ; Arithmetic shift keeps the sign",
+                "    pop rcx"
+            ])
+        elif op == '**':
+            # Integer power by repeated multiplication (negative exponents give 1)
+            loop_label = self.get_next_label()
+            done_label = self.get_next_label()
+            self.text_section.extend([
+                "    mov r10, rax    ; Base in r10",
+                "    mov rax, 1",
+                f"{loop_label}:",
+                "    test rbx, rbx",
+                f"    jle {done_label}",
+                "    imul rax, r10",
+                "    dec rbx",
+                f"    jmp {loop_label}",
+                f"{done_label}:"
+            ])
         else:
             # Unknown operator
             self.text_section.append(f"    ; Unknown binary operator: {op}")
@@ -1326,8 +869,12 @@ class AssemblyGenerator:
     
     def generate_unary_operation(self, node):
         """Generate assembly for unary operations"""
-        op = node['op']
-        operand = node['right']
+        op = node.op
+        operand = node.right
+        
+        if self.register_allocation:
+            self.expressions.generate(node)
+            return
         
         self.generate_expression(operand)
         
@@ -1342,8 +889,8 @@ class AssemblyGenerator:
     
     def generate_variable_declaration(self, node):
         """Generate assembly for variable declarations"""
-        var_name = node['name']
-        var_type = node.get('var_type')
+        var_name = node.name
+        var_type = node.var_type
         
         # Allocate space on stack
         self.stack_offset += 8
@@ -1357,22 +904,29 @@ class AssemblyGenerator:
             return
         
         # Initialize if there's an initial value (use 'value' field from AST)
-        init_value = node.get('init', node.get('value'))
+        init_value = node.init if node.kind == VarDeclNode.kind else node.value
         if init_value:
             # Determine variable type based on initial value
-            if init_value['type'] == 'number':
+            if init_value.type == 'number':
                 self.local_var_types[var_name] = 'int'
-            elif init_value['type'] == 'string':
+            elif init_value.type == 'string':
                 self.local_var_types[var_name] = 'string'
-            elif init_value['type'] == 'binary':
+            elif init_value.type == 'binary':
                 # Binary operations on numbers result in numbers
                 self.local_var_types[var_name] = 'int'
-            elif (init_value['type'] == 'call' and 
-                  init_value['callee']['type'] == 'identifier' and 
-                  init_value['callee']['value'] in ['length', 'strlen', 'time', 'abs', 'min', 'max', 'toint']):
+            elif init_value.type == 'unary' and init_value.op in ('-', '!'):
+                # So do negation and logical not (not dereference)
+                self.local_var_types[var_name] = 'int'
+            elif init_value.type == 'identifier' and init_value.value in self.local_var_types:
+                # A copy of another variable has its type (x + 0 simplifies to x)
+                source_type = self.local_var_types[init_value.value]
+                self.local_var_types[var_name] = 'int' if source_type == 'dynamic' else source_type
+            elif (init_value.type == 'call' and 
+                  init_value.callee.type == 'identifier' and 
+                  init_value.callee.value in ['length', 'strlen', 'time', 'abs', 'min', 'max', 'toint']):
                 # Integer-returning function calls
                 self.local_var_types[var_name] = 'int'
-            elif init_value['type'] == 'call':
+            elif init_value.type == 'call':
                 # For now, assume all user-defined function calls return integers
                 self.local_var_types[var_name] = 'int'
             else:
@@ -1387,7 +941,7 @@ class AssemblyGenerator:
     
     def generate_assignment(self, node):
         """Generate assembly for variable assignments"""
-        var_name = node['name']
+        var_name = node.name
         
         # Check if variable exists
         if var_name not in self.local_vars:
@@ -1397,22 +951,24 @@ class AssemblyGenerator:
             self.local_var_types[var_name] = 'int'  # Default to int for assignments
         
         # Generate expression for the new value
-        value_expr = node['value']
+        value_expr = node.value
         
         # Update variable type based on assignment value (especially for dynamic variables)
         current_type = self.local_var_types.get(var_name, 'int')
         
-        if value_expr['type'] == 'number':
+        if value_expr.type == 'number':
             new_type = 'int'
-        elif value_expr['type'] == 'string':
+        elif value_expr.type == 'string':
             new_type = 'string'
-        elif value_expr['type'] == 'binary' and value_expr['op'] in ['+', '-', '*', '/', '%']:
+        elif value_expr.type == 'binary' and value_expr.op in ['+', '-', '*', '/', '%', '**', '&', '|', '^', '<<', '>>']:
+            new_type = 'int'
+        elif value_expr.type == 'unary' and value_expr.op in ('-', '!'):
             new_type = 'int'
-        elif (value_expr['type'] == 'call' and 
-              value_expr['callee']['type'] == 'identifier' and 
-              value_expr['callee']['value'] in ['length', 'strlen', 'time', 'abs', 'min', 'max', 'toint']):
+        elif (value_expr.type == 'call' and 
+              value_expr.callee.type == 'identifier' and 
+              value_expr.callee.value in ['length', 'strlen', 'time', 'abs', 'min', 'max', 'toint']):
             new_type = 'int'
-        elif value_expr['type'] == 'call':
+        elif value_expr.type == 'call':
             # For now, assume all function calls return integers (we'll implement proper type inference later)
             new_type = 'int'
         else:
@@ -1433,7 +989,7 @@ class AssemblyGenerator:
         end_label = self.get_next_label("end_if")
         
         # Evaluate condition (use 'cond' field from AST)
-        condition = node.get('cond', node.get('condition'))
+        condition = node.cond
         if condition:
             self.generate_expression(condition)
             self.text_section.extend([
@@ -1445,14 +1001,14 @@ class AssemblyGenerator:
             self.text_section.append(f"    ; No condition found in if statement")
         
         # Generate then block
-        if node.get('then'):
-            self.generate_statement(node['then'])
+        if node.then:
+            self.generate_statement(node.then)
         self.text_section.append(f"    jmp {end_label}")
         
         # Generate else block
         self.text_section.append(f"{else_label}:")
-        if node.get('else'):
-            self.generate_statement(node['else'])
+        if node.else_:
+            self.generate_statement(node.else_)
         
         self.text_section.append(f"{end_label}:")
     
@@ -1464,7 +1020,7 @@ class AssemblyGenerator:
         self.text_section.append(f"{start_label}:")
         
         # Evaluate condition
-        condition = node.get('cond', node.get('condition'))
+        condition = node.cond
         if condition:
             self.generate_expression(condition)
             self.text_section.extend([
@@ -1473,7 +1029,7 @@ class AssemblyGenerator:
             ])
         
         # Generate body
-        self.generate_statement(node['body'])
+        self.generate_statement(node.body)
         self.text_section.append(f"    jmp {start_label}")
         
         self.text_section.append(f"{end_label}:")
@@ -1485,29 +1041,27 @@ class AssemblyGenerator:
         continue_label = self.get_next_label("for_continue")
         
         # Generate initialization
-        if node.get('init'):
-            self.generate_statement(node['init'])
+        if node.init:
+            self.generate_statement(node.init)
         
         self.text_section.append(f"{start_label}:")
         
         # Evaluate condition
-        if node.get('condition'):
-            self.generate_expression(node['condition'])
+        if node.condition:
+            self.generate_expression(node.condition)
             self.text_section.extend([
                 "    test rax, rax",
                 f"    jz {end_label}"
             ])
         
         # Generate body
-        if node.get('body'):
-            self.generate_statement(node['body'])
+        if node.body:
+            self.generate_statement(node.body)
         
         # Generate increment
         self.text_section.append(f"{continue_label}:")
-        if node.get('update'):
-            self.generate_expression(node['update'])
-        elif node.get('increment'):
-            self.generate_expression(node['increment'])
+        if node.update:
+            self.generate_expression(node.update)
         
         self.text_section.append(f"    jmp {start_label}")
         self.text_section.append(f"{end_label}:")
@@ -1517,11 +1071,11 @@ class AssemblyGenerator:
         end_label = self.get_next_label("switch_end")
         
         # Evaluate switch expression
-        self.generate_expression(node['expr'])
+        self.generate_expression(node.expr)
         self.text_section.append("    push rax    ; Save switch value")
         
         # Generate cases
-        for case in node.get('cases', []):
+        for case in node.cases:
             case_label = self.get_next_label("case")
             self.text_section.append(f"{case_label}:")
             
@@ -1542,10 +1096,10 @@ class AssemblyGenerator:
                 self.generate_statement(stmt)
         
         # Generate default case
-        if node.get('default'):
+        if node.default:
             default_label = self.get_next_label("default")
             self.text_section.append(f"{default_label}:")
-            for stmt in node['default']:
+            for stmt in node.default:
                 self.generate_statement(stmt)
         
         self.text_section.append("    pop rax     ; Clean up switch value")
@@ -1583,8 +1137,8 @@ class AssemblyGenerator:
     def generate_member_access(self, node):
         """Generate assembly for member access"""
         # Simplified: assume member access is field access
-        object_expr = node['object']
-        member_name = node['member']
+        object_expr = node.object
+        member_name = node.member
         
         self.generate_expression(object_expr)
         # In a real implementation, this would calculate offset
@@ -1592,8 +1146,8 @@ class AssemblyGenerator:
     
     def generate_new_expression(self, node):
         """Generate assembly for object creation"""
-        class_name = node['class']
-        args = node.get('args', [])
+        class_name = node.class_
+        args = node.args
         
         self.text_section.extend([
             f"    ; Create new {class_name}",
@@ -1614,8 +1168,8 @@ class AssemblyGenerator:
     
     def generate_cast_expression(self, node):
         """Generate assembly for type casting"""
-        expr = node['expr']
-        target_type = node['target_type']
+        expr = node.expr
+        target_type = node.target_type
         
         # Generate expression
         self.generate_expression(expr)
@@ -1625,15 +1179,15 @@ class AssemblyGenerator:
     
     def generate_instanceof_expression(self, node):
         """Generate assembly for instanceof checks (deprecated - using binary operation handler)"""
-        left = node['left']
-        right = node['right']
+        left = node.left
+        right = node.right
         self.generate_instanceof_check(left, right)
     
     def generate_instanceof_check(self, left_expr, right_expr):
         """Generate assembly for instanceof type checking"""
         # Get the variable name from left expression
-        if left_expr['type'] == 'identifier':
-            var_name = left_expr['value']
+        if left_expr.type == 'identifier':
+            var_name = left_expr.value
         else:
             # For complex expressions, evaluate and use result
             self.text_section.append("    ; Complex instanceof left expression")
@@ -1641,8 +1195,8 @@ class AssemblyGenerator:
             var_name = None
         
         # Get the type name from right expression
-        if right_expr['type'] == 'identifier':
-            type_name = right_expr['value']
+        if right_expr.type == 'identifier':
+            type_name = right_expr.value
         else:
             self.text_section.append("    ; Error: instanceof requires type identifier on right")
             self.text_section.append("    mov rax, 0  ; Default to false")
@@ -1730,8 +1284,8 @@ class AssemblyGenerator:
     
     def generate_lambda_expression(self, node):
         """Generate assembly for lambda expressions"""
-        params = node.get('params', [])
-        body = node['body']
+        params = node.params
+        body = node.body
         
         # Generate unique lambda function name
         lambda_name = f"lambda_{self.lambda_counter}"
@@ -1768,7 +1322,7 @@ class AssemblyGenerator:
         
         # Set up lambda context
         self.current_function = lambda_name
-        self.current_params = params.copy()
+        self.current_params = list(params)
         self.current_locals = {}
         
         # Generate lambda function
@@ -1803,7 +1357,7 @@ class AssemblyGenerator:
                 self.current_locals[param] = f"[rbp-{(i+1)*8}]"
         
         # Generate lambda body
-        if isinstance(body, list):
+        if not isinstance(body, ASTNode):
             # Multi-line lambda with block (body is a list of statements)
             for stmt in body:
                 self.generate_statement(stmt)
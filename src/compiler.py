@@ -5,68 +5,261 @@ Integrates with the parser to generate assembly from source files
 
 from Lexer import Lexer
 from File import FileReader
-from Error import ErrorHandler
+from Error import ErrorHandler, Error
 from Parser import Parser
-from ParsingTable import convert_token_types
+from ASTToken import ASTNode, ASTSequence
+from Tokens import TokenBuffer
+from arena import ASTArena
 from code_generator import AssemblyGenerator
+from optimizer import Optimizer, DEFAULT_LEVEL
+from cache import CompileCache, DEFAULT_CACHE_DIR, cache_key
+from stats import CompileStats, count_instructions
+import os
 import sys
 import json
+from contextlib import contextmanager
 
-def compile_to_assembly(file_path, output_file=None):
-    """Compile Dakshin source file to assembly"""
+def parse_source(file_path, lexer, stream=False, mmap=False, log=print, stats=None, arena=False):
+    """Lex and parse a source file; return the AST and the number of tokens read.
+
+    With stream=True the source is read in chunks and tokens are fed to the
+    parser lazily, so lexing uses constant memory on very large inputs.
+    With mmap=True the file is memory-mapped and lexed as bytes.
+    With arena=True the AST is kept in an ASTArena (see parse_program).
+    Stage timings are recorded in stats when a CompileStats is given.
+    Syntax errors are all reported to the lexer's error handler before an
+    Error is raised, so one run lists every error in the file.
+    """
+    if stats is None:
+        stats = CompileStats(file_path)
+    if stream:
+        if log:
+            log("Lexical and Syntactic Analysis (streaming)...")
+        with stats.stage("lex+parse", "nodes") as stage, open(file_path, 'r') as source:
+            tokens = TokenBuffer(lexer.iter_tokens(source, parser_kinds=True, file_path=file_path))
+            parser = Parser(tokens, error_handler=lexer.error_handler, file_path=file_path)
+            ast = parse_program(parser, arena)
+            stage.count = stats.nodes = count_ast_nodes(ast)
+        stats.tokens = tokens.consumed
+        check_syntax(parser)
+        return ast, stats.tokens
+    
+    file_reader = FileReader(file_path=file_path, mmap=mmap)
+    try:
+        if log:
+            log("Lexical Analysis...")
+        with stats.stage("lex", "tokens") as stage:
+            tokens = lexer.tokenize(file_reader, parser_kinds=True)
+            stage.count = stats.tokens = len(tokens)
+        
+        if log:
+            log("Syntactic Analysis...")
+        with stats.stage("parse", "nodes") as stage:
+            parser = Parser(tokens, error_handler=lexer.error_handler, file_path=file_path)
+            ast = parse_program(parser, arena)
+            stage.count = stats.nodes = count_ast_nodes(ast)
+    finally:
+        file_reader.close()
+    check_syntax(parser)
+    return ast, stats.tokens
+
+def parse_program(parser, arena=False):
+    """Parse all declarations; with arena=True return them as an ASTArena's program list.
+
+    Each declaration is moved into the arena as soon as it is parsed, so
+    only one declaration's worth of node objects is alive at a time.
+    """
+    if not arena:
+        return parser.parse()
+    program = ASTArena()
+    for declaration in parser.iter_declarations():
+        program.append(declaration)
+    return program.program()
+
+def check_syntax(parser):
+    """Raise if the parser reported syntax errors (they have been printed already)."""
+    if parser.error_count:
+        raise Error(f"{parser.error_count} syntax error{'s' if parser.error_count != 1 else ''}")
+
+def compile_source(file_path, lexer, cache=None, stream=False, mmap=False, log=print, stdlib=None, stats=None,
+                   arena=False, output=None, link_runtime=False, opt_level=DEFAULT_LEVEL):
+    """Compile a source file, consulting the compile cache when one is given.
+
+    Returns the AST, the assembly and a CompileStats for the run. When an
+    output file is given (opened with 'w+', so the cache can read it back)
+    the assembly is streamed into it and None is returned in its place.
+    With link_runtime=True the runtime routines are declared extern rather
+    than included (see runtime.py). opt_level is the -O level: 0 compiles
+    the AST as parsed with the stack machine, 1 and up optimize it first
+    (see optimizer.py) and allocate registers. Results are only stored
+    when the lexer reported no errors, so a cache hit never hides a
+    diagnostic.
+    """
+    if stats is None:
+        stats = CompileStats(file_path)
+    try:
+        key = None
+        if cache is not None:
+            with stats.stage("cache"):
+                with open(file_path, 'rb') as f:
+                    options = {}
+                    if link_runtime:
+                        options['link_runtime'] = True
+                    if opt_level != DEFAULT_LEVEL:
+                        options['opt_level'] = opt_level
+                    key = cache_key(f.read(), options or None)
+                entry = cache.get(key)
+            if entry is not None:
+                if log:
+                    log("Using cached compilation result")
+                stats.cached = True
+                stats.tokens = entry["stats"]["tokens"]
+                stats.strings = entry["stats"]["strings"]
+                stats.nodes = entry["stats"].get("nodes")
+                if stats.nodes is None:
+                    stats.nodes = count_ast_nodes(entry["ast"])  # Entry stored without a node count
+                assembly_code = entry["assembly"]
+                stats.lines = assembly_code.count('\n') + 1
+                stats.instructions = count_instructions(assembly_code)
+                if output is not None:
+                    output.write(assembly_code)
+                    assembly_code = None
+                return entry["ast"], assembly_code, stats
+        
+        ast, _ = parse_source(file_path, lexer, stream=stream, mmap=mmap, log=log, stats=stats, arena=arena)
+        
+        if opt_level > 0:
+            if log:
+                log(f"Optimization (-O{opt_level})...")
+            with stats.stage("optimize", "rewrites") as stage:
+                optimizer = Optimizer(opt_level)
+                ast = optimizer.program(ast)
+                stage.count = optimizer.rewrites
+        
+        if log:
+            log("Code Generation...")
+        with stats.stage("generate", "instructions") as stage:
+            generator = AssemblyGenerator(stdlib, link_runtime=link_runtime, register_allocation=opt_level > 0)
+            if output is None:
+                assembly_code = generator.generate(ast)
+            else:
+                generator.generate_to(ast, output)
+                assembly_code = None
+            stage.count = stats.instructions = generator.instruction_count
+        stats.lines = generator.line_count
+        stats.strings = generator.string_counter
+        
+        if key is not None and not lexer.error_handler.has_errors():
+            cache.put(key, ast, assembly_code if output is None else output,
+                      tokens=stats.tokens, strings=stats.strings, nodes=stats.nodes)
+        return ast, assembly_code, stats
+    finally:
+        stats.close()
+
+@contextmanager
+def open_output(path):
+    """Open a file to stream assembly into; it replaces path only if the block succeeds."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    f = open(temp_path, 'w+')
+    try:
+        yield f
+    except BaseException:
+        f.close()
+        os.remove(temp_path)
+        raise
+    f.close()
+    os.replace(temp_path, path)
+
+def open_cache(directory=DEFAULT_CACHE_DIR):
+    """Open the compile cache, or return None (with a warning) if it is unusable."""
+    try:
+        return CompileCache(directory)
+    except OSError as e:
+        print(f"Warning: compile cache disabled: {e}")
+        return None
+
+def compile_to_assembly(file_path, output_file=None, stream=False, mmap=False, use_cache=True,
+                        stats_format=None, trace_memory=False, with_stats=False, arena=False, link_runtime=False,
+                        opt_level=DEFAULT_LEVEL):
+    """Compile Dakshin source file to assembly
+
+    With stats_format='json' progress messages are left out and the
+    CompileStats of the run is printed as JSON instead. With
+    with_stats=True the return value is (assembly_code, stats). Assembly
+    written to output_file is never held in memory as a whole, so
+    output_file is returned in place of the assembly code.
+    """
+    log = None if stats_format == 'json' else print
     try:
         # Initialize components
         error_handler = ErrorHandler()
         lexer = Lexer(error_handler)
-        file_reader = FileReader(file_path=file_path)
+        cache = open_cache() if use_cache else None
+        stats = CompileStats(file_path, trace_memory=trace_memory)
         
         # Parse source code
-        print(f"Compiling: {file_path}")
-        print("Lexical Analysis...")
-        tokens = lexer.tokenize(file_reader)
-        
-        print("Syntactic Analysis...")
-        parsed_tokens = convert_token_types(tokens)
-        parser = Parser(parsed_tokens)
-        ast = parser.parse()
-        
-        print("Code Generation...")
-        generator = AssemblyGenerator()
-        assembly_code = generator.generate(ast)
-        
-        # Output assembly
+        if log:
+            log(f"Compiling: {file_path}")
         if output_file:
-            with open(output_file, 'w') as f:
-                f.write(assembly_code)
-            print(f"✅ Assembly written to: {output_file}")
+            # Streamed straight into the file
+            with open_output(output_file) as f:
+                ast, assembly_code, stats = compile_source(file_path, lexer, cache, stream=stream, mmap=mmap,
+                                                           log=log, stats=stats, arena=arena, output=f,
+                                                           link_runtime=link_runtime, opt_level=opt_level)
+            assembly_code = output_file
+            if log:
+                log(f"✅ Assembly written to: {output_file}")
         else:
+            ast, assembly_code, stats = compile_source(file_path, lexer, cache, stream=stream, mmap=mmap,
+                                                       log=log, stats=stats, arena=arena, link_runtime=link_runtime,
+                                                       opt_level=opt_level)
+        
+        # Output assembly
+        if not output_file and log:
             print("Generated Assembly Code:")
             print("=" * 60)
             print(assembly_code)
         
         # Show compilation statistics
-        print("\nCompilation Statistics:")
-        print(f"• Source file: {file_path}")
-        print(f"• Tokens processed: {len(tokens)}")
-        print(f"• AST nodes: {count_ast_nodes(ast)}")
-        print(f"• Assembly lines: {len(assembly_code.split(chr(10)))}")
-        print(f"• String literals: {generator.string_counter}")
+        if stats_format == 'json':
+            print(stats.to_json(indent=2))
+        else:
+            print("\nCompilation Statistics:")
+            print(f"• Source file: {file_path}")
+            print(f"• Tokens processed: {stats.tokens}")
+            print(f"• AST nodes: {stats.nodes}")
+            print(f"• Assembly lines: {stats.lines}")
+            print(f"• Instructions: {stats.instructions}")
+            print(f"• String literals: {stats.strings}")
+            for name, stage in stats.stages.items():
+                line = f"• {name}: {stage.wall_time * 1000:.2f} ms wall, {stage.cpu_time * 1000:.2f} ms CPU"
+                if stage.allocated_bytes is not None:
+                    line += f", {stage.allocated_bytes / 1024:.1f} KiB allocated"
+                print(line)
         
+        if with_stats:
+            return assembly_code, stats
         return assembly_code
         
     except Exception as e:
         import traceback
         print(f"Compilation failed: {e}")
-        print("Full traceback:")
-        traceback.print_exc()
-        return None
+        if not isinstance(e, Error):
+            # Diagnostics (Error) have already been reported with their locations
+            print("Full traceback:")
+            traceback.print_exc()
+        return (None, None) if with_stats else None
 
 def count_ast_nodes(ast):
-    """Count total nodes in AST"""
+    """Count total nodes in AST (parameters and other records count as nodes too)"""
     count = 0
-    if isinstance(ast, list):
+    if isinstance(ast, (list, ASTSequence)):
         for item in ast:
             count += count_ast_nodes(item)
+    elif isinstance(ast, ASTNode):
+        count += 1
+        for field in ast.slots:
+            count += count_ast_nodes(getattr(ast, field, None))
     elif isinstance(ast, dict):
         count += 1
         for value in ast.values():
@@ -0,0 +1,97 @@
+"""
+Streaming assembly output for the Dakshin code generator
+
+The generator appends lines to its .data and .text sections as it walks
+the AST, but the data section (string literals) comes first in the output
+and is only complete at the end. Each section is therefore a
+SectionWriter: lines are batched in memory and written to a spooled
+temporary file, which stays in memory while small and moves to disk once
+it grows past SPOOL_BYTES. AssemblyWriter.close() stitches the sections
+into the real output in order, so peak memory stays bounded however
+large the program is. Line and instruction counts, and the labels the
+code calls, are kept as the batches are written.
+
+The start of the text section (extern declarations and the runtime
+routines) depends on what the program calls, so it is a section of its
+own, the header, filled in once the rest of the text is generated.
+"""
+
+import shutil
+import tempfile
+
+from runtime import call_targets
+from stats import count_instructions
+
+BATCH_LINES = 4096           # Lines joined and written at a time
+SPOOL_BYTES = 4 * 1024 * 1024  # Section size kept in memory before spilling to disk
+
+class SectionWriter:
+    """One output section; a drop-in for the list the generator used to append lines to."""
+    def __init__(self, spool_bytes=SPOOL_BYTES):
+        self.file = tempfile.SpooledTemporaryFile(max_size=spool_bytes, mode='w+', encoding='utf-8', newline='')
+        self.pending = []
+        self.lines = 0         # Output lines, counting newlines inside appended strings
+        self.instructions = 0
+        self.calls = set()     # Labels called directly
+        self.written = False
+
+    def append(self, line):
+        self.pending.append(line)
+        if len(self.pending) >= BATCH_LINES:
+            self.flush()
+
+    def extend(self, lines):
+        self.pending.extend(lines)
+        if len(self.pending) >= BATCH_LINES:
+            self.flush()
+
+    def flush(self):
+        """Write the pending lines to the spool."""
+        if not self.pending:
+            return
+        text = '\n'.join(self.pending)
+        self.pending = []
+        if self.written:
+            self.file.write('\n')
+        self.file.write(text)
+        self.written = True
+        self.lines += text.count('\n') + 1
+        self.instructions += count_instructions(text)
+        self.calls |= call_targets(text)
+
+    def copy_to(self, output):
+        """Write the section's text to output (no trailing newline)."""
+        self.flush()
+        self.file.seek(0)
+        shutil.copyfileobj(self.file, output)
+
+    def close(self):
+        self.file.close()
+
+class AssemblyWriter:
+    """The data, text header and text sections of one generated program, written out on close()."""
+    def __init__(self, output, spool_bytes=SPOOL_BYTES):
+        self.output = output
+        self.data = SectionWriter(spool_bytes)
+        self.header = SectionWriter(spool_bytes)
+        self.text = SectionWriter(spool_bytes)
+        self.lines = 0
+        self.instructions = 0
+
+    def close(self):
+        """Write the data section, a blank line, the text header and the text section to the output."""
+        sections = (self.data, self.header, self.text)
+        try:
+            for section in sections:
+                section.flush()
+            self.data.copy_to(self.output)
+            self.output.write('\n')
+            for section in (self.header, self.text):
+                if section.written:
+                    self.output.write('\n')
+                    section.copy_to(self.output)
+            self.lines = sum(section.lines for section in sections) + 1
+            self.instructions = sum(section.instructions for section in sections)
+        finally:
+            for section in sections:
+                section.close()
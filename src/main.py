@@ -2,19 +2,26 @@ from Lexer import Lexer
 from File import FileReader
 from Error import ErrorHandler
 from Parser import Parser
-from ParsingTable import convert_token_types
+from ASTToken import to_dict
+from ast_binary import dump_ast
 
-def process_code(lexer, file_reader):
-    """Tokenize and print tokens for the given file reader."""
+def process_code(lexer, file_reader, format='json'):
+    """Parse the given file reader and print its AST as JSON, or write it to stdout in the binary format."""
     try:
-        tokens = lexer.tokenize(file_reader)
+        tokens = lexer.tokenize(file_reader, parser_kinds=True)
         # for token in tokens:
         #     print(token)
-        parsed_tokens = convert_token_types(tokens)
-        parser = Parser(parsed_tokens)
+        # Syntax errors are reported to the error handler and parsing carries on
+        parser = Parser(tokens, error_handler=lexer.error_handler, file_path=file_reader.file_path)
         import json
         ast_result = parser.parse()
-        print(json.dumps(ast_result, indent=2))
+        if format == 'bin':
+            import sys
+            sys.stdout.flush()
+            sys.stdout.buffer.write(dump_ast(ast_result))
+            sys.stdout.buffer.flush()
+        else:
+            print(json.dumps(to_dict(ast_result), indent=2))
     except SyntaxError as e:
         print(f"Syntax Error: {e}")
         # Print some context about where the error occurred
@@ -0,0 +1,334 @@
+"""
+AST optimization for Dakshin
+
+optimize() rewrites the parsed program before code generation:
+
+  -O1  folds integer arithmetic, bitwise, shift and comparison subtrees
+       whose operands are constants, and drops identities such as x + 0,
+       x * 1 and !!(a < b); x * 0 becomes 0 when x has no side effects.
+  -O2  also turns multiplication by a power of two into a shift, and
+       division of a variable by a power of two into a shift with a
+       rounding fix-up.
+
+Constants are folded with the generated code's semantics: 64-bit
+two's-complement wrap-around, division truncating toward zero and shift
+counts taken modulo 64. Division by zero and the one overflowing division
+are left to run. Operators the code generator does not implement as
+integer operations (%, &&, ||) and floating-point literals are left alone,
+so the optimized program computes exactly what the unoptimized one does.
+
+The code generator decides from the shape of an expression whether it is
+an int (printed as a number) or a string, so a rewrite must not change
+that either. An identity only drops down to its operand when the operand
+is known to be an int: a number, an arithmetic or comparison result, or
+a variable the generator types as int, which the optimizer tracks the
+same way (function parameters, and locals bound to int values in the
+order the generator sees them).
+
+Unchanged subtrees are shared with the input; only the nodes on the path
+to a rewrite are copied (arena nodes are materialized for that).
+"""
+
+from ASTToken import (ASTNode, ASTSequence, BinaryNode, UnaryNode, NumberNode, IdentifierNode, StringNode,
+                      BooleanNode, NullNode, RegexNode, BreakNode, ContinueNode, CallNode, FunctionNode,
+                      ConstructorNode, LambdaNode, VariableDeclarationNode, VarDeclNode, AssignmentNode)
+
+DEFAULT_LEVEL = 1
+LEVELS = (0, 1, 2)
+
+WORD = 2 ** 64
+INT_MIN = -2 ** 63
+
+PURE_OPERATORS = frozenset(['+', '-', '*', '&', '|', '^', '<<', '>>', '==', '!=', '<', '>', '<=', '>='])
+BOOLEAN_OPERATORS = frozenset(['==', '!=', '<', '>', '<=', '>='])
+# Binary results the code generator prints as ints, and those an assignment types as int
+INT_OPERATORS = PURE_OPERATORS | {'/', '%', '**'}
+ASSIGNED_INT_OPERATORS = frozenset(['+', '-', '*', '/', '%', '**', '&', '|', '^', '<<', '>>'])
+DECLARATION_KINDS = frozenset([VariableDeclarationNode.kind, VarDeclNode.kind])
+LEAF_KINDS = frozenset(cls.kind for cls in (NumberNode, IdentifierNode, StringNode, BooleanNode, NullNode,
+                                            RegexNode, BreakNode, ContinueNode))
+
+def parse_level(text):
+    """The level named by what follows '-O' ('' means 1), or None if there is no such level."""
+    if text == '':
+        return 1
+    if text.isdigit() and int(text) in LEVELS:
+        return int(text)
+    return None
+
+def wrap(value):
+    """value as a signed 64-bit integer."""
+    value &= WORD - 1
+    return value - WORD if value >= 2 ** 63 else value
+
+def fold(op, a, b):
+    """a op b as the generated code computes it, or None if it is not folded."""
+    if op == '+':
+        return wrap(a + b)
+    if op == '-':
+        return wrap(a - b)
+    if op == '*':
+        return wrap(a * b)
+    if op == '/':
+        if b == 0 or (a == INT_MIN and b == -1):
+            return None  # Faults at run time; keep it that way
+        quotient = abs(a) // abs(b)
+        return quotient if (a < 0) == (b < 0) else -quotient
+    if op == '&':
+        return a & b
+    if op == '|':
+        return a | b
+    if op == '^':
+        return a ^ b
+    if op == '<<':
+        return wrap(a << (b & 63))
+    if op == '>>':
+        return a >> (b & 63)
+    if op == '**':
+        return 1 if b <= 0 else wrap(pow(a, b, WORD))
+    if op == '==':
+        return int(a == b)
+    if op == '!=':
+        return int(a != b)
+    if op == '<':
+        return int(a < b)
+    if op == '>':
+        return int(a > b)
+    if op == '<=':
+        return int(a <= b)
+    if op == '>=':
+        return int(a >= b)
+    return None
+
+def constant(node):
+    """The value of an integer literal that fits in 64 bits, else None."""
+    if node.kind == NumberNode.kind:
+        value = node.value
+        if type(value) is int and INT_MIN <= value < 2 ** 63:
+            return value
+    return None
+
+def is_pure(node):
+    """Whether evaluating node has no side effects and cannot fault."""
+    kind = node.kind
+    if kind in (NumberNode.kind, IdentifierNode.kind, StringNode.kind):
+        return True
+    if kind == BinaryNode.kind:
+        return node.op in PURE_OPERATORS and is_pure(node.left) and is_pure(node.right)
+    if kind == UnaryNode.kind:
+        return node.op in ('-', '!') and is_pure(node.right)
+    return False
+
+def is_boolean(node):
+    """Whether node always evaluates to 0 or 1."""
+    if node.kind == BinaryNode.kind:
+        return node.op in BOOLEAN_OPERATORS
+    if node.kind == UnaryNode.kind:
+        return node.op == '!'
+    value = constant(node)
+    return value in (0, 1)
+
+def assigned_type(node):
+    """'int' or 'string' if assigning node sets the target's type in the code generator, else None."""
+    kind = node.kind
+    if kind == NumberNode.kind or kind == CallNode.kind:
+        return 'int'
+    if kind == StringNode.kind:
+        return 'string'
+    if kind == BinaryNode.kind and node.op in ASSIGNED_INT_OPERATORS:
+        return 'int'
+    if kind == UnaryNode.kind and node.op in ('-', '!'):
+        return 'int'
+    return None  # The target keeps its type
+
+def power_of_two(value):
+    """k if value is 2**k with k >= 1, else None."""
+    if value is not None and value > 1 and value & (value - 1) == 0:
+        return value.bit_length() - 1
+    return None
+
+def optimize(ast, level=DEFAULT_LEVEL):
+    """Return the program (a list of declarations) optimized at the given level."""
+    if level <= 0:
+        return ast
+    return Optimizer(level).program(ast)
+
+class Optimizer:
+    """One optimization run; counts the rewrites it makes."""
+    def __init__(self, level=DEFAULT_LEVEL):
+        self.level = level
+        self.rewrites = 0
+        self.ints = None  # Variables the code generator has typed as int, inside a function
+
+    def is_int(self, node):
+        """Whether the code generator treats the value of node as an int."""
+        kind = node.kind
+        if kind == NumberNode.kind:
+            return True
+        if kind == BinaryNode.kind:
+            return node.op in INT_OPERATORS
+        if kind == UnaryNode.kind:
+            return node.op in ('-', '!')
+        if kind == IdentifierNode.kind:
+            return self.ints is not None and node.value in self.ints
+        return False
+
+    def program(self, ast):
+        return [self.rewrite(declaration) for declaration in ast]
+
+    def rewrite(self, value):
+        """value (a node, list or record dict) with its expressions optimized."""
+        if isinstance(value, ASTNode):
+            return self.node(value)
+        if isinstance(value, (list, ASTSequence)):
+            rewritten = []
+            changed = False
+            for item in value:
+                new = self.rewrite(item)
+                changed |= new is not item
+                rewritten.append(new)
+            return rewritten if changed else value
+        if isinstance(value, dict):
+            rewritten = {key: self.rewrite(item) for key, item in value.items()}
+            if all(rewritten[key] is item for key, item in value.items()):
+                return value
+            return rewritten
+        return value
+
+    def node(self, node):
+        kind = node.kind
+        if kind in LEAF_KINDS:
+            return node
+        if kind in (FunctionNode.kind, ConstructorNode.kind, LambdaNode.kind):
+            # The generator starts each function with fresh types, and only
+            # function parameters are typed as int
+            outer = self.ints
+            self.ints = set()
+            if kind == FunctionNode.kind:
+                self.ints.update(param['name'] for param in node.params if isinstance(param, dict))
+            try:
+                return self.fields(node)
+            finally:
+                self.ints = outer
+        node = self.fields(node)
+        if self.ints is not None:
+            if kind in DECLARATION_KINDS:
+                self.declare(node)
+            elif kind == AssignmentNode.kind:
+                if assigned_type(node.value) == 'int':
+                    self.ints.add(node.name)
+                elif assigned_type(node.value) == 'string':
+                    self.ints.discard(node.name)
+        if kind == BinaryNode.kind:
+            return self.binary(node)
+        if kind == UnaryNode.kind:
+            return self.unary(node)
+        return node
+
+    def declare(self, node):
+        """Track the type the code generator gives a declared variable."""
+        init = node.init if node.kind == VarDeclNode.kind else node.value
+        if node.var_type == 'dynamic':
+            known = False
+        elif not init:
+            known = True
+        elif init.kind == IdentifierNode.kind:
+            known = init.value in self.ints
+        else:
+            known = init.kind in (NumberNode.kind, BinaryNode.kind, CallNode.kind) or \
+                (init.kind == UnaryNode.kind and init.op in ('-', '!'))
+        if known:
+            self.ints.add(node.name)
+        else:
+            self.ints.discard(node.name)
+
+    def fields(self, node):
+        """node with the values of its fields optimized."""
+        changes = None
+        for field, slot in zip(node.fields, node.slots):
+            value = getattr(node, slot, None)
+            if isinstance(value, ASTNode):
+                if value.kind in LEAF_KINDS:
+                    continue
+                rewritten = self.node(value)
+            elif isinstance(value, (list, ASTSequence, dict)):
+                rewritten = self.rewrite(value)
+            else:
+                continue
+            if rewritten is not value:
+                if changes is None:
+                    changes = {}
+                changes[field] = rewritten
+        if changes and node.kind == AssignmentNode.kind and node.name not in (self.ints or ()) \
+                and assigned_type(changes['value']) != assigned_type(node.value):
+            # The rewrite would change the type the target is given; keep the value as written
+            return node
+        if changes:
+            node = node.replace(**changes)
+        return node
+
+    def number(self, value, node):
+        self.rewrites += 1
+        return NumberNode(value, node.start, node.end)
+
+    def simplified(self, result):
+        self.rewrites += 1
+        return result
+
+    def binary(self, node):
+        op = node.op
+        left, right = node.left, node.right
+        a, b = constant(left), constant(right)
+        if a is not None and b is not None:
+            value = fold(op, a, b)
+            if value is not None:
+                return self.number(value, node)
+            return node
+
+        # Identities
+        if b is not None:
+            if ((b == 0 and op in ('+', '-', '|', '^', '<<', '>>')) or (b == 1 and op in ('*', '/'))
+                    or (b == -1 and op == '&')) and self.is_int(left):
+                return self.simplified(left)
+            if b == 0 and op in ('*', '&') and is_pure(left):
+                return self.number(0, node)
+        if a is not None:
+            if ((a == 0 and op in ('+', '|', '^')) or (a == 1 and op == '*') or (a == -1 and op == '&')) \
+                    and self.is_int(right):
+                return self.simplified(right)
+            if a == 0 and op in ('*', '&', '<<', '>>') and is_pure(right):
+                return self.number(0, node)
+        if self.level < 2:
+            return node
+
+        # Strength reduction
+        if op == '*':
+            shift = power_of_two(b)
+            if shift is not None:
+                return self.simplified(BinaryNode('<<', left, NumberNode(shift), node.start, node.end))
+            shift = power_of_two(a)
+            if shift is not None:
+                return self.simplified(BinaryNode('<<', right, NumberNode(shift), node.start, node.end))
+        elif op == '/' and left.kind == IdentifierNode.kind:
+            shift = power_of_two(b)
+            if shift is not None:
+                # An arithmetic shift rounds down; add 2**k - 1 to negative
+                # dividends first so the quotient truncates toward zero
+                bias = BinaryNode('&', BinaryNode('>>', left, NumberNode(63)), NumberNode(b - 1))
+                return self.simplified(BinaryNode('>>', BinaryNode('+', left, bias), NumberNode(shift),
+                                                  node.start, node.end))
+        return node
+
+    def unary(self, node):
+        operand = node.right
+        value = constant(operand)
+        if value is not None:
+            if node.op == '-':
+                return self.number(wrap(-value), node)
+            if node.op == '!':
+                return self.number(int(value == 0), node)
+        if node.op == '!' and operand.kind == UnaryNode.kind and operand.op == '!' and is_boolean(operand.right):
+            return self.simplified(operand.right)
+        if node.op == '-' and operand.kind == UnaryNode.kind and operand.op == '-' and self.is_int(operand.right):
+            return self.simplified(operand.right)
+        return node
@@ -0,0 +1,124 @@
+"""
+Profiling support for the Dakshin compiler
+Runs a compilation under cProfile and summarizes where the time went
+"""
+
+import os
+import pstats
+import cProfile
+
+from Lexer import Lexer
+from Error import ErrorHandler
+from compiler import compile_source
+from optimizer import DEFAULT_LEVEL
+
+# Source file of a function -> compiler phase it belongs to
+PHASES = {
+    'Lexer.py': 'lexer',
+    'Tokens.py': 'lexer',
+    'File.py': 'lexer',
+    'ParsingTable.py': 'lexer',
+    'Parser.py': 'parser',
+    'ASTToken.py': 'parser',
+    'arena.py': 'parser',
+    'optimizer.py': 'optimizer',
+    'code_generator.py': 'codegen',
+    'regalloc.py': 'codegen',
+    'emitter.py': 'codegen',
+    'runtime.py': 'codegen',
+    'standard_library.py': 'codegen',
+    'cache.py': 'cache',
+    'ast_binary.py': 'cache',
+}
+PHASE_ORDER = ('lexer', 'parser', 'optimizer', 'codegen', 'cache', 'other')
+
+def phase_of(function):
+    """Compiler phase of a pstats function key (file, line, name)."""
+    return PHASES.get(os.path.basename(function[0]), 'other')
+
+def label(function):
+    """Readable name for a pstats function key, e.g. 'Parser.py:parse_expression'."""
+    file_name, line, name = function
+    if file_name == '~':
+        return name  # Built-in, e.g. <method 'append' of 'list' objects>
+    return f"{os.path.basename(file_name)}:{name}"
+
+def collapsed_stacks(stats, min_seconds=1e-6, max_depth=96):
+    """
+    Approximate collapsed stacks ('a;b;c <microseconds>' lines) from cProfile data.
+
+    cProfile only keeps caller/callee edges, so each function's self time is
+    spread over the paths leading to it in proportion to the cumulative time
+    of every edge on the path. Recursive edges are cut at the first repeat.
+    """
+    entries = stats.stats
+    callees = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((function, edge[3]))
+
+    totals = {}
+    def walk(function, path, cumulative):
+        _, _, self_time, total_time, _ = entries[function]
+        share = cumulative / total_time if total_time else 0.0
+        key = ';'.join(path)
+        totals[key] = totals.get(key, 0.0) + self_time * share
+        if len(path) >= max_depth:
+            return
+        for callee, edge_time in callees.get(function, ()):
+            if callee in entries and label(callee) not in path:
+                child_time = edge_time * share
+                if child_time >= min_seconds:
+                    walk(callee, path + [label(callee)], child_time)
+
+    for function, (_, _, _, total_time, callers) in entries.items():
+        if not callers:
+            walk(function, [label(function)], total_time)
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(totals.items())
+            if round(seconds * 1e6) > 0]
+
+def summarize(stats, top=15):
+    """Print self time per phase and the top functions of each phase."""
+    by_phase = {}
+    for function, (calls, _, self_time, total_time, _) in stats.stats.items():
+        by_phase.setdefault(phase_of(function), []).append((self_time, total_time, calls, function))
+    overall = sum(entry[0] for entries in by_phase.values() for entry in entries) or 1.0
+
+    for phase in PHASE_ORDER:
+        entries = sorted(by_phase.get(phase, []), reverse=True)
+        phase_time = sum(entry[0] for entry in entries)
+        print(f"\n{phase}: {phase_time * 1000:.2f} ms self time ({phase_time / overall * 100:.1f}%)")
+        for self_time, total_time, calls, function in entries[:top]:
+            print(f"  {self_time * 1000:9.2f} ms self {total_time * 1000:9.2f} ms cumulative"
+                  f" {calls:8} calls  {label(function)}")
+
+def profile_compile(file_path, output_file, top=15, stream=False, mmap=False, arena=False, link_runtime=False,
+                    opt_level=DEFAULT_LEVEL):
+    """Compile a file under cProfile, write <output>.prof and <output>.collapsed, and print a summary.
+
+    The compile options are those of compile_source, so the profiled run
+    writes the same assembly as an unprofiled one.
+    """
+    lexer = Lexer(ErrorHandler())
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        _, assembly_code, _ = compile_source(file_path, lexer, stream=stream, mmap=mmap, log=None, arena=arena,
+                                             link_runtime=link_runtime, opt_level=opt_level)
+    finally:
+        profile.disable()
+
+    with open(output_file, 'w') as f:
+        f.write(assembly_code)
+    base = os.path.splitext(output_file)[0]
+    profile.dump_stats(base + '.prof')
+    stats = pstats.Stats(profile)
+    with open(base + '.collapsed', 'w') as f:
+        f.write('\n'.join(collapsed_stacks(stats)) + '\n')
+
+    print(f"Profiled compilation of {file_path}")
+    print(f"• Assembly: {output_file}")
+    print(f"• cProfile data: {base}.prof")
+    print(f"• Collapsed stacks (flamegraph.pl / speedscope): {base}.collapsed")
+    summarize(stats, top)
+    return assembly_code
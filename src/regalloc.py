@@ -0,0 +1,217 @@
+"""
+Register allocation for Dakshin expressions
+
+Arithmetic, bitwise and comparison trees are compiled into scratch
+registers instead of the push/pop stack machine. An expression is first
+turned into a Tree, labelled bottom-up with the number of registers it
+needs (Sethi-Ullman numbering); the needier operand of a binary node is
+then evaluated first, so a tree with n leaves never needs more than
+log2(n) + 1 registers. When the free registers run out, one in use is
+pushed, borrowed for the subtree and popped afterwards.
+
+Right operands that are integer constants or local variables are used
+directly as immediates or memory operands and need no register.
+
+Anything else inside an expression (calls, member access, assignments,
+the operators this module does not handle) is an opaque leaf evaluated by
+the code generator into rax. Such leaves may clobber every scratch
+register, so the registers holding live values are pushed around them,
+and subtrees containing them are evaluated strictly left to right to keep
+side effects in order.
+
+Only rax, rbx, r10 and r11 hold values: rcx, rdx, r8 and r9 may hold
+arguments of an enclosing call. Division needs rdx and a variable shift
+count needs cl, so those save and restore rdx or rcx around the one
+instruction. rbx is callee-saved under the Windows x64 ABI, but the
+generated functions already use it as the stack machine's scratch
+register without preserving it; r12-r15, rsi and rdi are left alone.
+"""
+
+from ASTToken import BinaryNode, UnaryNode, NumberNode, IdentifierNode, StringNode
+
+SCRATCH_REGISTERS = ('rax', 'rbx', 'r10', 'r11')  # rax first: results end up there
+LOW_BYTES = {'rax': 'al', 'rbx': 'bl', 'r10': 'r10b', 'r11': 'r11b'}
+
+ARITHMETIC = {'+': 'add', '-': 'sub', '*': 'imul', '&': 'and', '|': 'or', '^': 'xor'}
+COMPARISONS = {'==': 'sete', '!=': 'setne', '<': 'setl', '>': 'setg', '<=': 'setle', '>=': 'setge'}
+SHIFTS = {'<<': 'shl', '>>': 'sar'}
+REGISTER_OPERATORS = frozenset(ARITHMETIC) | frozenset(COMPARISONS) | frozenset(SHIFTS) | {'/'}
+
+IMM32 = range(-2 ** 31, 2 ** 31)
+
+class Tree:
+    """An expression node labelled for allocation."""
+    __slots__ = ('node', 'op', 'left', 'right', 'need', 'pure', 'direct')
+
+    def __init__(self, node, op=None, left=None, right=None, need=1, pure=True):
+        self.node = node
+        self.op = op          # Operator of a binary or unary node, None for leaves
+        self.left = left
+        self.right = right    # Operand of a unary node
+        self.need = need      # Registers needed to evaluate without spilling
+        self.pure = pure      # No calls or other opaque code below
+        self.direct = False   # Used as an immediate or memory operand
+
+class ExpressionAllocator:
+    """Emits expression code for an AssemblyGenerator using scratch registers."""
+    def __init__(self, generator):
+        self.generator = generator
+
+    def generate(self, node):
+        """Emit code leaving the value of node in rax."""
+        self.emit(self.label(node), list(SCRATCH_REGISTERS))
+
+    def label(self, node):
+        """Build the Tree for node with its register needs."""
+        kind = node.kind
+        if kind == BinaryNode.kind and node.op in REGISTER_OPERATORS:
+            left = self.label(node.left)
+            right = self.label(node.right)
+            tree = Tree(node, node.op, left, right, pure=left.pure and right.pure)
+            if self.is_direct(node.op, node.right):
+                right.direct = True
+                tree.need = left.need
+            elif not tree.pure:
+                # Evaluated left to right: the left value is held while the right is computed
+                tree.need = max(left.need, right.need + 1)
+            elif left.need == right.need:
+                tree.need = left.need + 1
+            else:
+                tree.need = max(left.need, right.need)
+            return tree
+        if kind == UnaryNode.kind:
+            operand = self.label(node.right)
+            return Tree(node, node.op, right=operand, need=operand.need, pure=operand.pure)
+        if kind in (NumberNode.kind, IdentifierNode.kind, StringNode.kind):
+            return Tree(node)
+        return Tree(node, pure=False)
+
+    def is_direct(self, op, node):
+        """Whether node can be the right operand of op without a register."""
+        if node.kind == NumberNode.kind:
+            value = node.value
+            if type(value) is not int or op == '/':
+                return False
+            if op in SHIFTS:
+                return 0 <= value < 64
+            return value in IMM32
+        if node.kind == IdentifierNode.kind:
+            return self.local_location(node.value) is not None
+        return False
+
+    def local_location(self, name):
+        generator = self.generator
+        if name in generator.local_vars:
+            return generator.local_vars[name]
+        return generator.current_locals.get(name)
+
+    def operand(self, tree):
+        """Assembly operand for a direct tree."""
+        node = tree.node
+        if node.kind == NumberNode.kind:
+            return str(node.value)
+        return self.local_location(node.value)
+
+    def emit(self, tree, registers):
+        """Emit code leaving the value of tree in registers[0], using only the given registers."""
+        text = self.generator.text_section
+        target = registers[0]
+        if tree.op is None:
+            self.emit_leaf(tree, registers)
+        elif tree.left is None:
+            self.emit(tree.right, registers)
+            if tree.op == '-':
+                text.append(f"    neg {target}")
+            elif tree.op == '!':
+                text.extend([
+                    f"    test {target}, {target}",
+                    f"    setz {LOW_BYTES[target]}",
+                    f"    movzx {target}, {LOW_BYTES[target]}"
+                ])
+        elif tree.right.direct:
+            self.emit(tree.left, registers)
+            self.emit_operation(tree.op, target, self.operand(tree.right), registers)
+        elif len(registers) < 2:
+            # Out of registers: spill one that holds a live value and borrow it
+            spare = next(r for r in SCRATCH_REGISTERS if r not in registers)
+            text.append(f"    push {spare}    ; Spill")
+            self.emit(tree, registers + [spare])
+            text.append(f"    pop {spare}     ; Reload")
+        elif tree.pure and tree.right.need > tree.left.need:
+            # Sethi-Ullman order: the needier right operand first, into the second register
+            self.emit(tree.right, [registers[1], target] + registers[2:])
+            self.emit(tree.left, [target] + registers[2:])
+            self.emit_operation(tree.op, target, registers[1], registers)
+        else:
+            self.emit(tree.left, registers)
+            self.emit(tree.right, registers[1:])
+            self.emit_operation(tree.op, target, registers[1], registers)
+
+    def emit_leaf(self, tree, registers):
+        generator = self.generator
+        text = generator.text_section
+        node = tree.node
+        target = registers[0]
+        if tree.pure:
+            if node.kind == NumberNode.kind:
+                text.append(f"    mov {target}, {node.value}")
+            elif node.kind == StringNode.kind:
+                text.append(f"    mov {target}, {generator.create_string_literal(node.value)}")
+            else:
+                location = self.local_location(node.value)
+                text.append(f"    mov {target}, {location if location is not None else node.value}")
+            return
+        # Opaque code computes into rax and may clobber every scratch register
+        live = [r for r in SCRATCH_REGISTERS if r not in registers]
+        for register in live:
+            text.append(f"    push {register}    ; Save across call")
+        generator.generate_expression(node)
+        if target != 'rax':
+            text.append(f"    mov {target}, rax")
+        for register in reversed(live):
+            text.append(f"    pop {register}")
+
+    def emit_operation(self, op, target, source, registers):
+        """Emit target = target op source; source is a register, immediate or memory operand."""
+        text = self.generator.text_section
+        if op in ARITHMETIC:
+            text.append(f"    {ARITHMETIC[op]} {target}, {source}")
+        elif op in COMPARISONS:
+            low = LOW_BYTES[target]
+            text.extend([
+                f"    cmp {target}, {source}",
+                f"    {COMPARISONS[op]} {low}",
+                f"    movzx {target}, {low}"
+            ])
+        elif op in SHIFTS:
+            if source[0].isdigit():
+                text.append(f"    {SHIFTS[op]} {target}, {source}")
+            else:
+                text.extend([
+                    "    push rcx    ; rcx may hold a call argument",
+                    f"    mov rcx, {source}    ; Shift count in cl",
+                    f"    {SHIFTS[op]} {target}, cl",
+                    "    pop rcx"
+                ])
+        elif source.startswith('['):
+            self.emit_division(target, f"qword {source}", registers)
+        else:
+            self.emit_division(target, source, registers)
+
+    def emit_division(self, target, divisor, registers):
+        """Signed division of target by divisor, which idiv needs as rdx:rax / divisor."""
+        text = self.generator.text_section
+        text.append("    push rdx    ; rdx may hold a call argument")
+        if target == 'rax':
+            text.extend(["    cqo", f"    idiv {divisor}"])
+        elif divisor == 'rax':
+            # The divisor is dead afterwards, so swapping frees rax for the dividend
+            text.extend([f"    xchg rax, {target}", "    cqo", f"    idiv {target}", f"    mov {target}, rax"])
+        else:
+            rax_live = 'rax' not in registers
+            if rax_live:
+                text.append("    push rax")
+            text.extend([f"    mov rax, {target}", "    cqo", f"    idiv {divisor}", f"    mov {target}, rax"])
+            if rax_live:
+                text.append("    pop rax")
+        text.append("    pop rdx")
@@ -0,0 +1,668 @@
+"""
+Runtime library of the Dakshin code generator
+
+Built-in functions compile to calls to small dakshin_* routines, which in
+turn call the C runtime and the Windows API. ROUTINES holds the NASM
+source of each routine and EXTERNS the external functions any of them or
+the generated code may call. A program only gets the routines it calls
+and the externs that those routines and its own code use: runtime_for()
+follows call targets from the program's code through the routines.
+
+For multi-module builds the runtime can instead be built once as a
+module of its own ('dakshin.py runtime', see runtime_module()) and the
+programs compiled with link_runtime=True, so that they only declare the
+dakshin_* routines they call as externs.
+"""
+
+import os
+import re
+import sys
+import shutil
+import subprocess
+
+# External C runtime and Windows API functions, in the order they are declared
+EXTERNS = (
+    'printf', 'scanf', 'sscanf', 'fopen', 'fclose', 'fread', 'fwrite', 'fgets', 'fputs',
+    'malloc', 'free', 'strlen', 'strcmp', 'strcpy', 'strcat', 'exit', 'system',
+    '_sleep', 'getenv', '_putenv', 'abs', 'pow', 'sqrt', 'sin', 'cos', 'tan', 'log',
+    'exp', 'rand', 'srand',
+    # GUI Functions (Windows API)
+    'MessageBoxA', 'Beep', 'OpenClipboard', 'CloseClipboard', 'GetClipboardData',
+    'GlobalLock', 'GlobalUnlock',
+)
+
+# Data the routines use, defined as in the program's own data section
+DATA = (
+    "    input_buffer times 4096 db 0",
+    "    newline db 13, 10, 0      ; Windows CRLF",
+    "    fmt_int db '%d', 0",
+    "    fmt_string db '%s', 0",
+    "    input_fmt_int db '%d', 0",
+    "    input_fmt_float db '%f', 0",
+    "    input_fmt_string db '%s', 0",
+    "    alert_title db 'Alert', 0",
+    "    confirm_title db 'Confirm', 0",
+)
+
+# Routine name -> source lines, a comment and the label first
+ROUTINES = {
+    # === STANDARD I/O ===
+    'dakshin_print': [
+        "; print(value) - Print value to stdout",
+        "dakshin_print:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Windows x64 calling convention",
+        "    sub rsp, 32    ; Shadow space (required for Windows x64)",
+        "    ; rcx contains the value to print (Windows convention)",
+        "    mov rdx, rcx   ; Move value to second parameter (Windows convention)",
+        "    mov rcx, fmt_string  ; Format string in first parameter",
+        "    xor rax, rax   ; No vector registers used",
+        "    call printf",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_print_int': [
+        "; print_int(value) - Print integer value to stdout",
+        "dakshin_print_int:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Windows x64 calling convention",
+        "    sub rsp, 32    ; Shadow space (required for Windows x64)",
+        "    ; rcx contains the integer value to print (Windows convention)",
+        "    mov rdx, rcx   ; Move integer to second parameter (Windows convention)",
+        "    mov rcx, fmt_int  ; Integer format string in first parameter",
+        "    xor rax, rax   ; No vector registers used",
+        "    call printf",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_println': [
+        "; println(value) - Print value with newline",
+        "dakshin_println:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Windows x64 calling convention",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains the value to print",
+        "    mov rdx, rcx   ; Move value to second parameter",
+        "    mov rcx, fmt_string  ; Format string in first parameter",
+        "    xor rax, rax   ; No vector registers used",
+        "    call printf",
+        "    ; Print newline",
+        "    mov rcx, newline   ; Newline string in first parameter",
+        "    xor rax, rax",
+        "    call printf",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_input': [
+        "; input(prompt) - Read input from stdin",
+        "dakshin_input:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Windows x64 calling convention",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains prompt string",
+        "    test rcx, rcx",
+        "    jz skip_prompt",
+        "    ; Print prompt",
+        "    mov rdx, rcx",
+        "    mov rcx, fmt_string",
+        "    xor rax, rax",
+        "    call printf",
+        "skip_prompt:",
+        "    ; Read input",
+        "    mov rcx, input_fmt_string",
+        "    mov rdx, input_buffer",
+        "    xor rax, rax",
+        "    call scanf",
+        "    ; Return buffer address",
+        "    mov rax, input_buffer",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+
+    # === FILE I/O ===
+    'dakshin_open': [
+        "; open(filename, mode) - Open file",
+        "dakshin_open:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = filename, rdx = mode",
+        "    call fopen",
+        "    ; Return file pointer in rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_close': [
+        "; close(file) - Close file",
+        "dakshin_close:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = file pointer",
+        "    call fclose",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_read': [
+        "; read(file) - Read from file",
+        "dakshin_read:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 48",
+        "    ; Save file pointer",
+        "    mov [rbp-8], rcx",
+        "    ; Allocate buffer for reading",
+        "    mov rcx, 4096",
+        "    call malloc",
+        "    mov [rbp-16], rax    ; Store buffer pointer",
+        "    ; Read from file",
+        "    mov rcx, rax        ; buffer",
+        "    mov rdx, 1          ; size of each element",
+        "    mov r8, 4095        ; number of elements",
+        "    mov r9, [rbp-8]     ; file pointer",
+        "    call fread",
+        "    ; Null terminate",
+        "    mov rbx, [rbp-16]",
+        "    mov byte [rbx+rax], 0",
+        "    ; Return buffer",
+        "    mov rax, [rbp-16]",
+        "    add rsp, 48",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_write': [
+        "; write(file, data) - Write to file",
+        "dakshin_write:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 48    ; Shadow space + local vars",
+        "    ; rcx = file, rdx = data",
+        "    mov [rbp-8], rcx    ; Save file pointer",
+        "    mov [rbp-16], rdx   ; Save data pointer",
+        "    mov rcx, rdx        ; data to get length",
+        "    call strlen",
+        "    mov r8, rax         ; length",
+        "    mov rcx, [rbp-16]   ; data",
+        "    mov rdx, 1          ; size",
+        "    ; r8 already has length",
+        "    mov r9, [rbp-8]     ; file",
+        "    call fwrite",
+        "    add rsp, 48    ; Clean up",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+
+    # === STRING ===
+    'dakshin_strlen': [
+        "; strlen(str) - Get string length",
+        "dakshin_strlen:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Windows x64 calling convention",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains string pointer",
+        "    call strlen",
+        "    ; Result already in rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_length': [
+        "; length(str) - Alias for strlen",
+        "dakshin_length:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Windows x64 calling convention",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains string pointer",
+        "    call strlen",
+        "    ; Result already in rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+        "    ret",
+    ],
+    'dakshin_strcmp': [
+        "; strcmp(str1, str2) - Compare strings",
+        "dakshin_strcmp:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = str1, rdx = str2 (Windows calling convention)",
+        "    call strcmp",
+        "    ; Result already in rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_strcpy': [
+        "; strcpy(dest, src) - Copy string",
+        "dakshin_strcpy:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = dest, rdx = src (Windows calling convention)",
+        "    call strcpy",
+        "    ; Result already in rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_strcat': [
+        "; strcat(str1, str2) - Concatenate strings",
+        "dakshin_strcat:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = str1, rdx = str2 (Windows calling convention)",
+        "    call strcat",
+        "    ; Result already in rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+
+    # === MATH ===
+    'dakshin_abs': [
+        "; abs(value) - Absolute value",
+        "dakshin_abs:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains value (Windows calling convention)",
+        "    mov rax, rcx",
+        "    test rax, rax",
+        "    jns abs_positive",
+        "    neg rax",
+        "abs_positive:",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_min': [
+        "; min(a, b) - Minimum of two values",
+        "dakshin_min:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = a, rdx = b (Windows calling convention)",
+        "    cmp rcx, rdx",
+        "    jle min_first",
+        "    mov rax, rdx",
+        "    jmp min_end",
+        "min_first:",
+        "    mov rax, rcx",
+        "min_end:",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_max': [
+        "; max(a, b) - Maximum of two values",
+        "dakshin_max:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = a, rdx = b (Windows calling convention)",
+        "    cmp rcx, rdx",
+        "    jge max_first",
+        "    mov rax, rdx",
+        "    jmp max_end",
+        "max_first:",
+        "    mov rax, rcx",
+        "max_end:",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+
+    # === MEMORY ===
+    'dakshin_malloc': [
+        "; malloc(size) - Allocate memory",
+        "dakshin_malloc:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains size (Windows calling convention)",
+        "    call malloc",
+        "    ; Result already in rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_free': [
+        "; free(ptr) - Free memory",
+        "dakshin_free:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains pointer (Windows calling convention)",
+        "    call free",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+
+    # === SYSTEM ===
+    'dakshin_exit': [
+        "; exit(code) - Exit program",
+        "dakshin_exit:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx contains exit code (Windows calling convention)",
+        "    call exit",
+        "    ; Should not return",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_system': [
+        "; system(command) - Execute system command",
+        "dakshin_system:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Windows calling convention for system()",
+        "    sub rsp, 32    ; Shadow space for Windows x64 calling convention",
+        "    ; rcx contains command string",
+        "    ; rcx already has command - no need to move",
+        "    call system",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    ; Result already in rax",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_time': [
+        "; time() - Get current time (stub implementation)",
+        "dakshin_time:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    ; Return a fixed timestamp for now to avoid corruption",
+        "    mov rax, 1640995200  ; Fixed timestamp (Jan 1, 2022)",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+
+    # === TYPE CONVERSION ===
+    'dakshin_toint': [
+        "; toint(str) - Convert string to integer",
+        "dakshin_toint:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 48    ; Shadow space + local storage",
+        "    ; rcx contains string (Windows calling convention)",
+        "    mov rdx, input_fmt_int   ; Format string",
+        "    lea r8, [rbp-8]    ; Address for result",
+        "    call sscanf",
+        "    mov rax, [rbp-8]  ; Get converted value",
+        "    add rsp, 48    ; Clean up",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_tofloat': [
+        "; tofloat(str) - Convert string to float",
+        "dakshin_tofloat:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 48    ; Shadow space + local storage",
+        "    ; rcx contains string (Windows calling convention)",
+        "    lea rdx, [rbp-8]    ; Address for result",
+        "    mov r8, input_fmt_float   ; Format string",
+        "    call sscanf",
+        "    movq rax, xmm0  ; Get float result",
+        "    add rsp, 48    ; Clean up",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+
+    # === GUI (Windows API) ===
+    'dakshin_msgbox': [
+        "; msgbox(message, title) - Show message box",
+        "dakshin_msgbox:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = message, rdx = title (Windows calling convention)",
+        "    mov r9, 0      ; MB_OK type",
+        "    mov r8, rdx    ; Title (if provided, otherwise use default)",
+        "    test r8, r8",
+        "    jnz msgbox_with_title",
+        "    mov r8, alert_title  ; Use default title",
+        "msgbox_with_title:",
+        "    mov rdx, rcx   ; Message",
+        "    mov rcx, 0     ; No parent window",
+        "    call MessageBoxA",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    ; Result already in rax",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_alert': [
+        "; alert(message) - Simple alert dialog",
+        "dakshin_alert:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = message (Windows calling convention)",
+        "    ; Show message box with default title",
+        "    mov r9, 0      ; MB_OK type",
+        "    mov r8, alert_title  ; Default title",
+        "    mov rdx, rcx   ; Message",
+        "    mov rcx, 0     ; No parent window",
+        "    call MessageBoxA",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_confirm': [
+        "; confirm(message) - Yes/No confirmation dialog",
+        "dakshin_confirm:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = message (Windows calling convention)",
+        "    ; Show Yes/No message box",
+        "    mov r9, 4      ; MB_YESNO type",
+        "    mov r8, confirm_title  ; Default title",
+        "    mov rdx, rcx   ; Message",
+        "    mov rcx, 0     ; No parent window",
+        "    call MessageBoxA",
+        "    ; Convert result: IDYES=6 -> 1, IDNO=7 -> 0",
+        "    cmp rax, 6",
+        "    sete al        ; Set al to 1 if equal to IDYES",
+        "    movzx rax, al  ; Zero extend to rax",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_beep': [
+        "; beep(frequency, duration) - System beep",
+        "dakshin_beep:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; rcx = frequency, rdx = duration (Windows calling convention)",
+        "    ; If no parameters provided, use defaults",
+        "    test rcx, rcx",
+        "    jnz beep_with_freq",
+        "    mov rcx, 1000  ; Default frequency",
+        "beep_with_freq:",
+        "    test rdx, rdx",
+        "    jnz beep_call",
+        "    mov rdx, 500   ; Default duration",
+        "beep_call:",
+        "    call Beep",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+    'dakshin_getclipboard': [
+        "; getclipboard() - Get clipboard text",
+        "dakshin_getclipboard:",
+        "    push rbp",
+        "    mov rbp, rsp",
+        "    sub rsp, 32    ; Shadow space",
+        "    ; Open clipboard",
+        "    mov rcx, 0     ; No window handle",
+        "    call OpenClipboard",
+        "    test rax, rax",
+        "    jz clipboard_error",
+        "    ; Get clipboard data",
+        "    mov rcx, 1     ; CF_TEXT format",
+        "    call GetClipboardData",
+        "    mov rbx, rax   ; Save handle",
+        "    test rax, rax",
+        "    jz close_clipboard",
+        "    ; Lock global memory",
+        "    mov rcx, rbx",
+        "    call GlobalLock",
+        "    ; Copy to our buffer (simplified - should allocate proper buffer)",
+        "    mov rbx, rax   ; Text pointer",
+        "    ; Unlock and close",
+        "    mov rcx, rbx",
+        "    call GlobalUnlock",
+        "close_clipboard:",
+        "    call CloseClipboard",
+        "    mov rax, rbx   ; Return text pointer",
+        "    jmp clipboard_end",
+        "clipboard_error:",
+        "    mov rax, 0     ; Return null on error",
+        "clipboard_end:",
+        "    add rsp, 32    ; Clean up shadow space",
+        "    mov rsp, rbp",
+        "    pop rbp",
+        "    ret",
+    ],
+}
+
+# Unanchored so the scan is a fast literal search; a stray match in a
+# comment can only pull in an extra routine, never drop a needed one
+CALL_TARGET = re.compile(r'call[ \t]+([\w.?$@#~]+)')
+
+def call_targets(text):
+    """Names of the labels called directly in NASM source (a superset, see CALL_TARGET)."""
+    return set(CALL_TARGET.findall(text))
+
+ROUTINE_CALLS = {name: call_targets('\n'.join(lines)) for name, lines in ROUTINES.items()}
+
+def runtime_for(calls, linked=False):
+    """(routines, externs) needed by code calling calls, each in declaration order.
+
+    With linked=True the routines come from the runtime module, so they
+    are not followed and only the externs called directly are returned.
+    """
+    if linked:
+        return ([name for name in ROUTINES if name in calls],
+                [name for name in EXTERNS if name in calls])
+    needed = set()
+    pending = [name for name in calls if name in ROUTINES]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(target for target in ROUTINE_CALLS[name] if target in ROUTINES)
+    targets = set(calls).union(*(ROUTINE_CALLS[name] for name in needed))
+    routines = [name for name in ROUTINES if name in needed]
+    externs = [name for name in EXTERNS if name in targets]
+    return routines, externs
+
+def runtime_module():
+    """Source lines of the standalone runtime module, exporting every routine."""
+    _, externs = runtime_for(ROUTINES)
+    lines = [
+        "; NASM 64-bit runtime library for Dakshin Programming Language (Windows)",
+        "bits 64",
+        "default rel",
+        "",
+        "section .data",
+        *DATA,
+        "",
+        "section .text",
+        "    default rel",
+        "",
+        "    ; Runtime routines, declared extern by programs compiled with --link-runtime",
+        *(f"    global {name}" for name in ROUTINES),
+        "",
+        "    ; External C runtime functions (Windows)",
+        *(f"    extern {name}" for name in externs),
+        "",
+    ]
+    for routine in ROUTINES.values():
+        lines.extend(routine)
+        lines.append("")
+    return lines
+
+def write_runtime(output_file, nasm_format='win64'):
+    """Write the runtime module to output_file; a .o or .obj file is assembled with NASM."""
+    base_name, extension = os.path.splitext(output_file)
+    asm_file = base_name + '.asm' if extension in ('.o', '.obj') else output_file
+    os.makedirs(os.path.dirname(asm_file) or '.', exist_ok=True)
+    with open(asm_file, 'w') as f:
+        f.write('\n'.join(runtime_module()))
+    if asm_file == output_file:
+        return
+    nasm = shutil.which(os.environ.get('NASM', 'nasm'))
+    if nasm is None:
+        raise OSError(f"NASM not found; {asm_file} was written but not assembled")
+    subprocess.run([nasm, '-f', nasm_format, asm_file, '-o', output_file], check=True)
+
+def main(argv, default_out_dir='out'):
+    """Entry point for 'dakshin.py runtime [-o file.asm|file.o|file.obj] [-f nasm_format]'."""
+    output_file = os.path.join(default_out_dir, 'dakshin_runtime.asm')
+    nasm_format = 'win64'
+    args = iter(argv)
+    for arg in args:
+        if arg == '-o':
+            output_file = next(args, output_file)
+        elif arg == '-f':
+            nasm_format = next(args, nasm_format)
+        else:
+            print("Usage: python dakshin.py runtime [-o file.asm|file.o|file.obj] [-f nasm_format]")
+            return 2
+    try:
+        write_runtime(output_file, nasm_format)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Runtime build failed: {e}")
+        return 1
+    print(f"Runtime written to: {output_file}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,190 @@
+"""
+Compile server for Dakshin
+A long-running daemon that keeps the compiler warm, and the thin client used to talk to it
+"""
+
+import os
+import io
+import sys
+import json
+import stat
+import socket
+import tempfile
+import contextlib
+
+# Requests and replies are single JSON objects, one per line:
+#   {"path": "/abs/file.dn", "link_runtime": false, "opt_level": 1}
+#                                       -> {"ok": true, "assembly": "...", "cached": false, "stats": {...}, "log": ""}
+#   {"command": "stats"}                -> {"ok": true, "compiles": 3, "hits": 1, "entries": 2}
+#   {"command": "shutdown"}             -> {"ok": true}
+
+SOCKET_NAME = 'dakshin.sock'
+
+def private_directory():
+    """A directory only this user can use, created under the temp directory if needed."""
+    uid = os.getuid() if hasattr(os, 'getuid') else None
+    directory = os.path.join(tempfile.gettempdir(), f"dakshin-{uid if uid is not None else 0}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if uid is not None and (not stat.S_ISDIR(info.st_mode) or info.st_uid != uid or info.st_mode & 0o077):
+        raise OSError(f"{directory} is not a private directory owned by this user")
+    return directory
+
+def default_socket_path():
+    """$DAKSHIN_SOCKET, else the socket in $XDG_RUNTIME_DIR, else in a private per-user directory."""
+    if os.environ.get('DAKSHIN_SOCKET'):
+        return os.environ['DAKSHIN_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    return os.path.join(private_directory(), SOCKET_NAME)
+
+def is_stale(socket_path):
+    """Whether socket_path is left over from a server that is gone (nothing accepts connections on it)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            return True
+        except OSError:
+            return False
+    return False
+
+def serve(socket_path=None):
+    """Run the compile server until a shutdown request arrives; return False if it could not start."""
+    import socketserver
+    from Lexer import Lexer
+    from Error import ErrorHandler
+    from compiler import compile_source
+    from cache import MemoryCache
+    from optimizer import DEFAULT_LEVEL, LEVELS
+    from standard_library import StandardLibrary
+
+    # Everything that is expensive to build is built once here
+    lexer = Lexer(ErrorHandler())
+    stdlib = StandardLibrary()
+    cache = MemoryCache()
+    counters = {"compiles": 0, "hits": 0}
+
+    def handle(request):
+        command = request.get("command")
+        if command == "stats":
+            return {"ok": True, "entries": len(cache.entries), **counters}
+        if command == "shutdown":
+            return {"ok": True}
+
+        opt_level = request.get("opt_level", DEFAULT_LEVEL)
+        if opt_level not in LEVELS:
+            return {"ok": False, "log": f"Unknown optimization level: {opt_level}\n"}
+        lexer.error_handler.clear()
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            try:
+                _, assembly_code, stats = compile_source(request["path"], lexer, cache, log=None, stdlib=stdlib,
+                                                         link_runtime=bool(request.get("link_runtime")),
+                                                         opt_level=opt_level)
+            except Exception as e:
+                print(f"Compilation failed: {type(e).__name__}: {e}")
+                return {"ok": False, "log": log.getvalue()}
+        counters["compiles"] += 1
+        counters["hits"] += stats.cached
+        return {
+            "ok": not lexer.error_handler.has_errors(),
+            "assembly": assembly_code,
+            "cached": stats.cached,
+            "stats": stats.to_dict(),
+            "log": log.getvalue(),
+        }
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"ok": False, "log": "Malformed request"}
+                    request = {}
+                else:
+                    reply = handle(request)
+                self.wfile.write(json.dumps(reply).encode() + b'\n')
+                self.wfile.flush()
+                if request.get("command") == "shutdown":
+                    # shutdown() waits for serve_forever, so it must run on another thread
+                    import threading
+                    threading.Thread(target=self.server.shutdown).start()
+                    return
+
+    if socket_path is None:
+        socket_path = default_socket_path()
+    if os.path.exists(socket_path):
+        if not is_stale(socket_path):
+            print(f"{socket_path} is in use; is a compile server already running?")
+            return False
+        os.remove(socket_path)  # Stale socket from a previous run
+    with socketserver.UnixStreamServer(socket_path, Handler) as server:
+        print(f"Dakshin compile server listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+    print("Dakshin compile server stopped")
+    return True
+
+def request(message, socket_path=None):
+    """Send one request to the server and return its reply (raises OSError if it is not running)."""
+    if socket_path is None:
+        socket_path = default_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(message).encode() + b'\n')
+        reply = b''
+        while not reply.endswith(b'\n'):
+            chunk = client.recv(1 << 16)
+            if not chunk:
+                break
+            reply += chunk
+    return json.loads(reply)
+
+def compile_remote(source_file, output_file, socket_path=None, link_runtime=False, opt_level=None):
+    """Compile a file on the server and write the assembly; return True on success."""
+    message = {"path": os.path.abspath(source_file), "link_runtime": link_runtime}
+    if opt_level is not None:
+        message["opt_level"] = opt_level
+    reply = request(message, socket_path)
+    if reply.get("log"):
+        print(reply["log"], end='')
+    if "assembly" in reply:
+        with open(output_file, 'w') as f:
+            f.write(reply["assembly"])
+        print(f"✅ Assembly written to: {output_file}" + (" (cached)" if reply.get("cached") else ""))
+    return reply["ok"]
+
+def main(argv):
+    """Entry point for 'dakshin.py serve [--socket PATH] [--stop|--stats]'."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("The compile server needs Unix domain sockets, which this platform does not support")
+        return 1
+    try:
+        socket_path = argv[argv.index('--socket') + 1] if '--socket' in argv else default_socket_path()
+    except OSError as e:
+        print(f"No usable socket path: {e}")
+        return 1
+
+    if '--stop' in argv or '--stats' in argv:
+        try:
+            reply = request({"command": "shutdown" if '--stop' in argv else "stats"}, socket_path)
+        except OSError:
+            print(f"No compile server running on {socket_path}")
+            return 1
+        print(json.dumps(reply))
+        return 0
+    return 0 if serve(socket_path) else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
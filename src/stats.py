@@ -0,0 +1,121 @@
+"""
+Compilation statistics for Dakshin
+Per-stage timings, memory and counts collected while a file is compiled
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Assembler directives and data definitions that are not instructions
+DIRECTIVES = {
+    'section', 'segment', 'global', 'extern', 'default', 'bits', 'align', 'alignb',
+    'db', 'dw', 'dd', 'dq', 'dt', 'resb', 'resw', 'resd', 'resq', 'times', 'equ',
+}
+
+def count_instructions(assembly_code):
+    """Count the machine instructions in NASM source, ignoring labels, comments and directives."""
+    count = 0
+    for line in assembly_code.split('\n'):
+        words = line.split(';', 1)[0].split()
+        if words and words[0].endswith(':'):
+            words = words[1:]  # Label on the same line as an instruction
+        if not words or words[0].startswith('%') or words[0].lower() in DIRECTIVES:
+            continue
+        if len(words) > 1 and words[1].lower() in DIRECTIVES:
+            continue  # Named data definition: msg db "hi", 0
+        count += 1
+    return count
+
+class StageStats:
+    """Measurements for one compiler stage."""
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.allocated_bytes = None  # Peak traced allocation, when tracemalloc is enabled
+        self.count = None            # Tokens, AST nodes or instructions produced
+        self.unit = None
+
+    def to_dict(self):
+        return {
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "allocated_bytes": self.allocated_bytes,
+            "count": self.count,
+            "unit": self.unit,
+        }
+
+class CompileStats:
+    """
+    Statistics for one compilation, filled in stage by stage.
+
+    Stages are timed with the stage() context manager. With
+    trace_memory=True each stage also records the peak memory it allocated,
+    using tracemalloc (started here if it is not already running).
+    """
+    def __init__(self, file_path=None, trace_memory=False):
+        self.file_path = file_path
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.tokens = None
+        self.nodes = None
+        self.lines = None
+        self.instructions = None
+        self.strings = None
+        self.cached = False
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name, unit=None):
+        """Time a stage; the body may set .count on the yielded StageStats."""
+        record = self.stages.setdefault(name, StageStats(name))
+        record.unit = unit
+        before = 0
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_time += time.perf_counter() - wall
+            record.cpu_time += time.process_time() - cpu
+            if self.trace_memory:
+                record.allocated_bytes = tracemalloc.get_traced_memory()[1] - before
+
+    def close(self):
+        """Stop tracemalloc if this object started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def wall_time(self):
+        return sum(stage.wall_time for stage in self.stages.values())
+
+    @property
+    def cpu_time(self):
+        return sum(stage.cpu_time for stage in self.stages.values())
+
+    def to_dict(self):
+        return {
+            "file": self.file_path,
+            "cached": self.cached,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "tokens": self.tokens,
+            "nodes": self.nodes,
+            "lines": self.lines,
+            "instructions": self.instructions,
+            "strings": self.strings,
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
@@ -0,0 +1,241 @@
+"""
+Watch mode for Dakshin
+Recompiles changed source files, and the files that import them, as they are edited
+"""
+
+import os
+import io
+import sys
+import time
+import contextlib
+
+from Lexer import Lexer
+from Error import ErrorHandler
+from compiler import parse_source, open_output
+from code_generator import AssemblyGenerator
+from optimizer import optimize
+from ASTToken import ASTNode, ASTSequence
+from standard_library import StandardLibrary
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+def find_imports(ast):
+    """Return the module names named by import and from_import nodes anywhere in an AST."""
+    modules = set()
+    pending = [ast]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (list, ASTSequence)):
+            pending.extend(node)
+        elif isinstance(node, (ASTNode, dict)):
+            if node.get("type") in ("import", "from_import"):
+                modules.add(node["module"])
+            else:
+                pending.extend(value for value in node.values() if isinstance(value, (list, ASTSequence, ASTNode, dict)))
+    return modules
+
+class Watcher:
+    """
+    Keeps the AST and import edges of every source file under a directory.
+
+    An import of 'a.b' refers to a/b.dn, looked up next to the importing file
+    first and then from the watched root. When files change, only they are
+    re-parsed; files importing them (directly or transitively) are
+    regenerated from their cached ASTs.
+    """
+    def __init__(self, root, out_dir):
+        self.root = root
+        self.out_dir = out_dir
+        self.lexer = Lexer(ErrorHandler())
+        self.stdlib = StandardLibrary()
+        self.mtimes = {}    # path -> mtime_ns seen at last scan
+        self.asts = {}      # path -> AST of the current file contents
+        self.modules = {}   # path -> module names it imports
+        self.imports = {}   # path -> set of imported source paths
+
+    def scan(self):
+        """Return {path: mtime_ns} for every .dn file under the root."""
+        found = {}
+        for directory, dirs, files in os.walk(self.root):
+            dirs.sort()
+            for name in files:
+                if name.endswith('.dn'):
+                    path = os.path.join(directory, name)
+                    try:
+                        found[path] = os.stat(path).st_mtime_ns
+                    except FileNotFoundError:
+                        pass  # Deleted while scanning
+        return found
+
+    def resolve(self, module, importer):
+        """Map a module name to a source path under the root, or None if it is not one of ours."""
+        relative = module.replace('.', os.sep) + '.dn'
+        for base in (os.path.dirname(importer), self.root):
+            path = os.path.join(base, relative)
+            if path in self.mtimes:
+                return path
+        return None
+
+    def dependents(self, paths):
+        """Return paths plus every file that imports any of them, transitively."""
+        importers = {}
+        for path, imported in self.imports.items():
+            for dependency in imported:
+                importers.setdefault(dependency, set()).add(path)
+        affected = set(paths)
+        pending = list(paths)
+        while pending:
+            for importer in importers.get(pending.pop(), ()):
+                if importer not in affected:
+                    affected.add(importer)
+                    pending.append(importer)
+        return affected
+
+    def output_path(self, path):
+        relative = os.path.relpath(path, self.root)
+        return os.path.join(self.out_dir, os.path.splitext(relative)[0] + '.asm')
+
+    def poll(self):
+        """Rescan the tree and rebuild whatever changed; return the rebuilt paths."""
+        current = self.scan()
+        changed = {path for path, mtime in current.items() if self.mtimes.get(path) != mtime}
+        removed = set(self.mtimes) - set(current)
+        if not changed and not removed:
+            return []
+
+        # Dependents are worked out on the old import graph so removed files still count
+        affected = self.dependents(changed | removed)
+        added = set(current) - set(self.mtimes)
+        self.mtimes = current
+        for path in removed:
+            self.asts.pop(path, None)
+            self.modules.pop(path, None)
+            self.imports.pop(path, None)
+            try:
+                os.remove(self.output_path(path))
+            except FileNotFoundError:
+                pass
+            print(f"  removed {path}")
+
+        for path in changed:
+            self.parse(path)
+        if added or removed:
+            # Files coming or going can change what any import resolves to
+            for path in self.modules:
+                self.imports[path] = self.resolve_all(path)
+        affected = self.dependents(affected) - removed
+
+        rebuilt = sorted(affected & set(self.asts))
+        for path in rebuilt:
+            self.generate(path, reused=path not in changed)
+        return rebuilt
+
+    def resolve_all(self, path):
+        imported = set()
+        for module in self.modules[path]:
+            dependency = self.resolve(module, path)
+            if dependency is not None:
+                imported.add(dependency)
+        return imported
+
+    def parse(self, path):
+        """Parse a changed file and update its cached AST and import edges."""
+        self.lexer.error_handler.clear()
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log):
+                ast, _ = parse_source(path, self.lexer, log=None)
+        except Exception as e:
+            self.asts.pop(path, None)
+            self.modules.pop(path, None)
+            self.imports.pop(path, None)
+            print(f"  FAIL {path}: {type(e).__name__}: {e}")
+            print(log.getvalue(), end='')
+            return
+        if self.lexer.error_handler.has_errors():
+            print(log.getvalue(), end='')
+        self.asts[path] = ast
+        self.modules[path] = find_imports(ast)
+        self.imports[path] = self.resolve_all(path)
+
+    def generate(self, path, reused=False):
+        """Generate and write the assembly for a file from its cached AST."""
+        start = time.perf_counter()
+        output_file = self.output_path(path)
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        try:
+            with open_output(output_file) as f:
+                AssemblyGenerator(self.stdlib).generate_to(optimize(self.asts[path]), f)
+        except Exception as e:
+            print(f"  FAIL {path}: {type(e).__name__}: {e}")
+            return
+        note = " (dependency changed)" if reused else ""
+        print(f"  ok   {path} ({(time.perf_counter() - start) * 1000:.1f} ms){note}")
+
+    def wait(self, interval, notifier):
+        """Sleep until something may have changed: an inotify event, or the poll interval."""
+        if notifier is None:
+            time.sleep(interval)
+            return
+        notifier.read(timeout=int(interval * 1000))
+        time.sleep(0.05)  # Let editors finish writing before rescanning
+        notifier.read(timeout=0)
+
+    def watch_directories(self, notifier, watched):
+        mask = (inotify_flags.CREATE | inotify_flags.MODIFY | inotify_flags.DELETE |
+                inotify_flags.MOVED_FROM | inotify_flags.MOVED_TO | inotify_flags.CLOSE_WRITE)
+        for directory, _, _ in os.walk(self.root):
+            if directory not in watched:
+                notifier.add_watch(directory, mask)
+                watched.add(directory)
+
+    def run(self, interval=0.5, use_inotify=True):
+        """Build everything once, then rebuild on changes until interrupted."""
+        notifier = INotify() if use_inotify and INotify is not None else None
+        watched = set()
+        print(f"Watching {self.root} ({'inotify' if notifier else 'polling'}), writing to {self.out_dir}")
+        try:
+            while True:
+                if notifier is not None:
+                    self.watch_directories(notifier, watched)
+                start = time.perf_counter()
+                rebuilt = self.poll()
+                if rebuilt:
+                    print(f"Rebuilt {len(rebuilt)} file(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+                self.wait(interval, notifier)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+
+def main(argv, default_out_dir='out'):
+    """Entry point for 'dakshin.py watch <dir> [-o out_dir] [--interval S] [--poll]'."""
+    paths = []
+    out_dir = default_out_dir
+    interval = 0.5
+    args = iter(argv)
+    for arg in args:
+        if arg == '-o':
+            out_dir = next(args, out_dir)
+        elif arg == '--interval':
+            value = next(args, '')
+            try:
+                interval = float(value)
+            except ValueError:
+                interval = None
+            if interval is None or not 0 < interval < float('inf'):
+                print(f"Invalid interval: {value!r} (--interval S needs a positive number of seconds)")
+                print("Usage: python dakshin.py watch <dir> [-o out_dir] [--interval S] [--poll]")
+                return 2
+        elif arg != '--poll':
+            paths.append(arg)
+
+    if len(paths) != 1 or not os.path.isdir(paths[0]):
+        print("Usage: python dakshin.py watch <dir> [-o out_dir] [--interval S] [--poll]")
+        return 2
+    Watcher(paths[0], out_dir).run(interval, use_inotify='--poll' not in argv)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary AST format (src/ast_binary.py)
+
+Run with: python -m unittest tests/testing_tools/test_ast_binary.py
+(or pytest). Every program must decode to the AST it was encoded from,
+with and without spans, and damaged data must fail with ASTFormatError
+rather than any other exception.
+"""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from ASTToken import to_dict
+from compiler import parse_source
+from arena import ASTArena
+from ast_binary import dump_ast, load_ast, ASTFormatError, MAGIC
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sample_programs')
+EDGE_CASES = '''let big = 123456789012345678901234567890;
+let small = -9223372036854775808;
+let ratio = 0.1;
+let tiny = 12345.678901234567;
+let name = "héllo ✓ \\"quoted\\"";
+let flags = [true, false, null];
+function pick(x: int, y) -> int {
+    switch (x) {
+        case 1: return -y;
+        case 2: { let z = y ** 2; return z; }
+        default: return 2.5;
+    }
+}
+class Box { public Box(v) { this.v = v; } }
+function main() { let f = (a, b) => a + b; return pick(f(1, 2), 0); }
+'''
+
+class QuietErrorHandler(ErrorHandler):
+    """Collects errors without printing them."""
+    def report(self, error):
+        self.errors.append(error)
+
+def sample_files():
+    return sorted(os.path.join(SAMPLE_DIR, name) for name in os.listdir(SAMPLE_DIR) if name.endswith('.dn'))
+
+def parse(source):
+    tokens = Lexer(ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+    return Parser(tokens).parse()
+
+def parse_file(path, arena=False):
+    """The AST of a sample program, or None if it does not parse."""
+    with redirect_stdout(io.StringIO()):
+        try:
+            return parse_source(path, Lexer(QuietErrorHandler()), log=None, arena=arena)[0]
+        except Exception:
+            return None
+
+def without_spans(data):
+    """A to_dict-style value with every 'span' key removed."""
+    if isinstance(data, dict):
+        return {key: without_spans(value) for key, value in data.items() if key != 'span'}
+    if isinstance(data, list):
+        return [without_spans(value) for value in data]
+    return data
+
+class TestRoundTrip(unittest.TestCase):
+    def assertRoundTrips(self, ast):
+        expected = [to_dict(node) for node in ast]
+        for spans in (True, False):
+            with self.subTest(spans=spans):
+                decoded = load_ast(dump_ast(ast, spans=spans))
+                self.assertEqual([to_dict(node) for node in decoded], expected)
+                self.assertEqual(without_spans(load_ast(dump_ast(ast, spans=spans), as_dict=True)), expected)
+
+    def test_edge_cases(self):
+        ast = parse(EDGE_CASES)
+        self.assertRoundTrips(ast)
+        decoded = load_ast(dump_ast(ast))
+        self.assertEqual([decoded[i].init.value for i in (0, 2, 3)],
+                         [123456789012345678901234567890, 0.1, 12345.678901234567])
+        self.assertEqual(decoded[1].init.right.value, 9223372036854775808)
+        self.assertIsInstance(decoded[0].init.value, int)
+        self.assertIsInstance(decoded[2].init.value, float)
+
+    def test_sample_programs(self):
+        parsed = 0
+        for path in sample_files():
+            ast = parse_file(path)
+            if ast is None:
+                continue
+            parsed += 1
+            with self.subTest(path=os.path.basename(path)):
+                self.assertRoundTrips(ast)
+        self.assertGreater(parsed, 50)
+
+    def test_arena_programs(self):
+        for path in sample_files()[:10]:
+            nodes = parse_file(path)
+            if nodes is None:
+                continue
+            with self.subTest(path=os.path.basename(path)):
+                program = ASTArena.from_ast(nodes).program()
+                self.assertEqual(dump_ast(program, spans=False), dump_ast(nodes, spans=False))
+                # The arena keeps only the first token of a node
+                decoded = load_ast(dump_ast(program))
+                self.assertEqual([(node.start, node.end) for node in decoded],
+                                 [(node.start, None) for node in nodes])
+
+    def test_spans(self):
+        ast = parse(EDGE_CASES)
+        with_spans = load_ast(dump_ast(ast), as_dict=True)
+        self.assertEqual(with_spans[0]['span'], [ast[0].start, ast[0].end])
+        self.assertNotIn('span', load_ast(dump_ast(ast, spans=False), as_dict=True)[0])
+        self.assertLess(len(dump_ast(ast, spans=False)), len(dump_ast(ast)))
+
+    def test_single_declaration(self):
+        ast = parse(EDGE_CASES)
+        data = dump_ast(ast)
+        for i, node in enumerate(ast):
+            with self.subTest(declaration=i):
+                self.assertEqual(to_dict(load_ast(data, declaration=i)), to_dict(node))
+                self.assertEqual(without_spans(load_ast(data, as_dict=True, declaration=i)), to_dict(node))
+
+class TestCorruptData(unittest.TestCase):
+    def test_every_truncation_fails_cleanly(self):
+        data = dump_ast(parse(EDGE_CASES))
+        for size in range(len(data)):
+            with self.subTest(size=size):
+                with self.assertRaises(ASTFormatError):
+                    load_ast(data[:size])
+
+    def test_bad_magic_and_version(self):
+        data = dump_ast(parse("let a = 1;"))
+        with self.assertRaises(ASTFormatError):
+            load_ast(b'XXAST' + data[len(MAGIC):])
+        with self.assertRaises(ASTFormatError):
+            load_ast(MAGIC + bytes([99]) + data[len(MAGIC) + 1:])
+
+    def test_bad_opcode(self):
+        data = bytearray(dump_ast(parse("let a = 1;")))
+        data[-1] = 0x8f  # Past the last opcode
+        with self.assertRaises(ASTFormatError):
+            load_ast(bytes(data))
+
+if __name__ == '__main__':
+    unittest.main()
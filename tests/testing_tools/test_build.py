@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel build driver (src/build.py)
+
+Run with: python -m unittest tests/testing_tools/test_build.py
+(or pytest).
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from build import collect_sources, output_collisions, main as build_main
+
+class TestOutputPaths(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        for relative in ('a/x.dn', 'b/x.dn', 'b/c/y.dn'):
+            path = os.path.join(self.root, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write("function main() { return 0; }\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, relative):
+        return os.path.join(self.root, relative)
+
+    def test_directories_keep_relative_paths(self):
+        work = collect_sources([self.root], 'out')
+        self.assertEqual(sorted(output for _, output in work),
+                         [os.path.join('out', 'a', 'x.asm'), os.path.join('out', 'b', 'c', 'y.asm'),
+                          os.path.join('out', 'b', 'x.asm')])
+        self.assertEqual(output_collisions(work), {})
+
+    def test_files_with_the_same_name_collide(self):
+        work = collect_sources([self.path('a/x.dn'), self.path('b/x.dn')], 'out')
+        self.assertEqual(output_collisions(work),
+                         {os.path.join('out', 'x.asm'): [self.path('a/x.dn'), self.path('b/x.dn')]})
+
+    def test_a_file_named_twice_is_built_once(self):
+        work = collect_sources([self.path('a/x.dn'), self.path('a/x.dn')], 'out')
+        self.assertEqual(len(work), 1)
+
+    def test_colliding_build_fails_before_compiling(self):
+        out_dir = self.path('out')
+        log = io.StringIO()
+        with redirect_stdout(log):
+            status = build_main([self.path('a/x.dn'), self.path('b/x.dn'), '-o', out_dir, '-j', '1', '--no-cache'])
+        self.assertEqual(status, 1)
+        self.assertIn('collision', log.getvalue())
+        self.assertFalse(os.path.exists(out_dir))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the compile cache (src/cache.py)
+
+Run with: python -m unittest tests/testing_tools/test_cache.py
+(or pytest). Entries are written to a temporary directory; a damaged
+entry must read as a miss, and a cache hit must give the same assembly
+and AST as compiling the file.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from ASTToken import to_dict
+from compiler import compile_source
+from cache import CompileCache, MemoryCache, CachedAST, cache_key, ENTRY_HEADER
+from ast_binary import dump_ast
+
+SOURCE = '''function square(x) { return x * x; }
+function main() { let a = square(7); println(a); return 0; }
+'''
+
+def parse(source):
+    tokens = Lexer(ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+    return Parser(tokens).parse()
+
+class TestCompileCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CompileCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_put_and_get(self):
+        ast = parse(SOURCE)
+        self.cache.put('k', ast, "main:\n    ret\n", tokens=30, strings=0, nodes=12)
+        entry = self.cache.get('k')
+        self.assertEqual(entry["assembly"], "main:\n    ret\n")
+        self.assertEqual(entry["stats"], {"tokens": 30, "strings": 0, "nodes": 12})
+        self.assertEqual([to_dict(node) for node in entry["ast"]], [to_dict(node) for node in ast])
+        self.assertIsNone(self.cache.get('other'))
+
+    def test_assembly_from_a_file(self):
+        output = io.StringIO("main:\n    mov rax, 'é'\n")
+        self.cache.put('k', parse(SOURCE), output)
+        self.assertEqual(self.cache.get('k')["assembly"], output.getvalue())
+
+    def test_damaged_entries_are_misses(self):
+        self.cache.put('k', parse(SOURCE), "main:\n", tokens=1)
+        with open(self.cache.path_for('k'), 'rb') as f:
+            data = f.read()
+        stats_size, assembly_size, _ = ENTRY_HEADER.unpack_from(data)
+        ast_start = ENTRY_HEADER.size + stats_size + assembly_size
+        damaged = {
+            'empty': b'',
+            'short header': data[:5],
+            'bad stats': data[:ENTRY_HEADER.size] + b'[' + data[ENTRY_HEADER.size + 1:],
+            'bad assembly': data[:ENTRY_HEADER.size + stats_size] + b'\xff' + data[ENTRY_HEADER.size + stats_size + 1:],
+            'not an AST': data[:ast_start] + b'JUNK' + data[ast_start + 4:],
+        }
+        for name, contents in damaged.items():
+            with self.subTest(damage=name):
+                with open(self.cache.path_for('k'), 'wb') as f:
+                    f.write(contents)
+                self.assertIsNone(self.cache.get('k'))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        ast = parse(SOURCE)
+        self.cache.put('old', ast, "x" * 1000)
+        os.utime(self.cache.path_for('old'), (1, 1))
+        self.cache.put('new', ast, "y" * 1000)
+        os.utime(self.cache.path_for('new'), (2, 2))
+        self.cache.max_bytes = os.path.getsize(self.cache.path_for('new')) + 10
+        self.cache.evict()
+        self.assertIsNone(self.cache.get('old'))
+        self.assertIsNotNone(self.cache.get('new'))
+
+class TestCacheKey(unittest.TestCase):
+    def test_key_depends_on_source_and_options(self):
+        source = SOURCE.encode()
+        keys = {cache_key(source), cache_key(source, {'link_runtime': True}), cache_key(source, {'opt_level': 0}),
+                cache_key(source, {'opt_level': 2}), cache_key(source + b' ')}
+        self.assertEqual(len(keys), 5)
+        self.assertEqual(cache_key(source, {}), cache_key(source))
+        self.assertEqual(cache_key(source, {'a': 1, 'b': 2}), cache_key(source, {'b': 2, 'a': 1}))
+
+class TestCachedAST(unittest.TestCase):
+    def test_decoded_on_first_use(self):
+        ast = parse(SOURCE)
+        cached = CachedAST(dump_ast(ast))
+        self.assertIsNone(cached.declarations)
+        self.assertEqual(len(cached), len(ast))
+        self.assertIsNone(cached.data)
+        self.assertEqual(to_dict(cached[1]), to_dict(ast[1]))
+        self.assertEqual([to_dict(node) for node in cached], [to_dict(node) for node in ast])
+
+class TestCompileWithCache(unittest.TestCase):
+    def compile(self, path, cache, **options):
+        with redirect_stdout(io.StringIO()):
+            ast, assembly_code, stats = compile_source(path, Lexer(ErrorHandler()), cache, log=None, **options)
+        return [to_dict(node) for node in ast], assembly_code, stats
+
+    def test_hit_gives_the_same_result(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'square.dn')
+            with open(path, 'w') as f:
+                f.write(SOURCE)
+            for cache in (CompileCache(os.path.join(directory, 'cache')), MemoryCache()):
+                for options in ({}, {'opt_level': 0}, {'link_runtime': True}):
+                    with self.subTest(cache=type(cache).__name__, options=options):
+                        expected = self.compile(path, None, **options)
+                        first = self.compile(path, cache, **options)
+                        second = self.compile(path, cache, **options)
+                        self.assertFalse(first[2].cached)
+                        self.assertTrue(second[2].cached)
+                        self.assertEqual(first[:2], expected[:2])
+                        self.assertEqual(second[:2], expected[:2])
+                        self.assertEqual(second[2].nodes, first[2].nodes)
+
+    def test_changed_source_misses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'square.dn')
+            cache = CompileCache(os.path.join(directory, 'cache'))
+            with open(path, 'w') as f:
+                f.write(SOURCE)
+            self.compile(path, cache)
+            with open(path, 'w') as f:
+                f.write(SOURCE.replace('7', '8'))
+            _, assembly_code, stats = self.compile(path, cache)
+            self.assertFalse(stats.cached)
+            self.assertEqual(assembly_code, self.compile(path, None)[1])
+
+if __name__ == '__main__':
+    unittest.main()
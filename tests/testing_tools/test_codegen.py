@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Tests for expression code generation (src/code_generator.py)
+
+Run with: python -m unittest tests/testing_tools/test_codegen.py
+(or pytest). The generated assembly is run through a small interpreter
+of the x86-64 instructions the expression code uses, so the tests check
+the values the code computes and the registers it leaves alone rather
+than the exact instructions, with the stack machine and with register
+allocation (src/regalloc.py).
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from ASTToken import BinaryNode, UnaryNode, NumberNode, IdentifierNode, NullNode
+from code_generator import AssemblyGenerator
+from optimizer import fold, wrap
+
+WORD = 2 ** 64
+LOW_BYTES = {'al': 'rax', 'bl': 'rbx', 'cl': 'rcx', 'r10b': 'r10', 'r11b': 'r11'}
+CONDITIONS = {'e': lambda x, y: x == y, 'ne': lambda x, y: x != y, 'l': lambda x, y: x < y,
+              'g': lambda x, y: x > y, 'le': lambda x, y: x <= y, 'ge': lambda x, y: x >= y,
+              'z': lambda x, y: x == 0}
+
+def s64(value):
+    value %= WORD
+    return value - WORD if value >= 2 ** 63 else value
+
+class CPU:
+    """Runs straight-line expression code up to the first call."""
+    def __init__(self, registers=None, memory=None):
+        self.registers = dict.fromkeys(('rax', 'rbx', 'rcx', 'rdx', 'r8', 'r9', 'r10', 'r11', 'rbp', 'rsp'), 0)
+        self.registers.update(registers or {})
+        self.memory = dict(memory or {})
+        self.stack = []
+        self.flags = (0, 0)
+        self.called = None
+
+    def value(self, operand):
+        if operand.startswith('qword '):
+            operand = operand[6:]
+        if operand.startswith('['):
+            return self.memory[operand]
+        if operand in self.registers:
+            return self.registers[operand]
+        if operand in LOW_BYTES:
+            return self.registers[LOW_BYTES[operand]] & 0xff
+        try:
+            return s64(int(operand))
+        except ValueError:
+            return operand  # A label, such as a string literal's address
+
+    def store(self, operand, value):
+        value = s64(value) if isinstance(value, int) else value
+        if operand.startswith('['):
+            self.memory[operand] = value
+        else:
+            self.registers[operand] = value
+
+    def run(self, assembly_code):
+        """Execute from the first instruction until a call or the end; returns self."""
+        lines = [line.split(';')[0].strip() for line in assembly_code]
+        lines = [line for line in lines if line]
+        labels = {line[:-1]: i for i, line in enumerate(lines) if line.endswith(':')}
+        pc = 0
+        while pc < len(lines):
+            line = lines[pc]
+            pc += 1
+            if line.endswith(':'):
+                continue
+            mnemonic, _, rest = line.partition(' ')
+            operands = [operand.strip() for operand in rest.split(',')] if rest else []
+            target = operands[0] if operands else None
+            if mnemonic == 'call':
+                self.called = target
+                break
+            if mnemonic in ('mov', 'movzx'):
+                self.store(target, self.value(operands[1]))
+            elif mnemonic == 'add':
+                self.store(target, self.value(target) + self.value(operands[1]))
+            elif mnemonic == 'sub':
+                self.store(target, self.value(target) - self.value(operands[1]))
+            elif mnemonic == 'imul':
+                self.store(target, self.value(target) * self.value(operands[1]))
+            elif mnemonic == 'and':
+                self.store(target, self.value(target) & self.value(operands[1]))
+            elif mnemonic == 'or':
+                self.store(target, self.value(target) | self.value(operands[1]))
+            elif mnemonic == 'xor':
+                self.store(target, self.value(target) ^ self.value(operands[1]))
+            elif mnemonic == 'neg':
+                self.store(target, -self.value(target))
+            elif mnemonic == 'dec':
+                self.store(target, self.value(target) - 1)
+            elif mnemonic in ('shl', 'sar'):
+                count = self.value(operands[1]) & 63
+                value = self.value(target)
+                self.store(target, value << count if mnemonic == 'shl' else value >> count)
+            elif mnemonic == 'cmp':
+                self.flags = (self.value(target), self.value(operands[1]))
+            elif mnemonic == 'test':
+                self.flags = (self.value(target) & self.value(operands[1]), 0)
+            elif mnemonic.startswith('set'):
+                register = LOW_BYTES[target]
+                result = CONDITIONS[mnemonic[3:]](*self.flags)
+                self.registers[register] = (self.registers[register] & ~0xff) | int(result)
+            elif mnemonic == 'push':
+                self.stack.append(self.value(target))
+            elif mnemonic == 'pop':
+                self.store(target, self.stack.pop())
+            elif mnemonic == 'xchg':
+                first, second = self.value(target), self.value(operands[1])
+                self.store(target, second)
+                self.store(operands[1], first)
+            elif mnemonic == 'cqo':
+                self.registers['rdx'] = -1 if self.registers['rax'] < 0 else 0
+            elif mnemonic == 'idiv':
+                divisor = self.value(target)
+                dividend = self.registers['rax']
+                if divisor == 0:
+                    raise ZeroDivisionError(line)
+                quotient = abs(dividend) // abs(divisor)
+                quotient = quotient if (dividend < 0) == (divisor < 0) else -quotient
+                if quotient >= 2 ** 63:
+                    raise OverflowError(line)
+                self.registers['rax'] = quotient
+                self.registers['rdx'] = dividend - quotient * divisor
+            elif mnemonic == 'jmp':
+                pc = labels[target]
+            elif mnemonic == 'jle':
+                if self.flags[0] <= self.flags[1]:
+                    pc = labels[target]
+            else:
+                raise ValueError(f"Instruction not interpreted: {line}")
+        return self
+
+def parse(source):
+    tokens = Lexer(ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+    return Parser(tokens).parse()
+
+def main_body(source, register_allocation):
+    """The assembly lines of a program's main function."""
+    assembly_code = AssemblyGenerator(register_allocation=register_allocation).generate(parse(source))
+    lines = assembly_code.splitlines()
+    return lines[lines.index('main:') + 1:]
+
+def call_registers(source, register_allocation):
+    """The first function main calls, and the argument registers at the call."""
+    cpu = CPU().run(main_body(source, register_allocation))
+    return cpu.called, [cpu.registers[register] for register in ('rcx', 'rdx', 'r8', 'r9')]
+
+class TestCallArguments(unittest.TestCase):
+    """Operators that need rcx or rdx must not overwrite earlier call arguments."""
+    def assertCall(self, source, function, arguments):
+        for register_allocation in (False, True):
+            with self.subTest(register_allocation=register_allocation):
+                called, registers = call_registers(source, register_allocation)
+                self.assertEqual(called, function)
+                self.assertEqual(registers[:len(arguments)], arguments)
+
+    def test_shift_and_power_after_the_format_string(self):
+        source = 'function main() { let n = 3; printf("%d %d %d\\n", 1 << n, 2 ** n, -64 >> n); return 0; }'
+        self.assertCall(source, 'printf', ['str_0', 8, 8, -8])
+
+    def test_division_after_the_format_string(self):
+        source = 'function main() { let d = 4; printf("%d %d\\n", -17 / d, 1 << d); return 0; }'
+        self.assertCall(source, 'printf', ['str_0', -4, 16])
+
+    def test_library_call_arguments(self):
+        source = 'function main() { let n = 6; let s = "text"; substr(s, n >> 1, 2 ** n / n); return 0; }'
+        self.assertCall(source, 'dakshin_substr', ['str_0', 3, 10])
+
+VARIABLES = ('a', 'b', 'c', 'd', 'e')
+OPERATORS = ('+', '-', '*', '/', '&', '|', '^', '<<', '>>', '==', '!=', '<', '>', '<=', '>=', '**')
+CONSTANTS = (0, 1, 2, 3, 7, -5, 63, 64, 100, 2 ** 31 - 1, 2 ** 31, -2 ** 31, -2 ** 31 - 1, 2 ** 40)
+ARGUMENT_REGISTERS = ('rcx', 'rdx', 'r8', 'r9')
+
+def random_expression(rng, depth):
+    """A random integer expression; NullNode leaves stand for opaque code such as calls."""
+    if depth == 0 or rng.random() < 0.2:
+        choice = rng.random()
+        if choice < 0.4:
+            return NumberNode(rng.choice(CONSTANTS))
+        if choice < 0.85:
+            return IdentifierNode(rng.choice(VARIABLES))
+        return NullNode(rng.randrange(-50, 50))
+    if rng.random() < 0.12:
+        return UnaryNode(rng.choice(('-', '!')), random_expression(rng, depth - 1))
+    op = rng.choice(OPERATORS)
+    if op == '**':
+        return BinaryNode(op, random_expression(rng, depth - 1), NumberNode(rng.randrange(0, 4)))
+    if op in ('<<', '>>'):
+        count = rng.choice((NumberNode(rng.randrange(0, 70)), IdentifierNode('s')))
+        return BinaryNode(op, random_expression(rng, depth - 1), count)
+    return BinaryNode(op, random_expression(rng, depth - 1), random_expression(rng, depth - 1))
+
+def evaluate(node, env):
+    """The value of an expression as the generated code computes it, or None if it faults."""
+    if node.kind == NumberNode.kind:
+        return wrap(node.value)
+    if node.kind == IdentifierNode.kind:
+        return env[node.value]
+    if node.kind == NullNode.kind:
+        return node.value
+    if node.kind == UnaryNode.kind:
+        value = evaluate(node.right, env)
+        if value is None:
+            return None
+        return wrap(-value) if node.op == '-' else int(value == 0)
+    left, right = evaluate(node.left, env), evaluate(node.right, env)
+    if left is None or right is None:
+        return None
+    return fold(node.op, left, right)
+
+def expression_code(node, register_allocation):
+    """Assembly for node with the variables in [rbp-8], [rbp-16], ... ('s' last)."""
+    generator = AssemblyGenerator(register_allocation=register_allocation)
+    generator.local_vars = {name: f"[rbp-{8 * (i + 1)}]" for i, name in enumerate(VARIABLES + ('s',))}
+
+    def opaque(node):
+        # Clobbers every scratch register, as a call may
+        generator.text_section.extend(["    mov rbx, 11", "    mov r10, 22", "    mov r11, 33",
+                                       f"    mov rax, {node.value}"])
+    generator.expression_handlers[NullNode.kind] = opaque
+    generator.generate_expression(node)
+    return generator.text_section
+
+class TestRegisterAllocation(unittest.TestCase):
+    """Random expression trees compute the same values with and without register allocation."""
+    COUNT = 1500
+
+    def test_random_expressions(self):
+        rng = random.Random(1)
+        for i in range(self.COUNT):
+            node = random_expression(rng, rng.randrange(1, 7))
+            env = {name: rng.choice((0, 1, -1, 5, 17, -300, 2 ** 62, rng.randrange(-10 ** 6, 10 ** 6)))
+                   for name in VARIABLES}
+            env['s'] = rng.randrange(0, 64)
+            memory = {location: env[name] for name, location in
+                      ((name, f"[rbp-{8 * (j + 1)}]") for j, name in enumerate(VARIABLES + ('s',)))}
+            arguments = {register: rng.randrange(-1000, 1000) for register in ARGUMENT_REGISTERS}
+            expected = evaluate(node, env)
+            for register_allocation in (False, True):
+                code = expression_code(node, register_allocation)
+                if expected is None:
+                    with self.assertRaises((ZeroDivisionError, OverflowError)):
+                        CPU(arguments, memory).run(code)
+                    continue
+                cpu = CPU(arguments, memory).run(code)
+                state = (cpu.registers['rax'], cpu.stack, cpu.memory,
+                         {register: cpu.registers[register] for register in ARGUMENT_REGISTERS})
+                if state != (expected, [], memory, arguments):
+                    self.fail(f"Tree {i} (register_allocation={register_allocation}): "
+                              f"rax, stack, memory and arguments {state}, expected {expected}\n" + '\n'.join(code))
+
+    def test_register_allocation_uses_fewer_instructions(self):
+        node = BinaryNode('+', BinaryNode('*', IdentifierNode('a'), IdentifierNode('b')),
+                          BinaryNode('-', IdentifierNode('c'), NumberNode(4)))
+        stack_code = expression_code(node, False)
+        register_code = expression_code(node, True)
+        self.assertLess(len(register_code), len(stack_code))
+        self.assertFalse([line for line in register_code if line.split()[0] in ('push', 'pop')])
+
+if __name__ == '__main__':
+    unittest.main()
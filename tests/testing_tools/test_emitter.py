@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming assembly output (src/emitter.py)
+
+Run with: python -m unittest tests/testing_tools/test_emitter.py
+(or pytest). Writing a program through spooled sections must give the
+same text as generating it in memory, however small the spool and the
+batches, and the line and instruction counts must describe that text.
+"""
+
+import functools
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import emitter
+import code_generator
+from Lexer import Lexer
+from Error import ErrorHandler
+from compiler import parse_source
+from code_generator import AssemblyGenerator
+from emitter import SectionWriter, AssemblyWriter
+from stats import count_instructions
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sample_programs')
+
+class QuietErrorHandler(ErrorHandler):
+    """Collects errors without printing them."""
+    def report(self, error):
+        self.errors.append(error)
+
+def sample_asts():
+    """(name, AST) of every sample program that parses."""
+    for name in sorted(os.listdir(SAMPLE_DIR)):
+        if not name.endswith('.dn'):
+            continue
+        with redirect_stdout(io.StringIO()):
+            try:
+                ast = parse_source(os.path.join(SAMPLE_DIR, name), Lexer(QuietErrorHandler()), log=None)[0]
+            except Exception:
+                continue
+        yield name, ast
+
+class TestSectionWriter(unittest.TestCase):
+    LINES = ["section .text", "main:", "    call printf", "    mov rax, 1\n    ret", "", "    call dakshin_print"]
+
+    def test_spilled_section_reads_back(self):
+        section = SectionWriter(spool_bytes=16)
+        with mock.patch.object(emitter, 'BATCH_LINES', 2):
+            for line in self.LINES * 50:
+                section.append(line)
+        output = io.StringIO()
+        section.copy_to(output)
+        section.close()
+        expected = '\n'.join(self.LINES * 50)
+        self.assertEqual(output.getvalue(), expected)
+        self.assertEqual(section.lines, expected.count('\n') + 1)
+        self.assertEqual(section.instructions, count_instructions(expected))
+        self.assertEqual(section.calls, {'printf', 'dakshin_print'})
+
+    def test_empty_section(self):
+        section = SectionWriter()
+        output = io.StringIO()
+        section.copy_to(output)
+        section.close()
+        self.assertEqual(output.getvalue(), '')
+        self.assertFalse(section.written)
+
+    def test_sections_are_written_in_order(self):
+        output = io.StringIO()
+        writer = AssemblyWriter(output, spool_bytes=8)
+        writer.text.extend(["main:", "    ret"])
+        writer.data.append("section .data")
+        writer.header.append("section .text")
+        writer.close()
+        self.assertEqual(output.getvalue(), "section .data\n\nsection .text\nmain:\n    ret")
+        self.assertEqual(writer.lines, 5)
+        self.assertEqual(writer.instructions, 1)
+
+class TestGenerateTo(unittest.TestCase):
+    def test_streamed_output_matches_generate(self):
+        small_writer = functools.partial(AssemblyWriter, spool_bytes=256)
+        generated = 0
+        for name, ast in sample_asts():
+            generator = AssemblyGenerator()
+            with redirect_stdout(io.StringIO()):
+                try:
+                    expected = generator.generate(ast)
+                except Exception:
+                    continue  # A program the code generator does not support yet
+            generated += 1
+            with self.subTest(path=name):
+                self.assertEqual(generator.line_count, expected.count('\n') + 1)
+                self.assertEqual(generator.instruction_count, count_instructions(expected))
+
+                with tempfile.TemporaryFile('w+') as f:
+                    with mock.patch.object(code_generator, 'AssemblyWriter', small_writer), \
+                            mock.patch.object(emitter, 'BATCH_LINES', 7):
+                        AssemblyGenerator().generate_to(ast, f)
+                    f.seek(0)
+                    self.assertEqual(f.read(), expected)
+        self.assertGreater(generated, 50)
+
+    def test_nothing_is_written_when_generation_fails(self):
+        generator = AssemblyGenerator()
+        def fail(node):
+            raise RuntimeError("generation failed")
+        generator.declaration_handlers = dict.fromkeys(generator.declaration_handlers, fail)
+        ast = next(sample_asts())[1]
+        output = io.StringIO()
+        with self.assertRaises(RuntimeError):
+            generator.generate_to(ast, output)
+        self.assertEqual(output.getvalue(), '')
+
+if __name__ == '__main__':
+    unittest.main()
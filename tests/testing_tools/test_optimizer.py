@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests for the AST optimizer (src/optimizer.py)
+
+Run with: python -m unittest tests/testing_tools/test_optimizer.py
+(or pytest). Folded values are checked against the semantics of the
+generated code, and whole programs are compiled at -O0, -O1 and -O2 to
+check that they print the same way at every level.
+"""
+
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from ASTToken import to_dict, BinaryNode, UnaryNode, NumberNode, IdentifierNode
+from code_generator import AssemblyGenerator
+from optimizer import Optimizer, fold, wrap, LEVELS, INT_MIN
+
+INT_MAX = 2 ** 63 - 1
+
+def parse(source):
+    tokens = Lexer(ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+    return Parser(tokens).parse()
+
+def optimized_return(expression, level=1, prelude=''):
+    """The value of 'return expression;' in a function f(x, y) after optimization, as a dict."""
+    ast = parse(f"function f(x, y) {{ {prelude} return {expression}; }}")
+    function = Optimizer(level).program(ast)[0]
+    return to_dict(list(function.body)[-1].value)
+
+def evaluate(node, env):
+    """Value of an expression tree of integers and variables, computed as the generated code does."""
+    if node.kind == NumberNode.kind:
+        return node.value
+    if node.kind == IdentifierNode.kind:
+        return env[node.value]
+    if node.kind == UnaryNode.kind:
+        value = evaluate(node.right, env)
+        return wrap(-value) if node.op == '-' else int(value == 0)
+    return fold(node.op, evaluate(node.left, env), evaluate(node.right, env))
+
+def print_calls(source, level):
+    """The print routines a program calls, in order, when compiled at an -O level."""
+    ast = parse(source)
+    if level > 0:
+        ast = Optimizer(level).program(ast)
+    assembly_code = AssemblyGenerator(register_allocation=level > 0).generate(ast)
+    return re.findall(r'call (dakshin_print\w*)', assembly_code)
+
+class TestFold(unittest.TestCase):
+    def test_wrap_around(self):
+        self.assertEqual(fold('+', INT_MAX, 1), INT_MIN)
+        self.assertEqual(fold('-', INT_MIN, 1), INT_MAX)
+        self.assertEqual(fold('*', 2 ** 62, 4), 0)
+        self.assertEqual(fold('*', INT_MAX, 2), -2)
+
+    def test_division_truncates_toward_zero(self):
+        self.assertEqual(fold('/', 7, 2), 3)
+        self.assertEqual(fold('/', -7, 2), -3)
+        self.assertEqual(fold('/', 7, -2), -3)
+        self.assertEqual(fold('/', -7, -2), 3)
+        self.assertEqual(fold('/', INT_MIN, 1), INT_MIN)
+
+    def test_faulting_division_is_not_folded(self):
+        self.assertIsNone(fold('/', 5, 0))
+        self.assertIsNone(fold('/', 0, 0))
+        self.assertIsNone(fold('/', INT_MIN, -1))
+
+    def test_shift_counts_are_taken_mod_64(self):
+        self.assertEqual(fold('<<', 1, 64), 1)
+        self.assertEqual(fold('<<', 1, 65), 2)
+        self.assertEqual(fold('<<', 1, 63), INT_MIN)
+        self.assertEqual(fold('>>', -8, 65), -4)
+        self.assertEqual(fold('>>', INT_MIN, 63), -1)
+        self.assertEqual(fold('<<', 3, -1), INT_MIN)  # Count -1 is 63
+
+    def test_power(self):
+        self.assertEqual(fold('**', 2, 10), 1024)
+        self.assertEqual(fold('**', 2, 64), 0)
+        self.assertEqual(fold('**', -3, 3), -27)
+        self.assertEqual(fold('**', 5, 0), 1)
+        self.assertEqual(fold('**', 5, -2), 1)
+        self.assertEqual(fold('**', 0, -1), 1)
+
+    def test_comparisons_give_0_or_1(self):
+        self.assertEqual(fold('<', -1, 0), 1)
+        self.assertEqual(fold('>=', -1, 0), 0)
+        self.assertEqual(fold('==', 3, 3), 1)
+        self.assertEqual(fold('!=', 3, 3), 0)
+
+    def test_unimplemented_operators_are_not_folded(self):
+        for op in ('%', '&&', '||'):
+            self.assertIsNone(fold(op, 7, 3))
+
+class TestRewrites(unittest.TestCase):
+    def test_constant_subtrees_fold(self):
+        self.assertEqual(optimized_return("(60 * 60) - (1 << 4)"), {'type': 'number', 'value': 3584})
+        self.assertEqual(optimized_return("-21 / 4"), {'type': 'number', 'value': -5})
+        self.assertEqual(optimized_return("!(3 < 4)"), {'type': 'number', 'value': 0})
+
+    def test_identities(self):
+        x = {'type': 'identifier', 'value': 'x'}
+        for expression in ("x + 0", "0 + x", "x - 0", "x * 1", "1 * x", "x / 1", "x | 0", "x ^ 0",
+                           "x << 0", "x >> 0", "x & -1", "- -x"):
+            with self.subTest(expression=expression):
+                self.assertEqual(optimized_return(expression), x)
+
+    def test_multiplying_by_zero_needs_a_pure_operand(self):
+        self.assertEqual(optimized_return("x * 0"), {'type': 'number', 'value': 0})
+        self.assertEqual(optimized_return("0 & (x + y)"), {'type': 'number', 'value': 0})
+        self.assertEqual(optimized_return("g(x) * 0")['type'], 'binary')
+
+    def test_double_not_needs_a_boolean(self):
+        self.assertEqual(optimized_return("!!(x < y)")['op'], '<')
+        self.assertEqual(optimized_return("!!x")['type'], 'unary')
+
+    def test_strength_reduction_is_level_2(self):
+        self.assertEqual(optimized_return("x * 8", level=1)['op'], '*')
+        self.assertEqual(optimized_return("x * 8", level=2),
+                         {'type': 'binary', 'op': '<<', 'left': {'type': 'identifier', 'value': 'x'},
+                          'right': {'type': 'number', 'value': 3}})
+        self.assertEqual(optimized_return("8 * x", level=2)['op'], '<<')
+        self.assertEqual(optimized_return("x * 6", level=2)['op'], '*')
+
+    def test_division_by_a_power_of_two_truncates(self):
+        for divisor in (2, 4, 1024, 2 ** 31, 2 ** 62):
+            ast = parse(f"function f(x) {{ return x / {divisor}; }}")
+            tree = Optimizer(2).program(ast)[0].body[0].value
+            self.assertEqual(tree.op, '>>')
+            for x in (0, 1, -1, 7, -7, -8, -9, divisor - 1, -divisor + 1, INT_MAX, INT_MIN, -1000001):
+                with self.subTest(divisor=divisor, x=x):
+                    self.assertEqual(evaluate(tree, {'x': x}), fold('/', x, divisor))
+
+    def test_division_of_other_expressions_is_kept(self):
+        self.assertEqual(optimized_return("(x + y) / 4", level=2)['op'], '/')
+
+class TestTypes(unittest.TestCase):
+    def test_string_operand_is_kept(self):
+        for expression in ("s + 0", "0 + s", "s * 1", "s | 0", "- -s"):
+            with self.subTest(expression=expression):
+                self.assertIn(optimized_return(expression, prelude='let s = "hello";')['type'], ('binary', 'unary'))
+
+    def test_int_locals_are_simplified(self):
+        self.assertEqual(optimized_return("n + 0", prelude='let n = 5;'), {'type': 'identifier', 'value': 'n'})
+        self.assertEqual(optimized_return("m * 1", prelude='let m = x; m = "text";')['type'], 'binary')
+        self.assertEqual(optimized_return("d + 0", prelude='let d;')['type'], 'binary')
+        self.assertEqual(optimized_return("d + 0", prelude='let d; d = 1;'), {'type': 'identifier', 'value': 'd'})
+
+    def test_assignment_keeps_its_type(self):
+        ast = parse('function f(x) { let s = "a"; s = 1 < 2; let n = 0; n = 1 < 2; return 0; }')
+        body = list(Optimizer(1).program(ast)[0].body)
+        self.assertEqual(body[1].value.type, 'binary')
+        self.assertEqual(body[3].value.type, 'number')
+
+    def test_programs_print_the_same_at_every_level(self):
+        source = """
+            function f(n) {
+                let s = "hello";
+                let p = s;
+                let t = s + 0;
+                let k = n * 1;
+                let q = *p;
+                println(s + 0, 0 + s, t, n + 0, k, - -n, *p, q);
+                s = 1 < 2;
+                println(s);
+                let u = "x";
+                u = u * 1;
+                let h = n / 4;
+                let r = -21 / 4;
+                println(u, n * 8, h, r, !!(n > 0));
+                return 0;
+            }
+            function main() { f(3); return 0; }
+        """
+        expected = print_calls(source, 0)
+        self.assertIn('dakshin_print_int', expected)
+        for level in LEVELS[1:]:
+            with self.subTest(level=level):
+                self.assertEqual(print_calls(source, level), expected)
+
+    def test_sample_programs_print_the_same_at_every_level(self):
+        sample_dir = os.path.join(os.path.dirname(__file__), '..', 'sample_programs')
+        for name in ('constant_folding_test.dn', 'math_test.dn', 'bitwise_operators_test.dn', 'type_debug_test.dn'):
+            with open(os.path.join(sample_dir, name)) as f:
+                source = f.read()
+            with self.subTest(name=name):
+                expected = print_calls(source, 0)
+                for level in LEVELS[1:]:
+                    self.assertEqual(print_calls(source, level), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Tests for the parser (src/Parser.py)
+
+Run with: python -m unittest tests/testing_tools/test_parsing.py
+(or pytest). Expressions are compared in a compact prefix form such as
+(+ a (* b c)). Deferred function bodies are checked against the eager
+parse, including how syntax errors inside them are reported.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler, Error
+from Parser import Parser, LazyBody
+from ASTToken import to_dict
+from compiler import compile_source
+
+class QuietErrorHandler(ErrorHandler):
+    """Collects errors without printing them."""
+    def report(self, error):
+        self.errors.append(error)
+
+def tokenize(source, error_handler=None):
+    return Lexer(error_handler or ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+
+def messages(error_handler):
+    return [(error.message, error.line) for error in error_handler.errors]
+
+def prefix(node):
+    """An expression as nested prefix notation, e.g. '(+ a (* b c))'."""
+    data = node if isinstance(node, dict) else to_dict(node)
+    kind = data['type']
+    if kind in ('identifier', 'number'):
+        return str(data['value'])
+    if kind == 'binary':
+        return f"({data['op']} {prefix(data['left'])} {prefix(data['right'])})"
+    if kind == 'unary':
+        return f"({data['op']} {prefix(data['right'])})"
+    if kind == 'cast':
+        return f"(as {prefix(data['expr'])} {data['target_type']})"
+    if kind == 'assignment':
+        return f"(= {data['name']} {prefix(data['value'])})"
+    if kind == 'lambda':
+        body = data['body']
+        body = prefix(body) if isinstance(body, dict) else '{...}'
+        return f"(=> ({' '.join(data['params'])}) {body})"
+    if kind == 'call':
+        return f"({prefix(data['callee'])} {' '.join(prefix(arg) for arg in data['args'])})".replace(' )', ')')
+    return kind
+
+def expression(source):
+    """The initializer of 'let v = source;' in prefix notation."""
+    return prefix(Parser(tokenize(f"let v = {source};")).parse()[0].init)
+
+class TestBindingPowers(unittest.TestCase):
+    def assertParses(self, cases):
+        for source, expected in cases:
+            with self.subTest(source=source):
+                self.assertEqual(expression(source), expected)
+
+    def test_precedence(self):
+        self.assertParses([
+            ("a + b * c", "(+ a (* b c))"),
+            ("a * b + c", "(+ (* a b) c)"),
+            ("a || b && c", "(|| a (&& b c))"),
+            ("a | b ^ c & d", "(| a (^ b (& c d)))"),
+            ("a & b == c", "(& a (== b c))"),
+            ("a == b < c", "(== a (< b c))"),
+            ("a < b << 1", "(< a (<< b 1))"),
+            ("a << 1 + 2", "(<< a (+ 1 2))"),
+            ("a % b - c", "(- (% a b) c)"),
+            ("(a + b) * c", "(* (+ a b) c)"),
+        ])
+
+    def test_associativity(self):
+        self.assertParses([
+            ("a - b - c", "(- (- a b) c)"),
+            ("a / b * c", "(* (/ a b) c)"),
+            ("a << b >> c", "(>> (<< a b) c)"),
+            ("a ** b ** c", "(** a (** b c))"),
+            ("a = b = c", "(= a (= b c))"),
+        ])
+
+    def test_prefix_operators_and_casts(self):
+        self.assertParses([
+            ("-a ** 2", "(- (** a 2))"),
+            ("!a == b", "(== (! a) b)"),
+            ("*p + 1", "(+ (* p) 1)"),
+            ("-a * b", "(* (- a) b)"),
+            ("a as Point + 1", "(+ (as a Point) 1)"),
+            ("a + b as Point", "(as (+ a b) Point)"),
+            ("a as Point < b", "(< (as a Point) b)"),
+        ])
+
+class TestParentheses(unittest.TestCase):
+    def test_lambdas_and_grouping(self):
+        for source, expected in [
+            ("() => 1", "(=> () 1)"),
+            ("(a) => a + 1", "(=> (a) (+ a 1))"),
+            ("(a, b) => a * b", "(=> (a b) (* a b))"),
+            ("(a, b) => { return a; }", "(=> (a b) {...})"),
+            ("(a)", "a"),
+            ("((a))", "a"),
+            ("(a + (b)) * 2", "(* (+ a b) 2)"),
+            ("f((a) => a, (b))", "(f (=> (a) a) b)"),
+        ]:
+            with self.subTest(source=source):
+                self.assertEqual(expression(source), expected)
+
+class TestRecovery(unittest.TestCase):
+    SOURCE = """function f() {
+    let x = ;
+    let y = 2;
+    return y +;
+}
+let z = 3
+function g(a, { return a; }
+function h() { return 1 +; }
+function main() { return 0; }
+"""
+
+    def parse(self, source, **options):
+        errors = QuietErrorHandler()
+        ast = Parser(tokenize(source, errors), error_handler=errors, file_path='t.dn', **options).parse()
+        return ast, errors
+
+    def test_every_error_is_reported(self):
+        _, errors = self.parse(self.SOURCE)
+        lexer_error, *parser_errors = errors.errors  # The lexer reports the unclosed '(' first
+        self.assertEqual((lexer_error.message, lexer_error.line, lexer_error.column),
+                         ("Syntax Error: Unclosed '('", 7, 11))
+        self.assertEqual([(error.line, error.column) for error in parser_errors],
+                         [(2, 13), (4, 15), (7, 1), (7, 15), (8, 26)])
+        self.assertTrue(all(error.message.startswith("Syntax Error:") for error in parser_errors))
+        self.assertTrue(all(error.file_path == 't.dn' for error in parser_errors))
+
+    def test_parsing_resumes_after_each_error(self):
+        ast, _ = self.parse(self.SOURCE)
+        self.assertEqual([node.name for node in ast], ['f', 'h', 'main'])
+        self.assertEqual([to_dict(statement) for statement in ast[0].body],
+                         [{'type': 'variable_declaration', 'name': 'y', 'var_type': None,
+                           'value': {'type': 'number', 'value': 2}}])
+        self.assertEqual(len(ast[2].body), 1)
+
+    def test_error_limit(self):
+        ast, errors = self.parse("let a = ;\n" * 10, max_errors=3)
+        self.assertEqual(ast, [])
+        self.assertEqual([error.message for error in errors.errors],
+                         ["Syntax Error: Expected expression"] * 3 + ["Too many syntax errors (3), giving up"])
+
+    def test_without_an_error_handler_the_first_error_is_raised(self):
+        with self.assertRaises(SyntaxError):
+            Parser(tokenize(self.SOURCE)).parse()
+
+    def test_compile_reports_all_errors_before_failing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'errors.dn')
+            with open(path, 'w') as f:
+                f.write(self.SOURCE)
+            errors = QuietErrorHandler()
+            with self.assertRaises(Error) as raised:
+                compile_source(path, Lexer(errors), log=None)
+        self.assertEqual(str(raised.exception), "5 syntax errors")
+        self.assertEqual(len(errors.errors), 6)  # And the lexer's unclosed '('
+        self.assertTrue(all(error.file_path == path for error in errors.errors))
+
+class TestLazyBodies(unittest.TestCase):
+    SOURCE = """
+        function add(a, b) { let c = a + b; return c; }
+        class Point {
+            public Point(x) { this.x = x; }
+        }
+        function main() { println(add(1, 2)); return 0; }
+    """
+
+    def test_bodies_are_parsed_on_first_use(self):
+        declarations = Parser(tokenize(self.SOURCE), lazy_bodies=True).parse()
+        body = declarations[0].body
+        self.assertIsInstance(body, LazyBody)
+        self.assertFalse(body.parsed)
+        self.assertEqual(len(body), 2)
+        self.assertTrue(body.parsed)
+
+    def test_same_ast_as_the_eager_parse(self):
+        eager = Parser(tokenize(self.SOURCE)).parse()
+        lazy = Parser(tokenize(self.SOURCE), lazy_bodies=True).parse()
+        self.assertEqual([to_dict(node) for node in lazy], [to_dict(node) for node in eager])
+
+    def test_errors_in_a_body_are_reported_when_it_is_parsed(self):
+        source = "function f() { let x = ; return 1; }\nfunction g() { return 2; }\n"
+        eager_errors = QuietErrorHandler()
+        eager = Parser(tokenize(source), error_handler=eager_errors, file_path='t.dn').parse()
+        lazy_errors = QuietErrorHandler()
+        lazy = Parser(tokenize(source), lazy_bodies=True, error_handler=lazy_errors, file_path='t.dn').parse()
+        self.assertEqual(len(eager_errors.errors), 1)
+        self.assertEqual(lazy_errors.errors, [])
+
+        statements = list(lazy[0].body)
+        self.assertEqual(len(statements), 1)  # The bad declaration is skipped, the return kept
+        self.assertEqual(messages(lazy_errors), messages(eager_errors))
+        self.assertEqual(lazy_errors.errors[0].file_path, 't.dn')
+        self.assertEqual([to_dict(node) for node in lazy], [to_dict(node) for node in eager])
+
+    def test_errors_are_raised_without_an_error_handler(self):
+        declarations = Parser(tokenize("function f() { let x = ; }"), lazy_bodies=True).parse()
+        with self.assertRaises(SyntaxError):
+            list(declarations[0].body)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the compile pipeline's modes (src/compiler.py)
+
+Run with: python -m unittest tests/testing_tools/test_pipeline.py
+(or pytest). Every sample program is compiled the default way and with
+each mode that changes how the source is read or the AST is held; the
+AST and the assembly must not change, nor must a failing compile fail
+differently.
+"""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from Error import ErrorHandler
+from ASTToken import to_dict
+from compiler import compile_source, parse_source
+from arena import ASTArena
+from optimizer import LEVELS
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sample_programs')
+
+class QuietErrorHandler(ErrorHandler):
+    """Collects errors without printing them."""
+    def report(self, error):
+        self.errors.append(error)
+
+def sample_files():
+    return sorted(os.path.join(SAMPLE_DIR, name) for name in os.listdir(SAMPLE_DIR) if name.endswith('.dn'))
+
+def compile_file(path, **options):
+    """(AST as dicts, assembly, error messages) of compiling path, or (None, failure, errors) if it fails."""
+    errors = QuietErrorHandler()
+    with redirect_stdout(io.StringIO()):
+        try:
+            ast, assembly_code, _ = compile_source(path, Lexer(errors), log=None, **options)
+        except Exception as error:
+            return None, f"{type(error).__name__}: {error}", [str(e) for e in errors.errors]
+    return [to_dict(node) for node in ast], assembly_code, [str(e) for e in errors.errors]
+
+class TestModes(unittest.TestCase):
+    MODES = {
+        '--stream': {'stream': True},
+        '--mmap': {'mmap': True},
+        '--arena': {'arena': True},
+        '--stream --arena': {'stream': True, 'arena': True},
+    }
+
+    def test_modes_compile_the_same(self):
+        compiled = 0
+        for path in sample_files():
+            expected = compile_file(path)
+            compiled += expected[0] is not None
+            for mode, options in self.MODES.items():
+                with self.subTest(path=os.path.basename(path), mode=mode):
+                    self.assertEqual(compile_file(path, **options), expected)
+        self.assertGreater(compiled, 50)
+
+class TestArena(unittest.TestCase):
+    def parse(self, path, arena):
+        with redirect_stdout(io.StringIO()):
+            try:
+                return parse_source(path, Lexer(QuietErrorHandler()), log=None, arena=arena)[0]
+            except Exception:
+                return None
+
+    def test_arena_reads_like_the_node_tree(self):
+        for path in sample_files():
+            nodes = self.parse(path, False)
+            if nodes is None:
+                continue
+            with self.subTest(path=os.path.basename(path)):
+                arena = ASTArena.from_ast(nodes)
+                expected = [to_dict(node) for node in nodes]
+                self.assertEqual([to_dict(node) for node in arena.program()], expected)
+                self.assertEqual([to_dict(node) for node in arena.materialize()], expected)
+                self.assertEqual(len(arena.program()), len(nodes))
+
+    def test_arena_compiles_the_same_at_every_level(self):
+        for path in sample_files():
+            for level in LEVELS:
+                expected = compile_file(path, opt_level=level)
+                if expected[0] is None:
+                    continue
+                with self.subTest(path=os.path.basename(path), level=level):
+                    self.assertEqual(compile_file(path, opt_level=level, arena=True)[1], expected[1])
+
+if __name__ == '__main__':
+    unittest.main()
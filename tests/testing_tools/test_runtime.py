@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for runtime routine selection (src/runtime.py)
+
+Run with: python -m unittest tests/testing_tools/test_runtime.py
+(or pytest). A program must include exactly the runtime routines it
+calls and declare exactly the externs they need, so that every call
+into the runtime has a target and nothing unused is emitted; with
+--link-runtime the routines come from the runtime module instead.
+"""
+
+import io
+import os
+import re
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Parser import Parser
+from compiler import parse_source
+from code_generator import AssemblyGenerator
+from runtime import ROUTINES, EXTERNS, runtime_for, runtime_module, write_runtime, call_targets
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sample_programs')
+LABEL = re.compile(r'^([\w.?$@#~]+):', re.MULTILINE)
+EXTERN = re.compile(r'^\s*extern[ \t]+(\S+)', re.MULTILINE)
+CALL = re.compile(r'^\s*call[ \t]+([\w.?$@#~]+)', re.MULTILINE)
+
+class QuietErrorHandler(ErrorHandler):
+    """Collects errors without printing them."""
+    def report(self, error):
+        self.errors.append(error)
+
+def generate(source, link_runtime=False):
+    tokens = Lexer(ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+    return AssemblyGenerator(link_runtime=link_runtime).generate(Parser(tokens).parse())
+
+def sample_programs(link_runtime=False):
+    """(name, assembly) of every sample program that compiles."""
+    for name in sorted(os.listdir(SAMPLE_DIR)):
+        if not name.endswith('.dn'):
+            continue
+        with redirect_stdout(io.StringIO()):
+            try:
+                ast = parse_source(os.path.join(SAMPLE_DIR, name), Lexer(QuietErrorHandler()), log=None)[0]
+                assembly_code = AssemblyGenerator(link_runtime=link_runtime).generate(ast)
+            except Exception:
+                continue
+        yield name, assembly_code
+
+def called_runtime(assembly_code):
+    """Runtime routines and externs called by instructions (not in comments or strings)."""
+    return set(CALL.findall(assembly_code)) & (set(ROUTINES) | set(EXTERNS))
+
+def included_routines(assembly_code):
+    return [name for name in LABEL.findall(assembly_code) if name in ROUTINES]
+
+class TestRuntimeFor(unittest.TestCase):
+    def test_only_called_routines_and_their_externs(self):
+        routines, externs = runtime_for({'dakshin_println', 'dakshin_abs', 'my_function'})
+        self.assertEqual(routines, ['dakshin_println', 'dakshin_abs'])
+        needed = set().union(*(call_targets('\n'.join(ROUTINES[name])) for name in routines))
+        self.assertEqual(externs, [name for name in EXTERNS if name in needed])
+
+    def test_externs_called_directly(self):
+        self.assertEqual(runtime_for({'printf', 'malloc'}), ([], ['printf', 'malloc']))
+        self.assertEqual(runtime_for(set()), ([], []))
+
+    def test_linked_routines_are_not_followed(self):
+        routines, externs = runtime_for({'dakshin_println', 'printf'}, linked=True)
+        self.assertEqual((routines, externs), (['dakshin_println'], ['printf']))
+
+    def test_call_targets(self):
+        text = "    call printf\n    call  dakshin_print ; call x\n    mov rax, 1\n"
+        self.assertEqual(call_targets(text), {'printf', 'dakshin_print', 'x'})
+
+class TestGeneratedPrograms(unittest.TestCase):
+    SOURCE = 'function main() { println("hi"); let a = abs(-3); return a; }'
+
+    def test_unused_routines_are_left_out(self):
+        assembly_code = generate(self.SOURCE)
+        routines = included_routines(assembly_code)
+        self.assertIn('dakshin_abs', routines)
+        self.assertNotIn('dakshin_msgbox', routines)
+        self.assertEqual(routines, runtime_for(call_targets(assembly_code))[0])
+        self.assertEqual(len(routines), len(set(routines)))
+
+    def test_linked_programs_declare_routines_extern(self):
+        assembly_code = generate(self.SOURCE, link_runtime=True)
+        self.assertEqual(included_routines(assembly_code), [])
+        self.assertIn('dakshin_abs', EXTERN.findall(assembly_code))
+
+    def test_every_runtime_call_has_a_target(self):
+        compiled = 0
+        for link_runtime in (False, True):
+            for name, assembly_code in sample_programs(link_runtime):
+                compiled += 1
+                with self.subTest(path=name, link_runtime=link_runtime):
+                    defined = set(LABEL.findall(assembly_code))
+                    declared = EXTERN.findall(assembly_code)
+                    self.assertEqual(called_runtime(assembly_code) - defined - set(declared), set())
+                    self.assertEqual(len(declared), len(set(declared)))
+                    self.assertFalse(defined & set(declared))
+                    if link_runtime:
+                        self.assertEqual(included_routines(assembly_code), [])
+                    else:
+                        expected = runtime_for(set(CALL.findall(assembly_code)))
+                        self.assertEqual((included_routines(assembly_code), declared), expected)
+        self.assertGreater(compiled, 100)
+
+class TestRuntimeModule(unittest.TestCase):
+    def test_module_exports_every_routine(self):
+        module = '\n'.join(runtime_module())
+        self.assertEqual(included_routines(module), list(ROUTINES))
+        self.assertEqual(re.findall(r'^\s*global[ \t]+(\S+)', module, re.MULTILINE), list(ROUTINES))
+        self.assertEqual(called_runtime(module) - set(ROUTINES), set(EXTERN.findall(module)))
+
+    def test_linked_program_and_module_define_every_call(self):
+        module = '\n'.join(runtime_module())
+        for name, assembly_code in sample_programs(link_runtime=True):
+            with self.subTest(path=name):
+                routines = set(EXTERN.findall(assembly_code)) & set(ROUTINES)
+                self.assertLessEqual(routines, set(LABEL.findall(module)))
+
+    def test_write_runtime(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lib', 'dakshin_runtime.asm')
+            write_runtime(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), '\n'.join(runtime_module()))
+
+if __name__ == '__main__':
+    unittest.main()
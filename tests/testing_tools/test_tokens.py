@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the lexer's token containers (src/Lexer.py, src/Tokens.py)
+
+Run with: python -m unittest tests/testing_tools/test_tokens.py
+(or pytest). Every way of lexing a file must give the same tokens, with
+the same values and positions, as tokenizing it whole.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from Lexer import Lexer
+from File import FileReader
+from Error import ErrorHandler
+from Tokens import TokenBuffer, bracket_kinds
+from ParsingTable import ParserTokenType
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sample_programs')
+SOURCE = '''function f(a) {
+  let s = "x y";   // comment
+  return a ** 2 + 0x1F;
+}
+/* multi
+   line */ let z = [1, (2)];
+'''
+
+def sample_files():
+    return sorted(os.path.join(SAMPLE_DIR, name) for name in os.listdir(SAMPLE_DIR) if name.endswith('.dn'))
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+def token_tuples(tokens):
+    """(kind, value, line, column) of every token in a TokenStream or Token iterable."""
+    return [(token.type, token.value, token.line, token.column) for token in tokens]
+
+def tokenize(source, error_handler=None):
+    return Lexer(error_handler or ErrorHandler()).tokenize(FileReader(source_code=source), parser_kinds=True)
+
+class QuietErrorHandler(ErrorHandler):
+    """Collects errors without printing them."""
+    def report(self, error):
+        self.errors.append(error)
+
+class TestTokenStream(unittest.TestCase):
+    def test_positions(self):
+        tokens = tokenize(SOURCE)
+        located = {tokens.value_at(i): tokens.location(i) for i in range(len(tokens))}
+        self.assertEqual(located['function'], (1, 1))
+        self.assertEqual(located['"x y"'], (2, 11))
+        self.assertEqual(located['**'], (3, 12))
+        self.assertEqual(located[31], (3, 19))  # 0x1F
+        self.assertEqual(located['z'], (6, 16))
+
+    def test_indexed_access_matches_tokens(self):
+        tokens = tokenize(SOURCE)
+        for i in range(len(tokens)):
+            token = tokens[i]
+            self.assertEqual((token.type, token.value), (tokens.kind_at(i), tokens.value_at(i)))
+            self.assertEqual((token.line, token.column), tokens.location(i))
+
+class TestBrackets(unittest.TestCase):
+    PAIRS = bracket_kinds(ParserTokenType)
+
+    def expected_matches(self, tokens):
+        """Bracket partners found with a stack; a closer pairs with the nearest open bracket of its kind."""
+        matches, stack = {}, []
+        for i in range(len(tokens)):
+            kind = tokens.kind_at(i)
+            if kind in self.PAIRS:
+                stack.append(i)
+            elif kind in self.PAIRS.values():
+                for depth in range(len(stack) - 1, -1, -1):
+                    if self.PAIRS[tokens.kind_at(stack[depth])] == kind:
+                        matches[stack[depth]], matches[i] = i, stack[depth]
+                        del stack[depth:]
+                        break
+        return matches
+
+    def test_matches_pair_both_ways(self):
+        for path in sample_files():
+            tokens = tokenize(read(path), QuietErrorHandler())
+            with self.subTest(path=path):
+                expected = self.expected_matches(tokens)
+                self.assertEqual({i: tokens.match_of(i) for i in range(len(tokens))
+                                  if tokens.match_of(i) is not None}, expected)
+
+    def test_unbalanced_brackets_have_no_partner(self):
+        errors = QuietErrorHandler()
+        tokens = tokenize('f(a[1], {x}); g(; h) ]', errors)
+        self.assertEqual([tokens.match_of(i) for i in (1, 3, 7)], [10, 5, 9])
+        self.assertEqual([tokens.value_at(i) for i in (13, 16)], ['(', ')'])
+        self.assertEqual(tokens.match_of(13), 16)
+        self.assertIsNone(tokens.match_of(17))
+        self.assertEqual([error.message for error in errors.errors], ["Syntax Error: Unmatched ']'"])
+
+class TestStreaming(unittest.TestCase):
+    def test_chunked_lexing_matches_tokenize(self):
+        for path in [None] + sample_files():
+            source = SOURCE if path is None else read(path)
+            expected = token_tuples(tokenize(source))
+            for chunk_size in (1, 7, 64, 1 << 16):
+                with self.subTest(path=path, chunk_size=chunk_size):
+                    tokens = Lexer(ErrorHandler()).iter_tokens(io.StringIO(source), parser_kinds=True,
+                                                               chunk_size=chunk_size)
+                    self.assertEqual(token_tuples(tokens), expected)
+
+    def test_buffer_matches_token_stream(self):
+        stream = tokenize(SOURCE)
+        buffer = TokenBuffer(iter(list(stream)))
+        i = 0
+        while buffer.has(i):
+            self.assertEqual((buffer.kind_at(i), buffer.value_at(i), buffer.location(i)),
+                             (stream.kind_at(i), stream.value_at(i), stream.location(i)))
+            i += 1
+        self.assertEqual(i, len(stream))
+        self.assertEqual(buffer.consumed, len(stream))
+        self.assertEqual(buffer[-1].value, stream.value_at(len(stream) - 1))
+        self.assertEqual(buffer.match_of(5), stream.match_of(5))
+
+    def test_buffer_keeps_a_bounded_window(self):
+        buffer = TokenBuffer(iter(tokenize("let x = 1;" * 200)), window=16)
+        self.assertTrue(buffer.has(999))
+        self.assertLessEqual(len(buffer.buffer), 32)
+        self.assertEqual(buffer[999].value, ';')
+        with self.assertRaises(IndexError):
+            buffer[0]
+        with self.assertRaises(IndexError):
+            buffer[-1]  # Not exhausted yet
+        self.assertFalse(buffer.has(1000))
+        self.assertEqual(buffer[-1].value, ';')
+
+class TestMemoryMapped(unittest.TestCase):
+    def tokens(self, path, mmap):
+        reader = FileReader(file_path=path, mmap=mmap)
+        try:
+            return token_tuples(Lexer(ErrorHandler()).tokenize(reader, parser_kinds=True))
+        finally:
+            reader.close()
+
+    def test_mapped_files_lex_the_same(self):
+        for path in sample_files():
+            with self.subTest(path=path):
+                self.assertEqual(self.tokens(path, True), self.tokens(path, False))
+
+    def test_positions_count_characters_not_bytes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'utf8.dn')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('let s = "h\u00e9llo \u2713";\nlet t = s; // \u00fc\n/* \u00e9 */ let u = 2;\n')
+            tokens = self.tokens(path, True)
+            self.assertEqual(tokens, self.tokens(path, False))
+            self.assertEqual(tokens[3][1:], ('"h\u00e9llo \u2713"', 1, 9))
+            self.assertEqual(tokens[4][2:], (1, 18))
+            self.assertEqual(tokens[-1][2:], (3, 18))
+
+if __name__ == '__main__':
+    unittest.main()